@@ -1,35 +1,170 @@
+import atexit
 import os
+import threading
 
 from dotenv import load_dotenv
 from flask import Flask
 
+from .application.admission import AdmissionConfig, AdmissionController
+from .application.jobs import JobWorkerConfig, JobWorkerPool
 from .application.services import KnowledgeGraphService
+from .application.single_flight import SingleFlight
 from .controllers.analyze_controller import create_analyze_blueprint
-from .infrastructure import OllamaClient, OllamaClientConfig, PromptRepository
+from .controllers.jobs_controller import create_jobs_blueprint
+from .controllers.metrics_controller import create_metrics_blueprint
+from .controllers.response_encoding import ResponseEncodingConfig, install_response_encoding
+from .controllers.server_timing import ServerTimingConfig, install_server_timing
+from .controllers.triples_controller import create_triples_blueprint
+from .infrastructure import (
+    AsyncOllamaClient,
+    BackendPoolConfig,
+    GenerationCacheConfig,
+    JobStoreConfig,
+    Metrics,
+    OllamaClient,
+    OllamaClientConfig,
+    PromptRepository,
+    ResponseLogConfig,
+    ResponseSinkConfig,
+    TripleStoreConfig,
+    build_backend_pool,
+    build_generation_cache,
+    build_job_store,
+    build_response_logger,
+    build_response_sink,
+    build_triple_store,
+)
+from .infrastructure.env import bool_from_env, int_from_env
+from .infrastructure.profiling import ProfilerConfig, SampledProfiler
 
 
-def create_app() -> Flask:
-    load_dotenv()
+DEFAULT_FEW_SHOT_BANK = "examples"
+
+
+def build_prompt_repository() -> PromptRepository:
+    prompt_repository = PromptRepository(auto_reload=bool_from_env("PROMPT_AUTO_RELOAD", True))
+    if bool_from_env("PROMPT_PRELOAD", True):
+        prompt_repository.preload()
+    return prompt_repository
 
-    app = Flask(__name__)
 
-    prompt_repository = PromptRepository()
+def build_service(
+    metrics: Metrics | None = None,
+    use_async_client: bool = False,
+    prompt_repository: PromptRepository | None = None,
+    warm_up: bool | None = None,
+) -> KnowledgeGraphService:
+    """
+    Wire the service and its infrastructure from environment variables. A prompt repository
+    loaded before fork() can be passed in; warm_up overrides OLLAMA_WARM_UP.
+    """
+    # Each pre-forked worker keeps its own registry; the pid label tells their series apart.
+    metrics = metrics or Metrics({"pid": str(os.getpid())} if bool_from_env("METRICS_PID_LABEL", False) else None)
+
+    prompt_repository = prompt_repository or build_prompt_repository()
     env_default_prompt = os.getenv("DEFAULT_PROMPT_NAME")
     env_default_system_prompt = os.getenv("DEFAULT_SYSTEM_PROMPT_NAME")
 
     ollama_config = OllamaClientConfig.from_env()
-    ollama_client = OllamaClient(config=ollama_config)
+    response_sink = build_response_sink(ResponseSinkConfig.from_env(), ollama_config.csv_path)
+    response_logger = build_response_logger(response_sink, ResponseLogConfig.from_env())
+    atexit.register(response_logger.close)
+    backend_pool = build_backend_pool(BackendPoolConfig.from_env(), ollama_config.model, metrics=metrics)
+    if backend_pool is not None:
+        atexit.register(backend_pool.close)
+    ollama_client = OllamaClient(
+        config=ollama_config, response_logger=response_logger, metrics=metrics, backend_pool=backend_pool
+    )
+    generation_cache = build_generation_cache(GenerationCacheConfig.from_env())
+    async_ollama_client = None
+    if use_async_client:
+        async_ollama_client = AsyncOllamaClient(
+            config=ollama_config, response_logger=response_logger, metrics=metrics, backend_pool=backend_pool
+        )
+    admission_config = AdmissionConfig.from_env()
+    admission = AdmissionController(admission_config, metrics=metrics) if admission_config.enabled else None
+    triple_store = build_triple_store(TripleStoreConfig.from_env())
+    if triple_store is not None:
+        atexit.register(triple_store.close)
 
     service = KnowledgeGraphService(
         prompt_repository,
         default_prompt=env_default_prompt,
         default_system_prompt=env_default_system_prompt,
         ollama_client=ollama_client,
+        generation_cache=generation_cache,
+        batch_concurrency=int_from_env("ANALYZE_BATCH_CONCURRENCY", 4),
+        metrics=metrics,
+        async_ollama_client=async_ollama_client,
+        context_tokens=ollama_config.options.num_ctx,
+        document_chunk_tokens=int_from_env("DOCUMENT_CHUNK_TOKENS"),
+        admission=admission,
+        triple_store=triple_store,
+        few_shot_bank=os.getenv("FEW_SHOT_BANK") or DEFAULT_FEW_SHOT_BANK,
+        few_shot_k=int_from_env("FEW_SHOT_K", 3),
+        few_shot_tokens=int_from_env("FEW_SHOT_TOKEN_BUDGET", 600),
+        # Opt-in: with temperature > 0, coalesced callers would share one sample instead of getting their own.
+        single_flight=SingleFlight(metrics) if bool_from_env("SINGLE_FLIGHT", False) else None,
+    )
+    if bool_from_env("OLLAMA_WARM_UP", False) if warm_up is None else warm_up:
+        # In the background so startup does not wait for model loads; failures are per backend.
+        threading.Thread(target=service.warm_up, name="ollama-warm-up", daemon=True).start()
+    return service
+
+
+def create_app(prompt_repository: PromptRepository | None = None, warm_up: bool | None = None) -> Flask:
+    load_dotenv()
+
+    app = Flask(__name__)
+    install_response_encoding(app, ResponseEncodingConfig.from_env())
+    profiler = SampledProfiler(ProfilerConfig.from_env())
+    if profiler.config.enabled:
+        atexit.register(profiler.close)
+        app.extensions["profiler"] = profiler
+    install_server_timing(app, ServerTimingConfig.from_env(), profiler)
+
+    service = build_service(prompt_repository=prompt_repository, warm_up=warm_up)
+    app.extensions["kg_service"] = service
+    app.extensions["response_logger"] = service.ollama_client.response_logger
+    app.register_blueprint(
+        create_analyze_blueprint(service, max_batch_items=int_from_env("ANALYZE_BATCH_MAX_ITEMS", 1000))
     )
-    app.register_blueprint(create_analyze_blueprint(service))
+    app.register_blueprint(create_metrics_blueprint(service.metrics))
+    if service.triple_store is not None:
+        app.register_blueprint(create_triples_blueprint(service.triple_store))
+
+    job_store = build_job_store(JobStoreConfig.from_env())
+    if job_store is not None:
+        atexit.register(job_store.close)
+        workers = JobWorkerPool(service, job_store, JobWorkerConfig.from_env()).start()
+        # Registered after close, so it runs first: workers finish their current item before the store closes.
+        atexit.register(workers.stop)
+        app.extensions["job_workers"] = workers
+        app.register_blueprint(
+            create_jobs_blueprint(
+                job_store, max_batch_items=int_from_env("ANALYZE_BATCH_MAX_ITEMS", 1000), on_submit=workers.notify
+            )
+        )
 
     return app
 
 
+def shutdown_app(app: Flask, timeout: float | None = None) -> None:
+    """
+    Release what create_app() started, for servers that end workers without running atexit:
+    job workers finish their current item, then the Ollama client closes its connections and
+    flushes the response log, and pending profile samples are dumped. Safe to call more than once.
+    """
+    workers = app.extensions.get("job_workers")
+    if workers is not None:
+        workers.stop(timeout)
+    service = app.extensions.get("kg_service")
+    if service is not None:
+        service.ollama_client.close()
+    profiler = app.extensions.get("profiler")
+    if profiler is not None:
+        profiler.close()
+
+
 if __name__ == "__main__":
     create_app().run(host="127.0.0.1", port=5000, debug=True)
@@ -0,0 +1,228 @@
+"""
+Admission control in front of the model: at most max_in_flight generations reach
+Ollama, the rest wait in a bounded priority queue until their deadline. Requests
+that cannot be queued, or whose deadline passes while queued, are rejected at once
+with a Retry-After hint instead of piling up inside the model server.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import math
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Callable, Iterator
+
+from ..infrastructure.env import float_from_env, int_from_env
+from ..infrastructure.metrics import Metrics
+
+HIGH = "high"
+NORMAL = "normal"
+LOW = "low"
+PRIORITIES = {HIGH: 0, NORMAL: 1, LOW: 2}
+
+QUEUE_FULL = "queue_full"
+DEADLINE = "deadline"
+
+_GRANTED = "granted"
+_SHED = "shed"
+
+
+class AdmissionRejected(RuntimeError):
+    """Raised when a request is not admitted; status is 429 (queue full) or 503 (deadline)."""
+
+    def __init__(self, reason: str, retry_after: int) -> None:
+        message = "Server is at capacity; retry later." if reason == QUEUE_FULL else "Timed out waiting for capacity."
+        super().__init__(message)
+        self.reason = reason
+        self.retry_after = retry_after
+
+    @property
+    def status(self) -> int:
+        return 429 if self.reason == QUEUE_FULL else 503
+
+
+@dataclass(frozen=True)
+class AdmissionConfig:
+    max_in_flight: int = 0
+    queue_size: int = 32
+    queue_timeout: float = 30.0
+    min_retry_after: int = 1
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_in_flight > 0
+
+    @classmethod
+    def from_env(cls) -> "AdmissionConfig":
+        return cls(
+            max_in_flight=int_from_env("ADMISSION_MAX_IN_FLIGHT", 0),
+            queue_size=max(0, int_from_env("ADMISSION_QUEUE_SIZE", 32)),
+            queue_timeout=float_from_env("ADMISSION_QUEUE_TIMEOUT", 30.0),
+            min_retry_after=max(1, int_from_env("ADMISSION_RETRY_AFTER", 1)),
+        )
+
+
+@dataclass(order=True)
+class _Waiter:
+    rank: int
+    sequence: int
+    wake: Callable[[], None] = field(compare=False)
+    enqueued: float = field(default_factory=time.monotonic, compare=False)
+    outcome: str | None = field(default=None, compare=False)
+
+
+class AdmissionController:
+    """
+    Thread-safe slot scheduler shared by the Flask (threads) and ASGI (asyncio) paths.
+    A released slot is handed directly to the best queued waiter (priority, then FIFO),
+    so a newcomer can never overtake the queue.
+    """
+
+    def __init__(self, config: AdmissionConfig, metrics: Metrics | None = None) -> None:
+        self.config = config
+        self.metrics = metrics or Metrics()
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._waiters: list[_Waiter] = []
+        self._sequence = itertools.count()
+        # Smoothed slot hold time, used to estimate Retry-After.
+        self._average_hold = 1.0
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    def deadline_for(self, timeout: float | None = None) -> float:
+        """Absolute (monotonic) queue deadline for a request, defaulting to the configured timeout."""
+        return time.monotonic() + (self.config.queue_timeout if timeout is None else timeout)
+
+    @contextmanager
+    def slot(self, priority: str | None = None, deadline: float | None = None) -> Iterator[None]:
+        self.acquire(priority, deadline)
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            self.release(time.monotonic() - started)
+
+    @asynccontextmanager
+    async def slot_async(self, priority: str | None = None, deadline: float | None = None) -> AsyncIterator[None]:
+        await self.acquire_async(priority, deadline)
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            self.release(time.monotonic() - started)
+
+    def acquire(self, priority: str | None = None, deadline: float | None = None) -> None:
+        event = threading.Event()
+        waiter = self._enter(priority, deadline, event.set)
+        if waiter is None:
+            return
+        event.wait(self._remaining(deadline))
+        self._settle(waiter)
+
+    async def acquire_async(self, priority: str | None = None, deadline: float | None = None) -> None:
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future = loop.create_future()
+
+        def wake() -> None:
+            loop.call_soon_threadsafe(lambda: future.done() or future.set_result(None))
+
+        waiter = self._enter(priority, deadline, wake)
+        if waiter is None:
+            return
+        try:
+            await asyncio.wait_for(asyncio.shield(future), self._remaining(deadline))
+        except asyncio.TimeoutError:
+            pass
+        except asyncio.CancelledError:
+            self._abandon(waiter)
+            raise
+        self._settle(waiter)
+
+    def release(self, held_seconds: float | None = None) -> None:
+        with self._lock:
+            if held_seconds is not None:
+                self._average_hold = 0.8 * self._average_hold + 0.2 * held_seconds
+            if self._waiters:
+                # The slot moves straight to the best waiter; in-flight stays the same.
+                waiter = heapq.heappop(self._waiters)
+                waiter.outcome = _GRANTED
+                self.metrics.admission_wait_seconds.observe(time.monotonic() - waiter.enqueued)
+                waiter.wake()
+            else:
+                self._in_flight -= 1
+            self._update_gauges()
+
+    def _enter(self, priority: str | None, deadline: float | None, wake: Callable[[], None]) -> _Waiter | None:
+        rank = PRIORITIES[priority or NORMAL]
+        with self._lock:
+            if self._in_flight < self.config.max_in_flight and not self._waiters:
+                self._in_flight += 1
+                self.metrics.admission_wait_seconds.observe(0.0)
+                self._update_gauges()
+                return None
+            if deadline is not None and deadline <= time.monotonic():
+                raise self._reject(DEADLINE)
+            if len(self._waiters) >= self.config.queue_size:
+                worst = max(self._waiters, default=None)
+                if worst is None or worst.rank <= rank:
+                    raise self._reject(QUEUE_FULL)
+                # A higher-priority caller displaces the newest lowest-priority waiter.
+                self._waiters.remove(worst)
+                heapq.heapify(self._waiters)
+                worst.outcome = _SHED
+                worst.wake()
+            waiter = _Waiter(rank, next(self._sequence), wake)
+            heapq.heappush(self._waiters, waiter)
+            self._update_gauges()
+            return waiter
+
+    def _settle(self, waiter: _Waiter) -> None:
+        with self._lock:
+            if waiter.outcome == _GRANTED:
+                return
+            if waiter.outcome == _SHED:
+                raise self._reject(QUEUE_FULL)
+            # Timed out and nobody handed us a slot: leave the queue.
+            self._waiters.remove(waiter)
+            heapq.heapify(self._waiters)
+            self._update_gauges()
+            raise self._reject(DEADLINE)
+
+    def _abandon(self, waiter: _Waiter) -> None:
+        """The caller went away (e.g. client disconnect): give back a granted slot or leave the queue."""
+        with self._lock:
+            if waiter.outcome is None:
+                self._waiters.remove(waiter)
+                heapq.heapify(self._waiters)
+                self._update_gauges()
+                return
+        if waiter.outcome == _GRANTED:
+            self.release()
+
+    def _remaining(self, deadline: float | None) -> float | None:
+        if deadline is None:
+            return None
+        return max(0.0, deadline - time.monotonic())
+
+    def _reject(self, reason: str) -> AdmissionRejected:
+        # Time for the current queue to drain through the available slots.
+        backlog = (len(self._waiters) + 1) / self.config.max_in_flight
+        retry_after = max(self.config.min_retry_after, math.ceil(backlog * self._average_hold))
+        self.metrics.admission_rejected.inc(reason=reason)
+        return AdmissionRejected(reason, retry_after)
+
+    def _update_gauges(self) -> None:
+        self.metrics.admission_in_flight.set(self._in_flight)
+        self.metrics.admission_queue_depth.set(len(self._waiters))
@@ -0,0 +1,160 @@
+"""
+Background workers for the durable job queue: each thread claims one item at a
+time, runs it through KnowledgeGraphService.analyze and stores the same payload
+/analyze would have returned. Failures are retried with exponential backoff;
+lookup and validation errors are final since a retry cannot change them. The
+lease of an item is renewed while it is processed, so a slow generation (or a
+long wait for an admission slot) is never handed to a second worker.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Iterator
+
+from ..domain.models import TURTLE, AnalyzeRequest
+from ..infrastructure.env import float_from_env, int_from_env
+from ..infrastructure.job_store import ClaimedItem, SqliteJobStore
+from ..infrastructure.metrics import Metrics
+from .admission import NORMAL, PRIORITIES
+from .services import KnowledgeGraphService, result_payload
+
+logger = logging.getLogger(__name__)
+
+PRIORITY_NAMES = {rank: name for name, rank in PRIORITIES.items()}
+_FINAL_ERRORS = (FileNotFoundError, ValueError)
+
+
+@dataclass(frozen=True)
+class JobWorkerConfig:
+    # 0 runs no workers in this process (API only; items are drained elsewhere).
+    workers: int = 2
+    max_attempts: int = 3
+    retry_backoff: float = 5.0
+    poll_interval: float = 1.0
+
+    @classmethod
+    def from_env(cls) -> "JobWorkerConfig":
+        return cls(
+            workers=max(0, int_from_env("JOBS_WORKERS", 2)),
+            max_attempts=max(1, int_from_env("JOBS_MAX_ATTEMPTS", 3)),
+            retry_backoff=max(0.0, float_from_env("JOBS_RETRY_BACKOFF", 5.0)),
+            poll_interval=max(0.05, float_from_env("JOBS_POLL_INTERVAL", 1.0)),
+        )
+
+
+def job_item(request: AnalyzeRequest) -> dict[str, Any]:
+    """The stored form of a queued request; priority lives on the job and deadlines do not apply."""
+    return {
+        "text": request.text,
+        "prompt_name": request.prompt_name,
+        "system_prompt_name": request.system_prompt_name,
+        "variables": request.variables,
+        "output": request.output,
+    }
+
+
+def submit_job(store: SqliteJobStore, requests: list[AnalyzeRequest], priority: str | None = None) -> str:
+    return store.submit([job_item(request) for request in requests], priority=PRIORITIES[priority or NORMAL])
+
+
+class JobWorkerPool:
+    def __init__(
+        self,
+        service: KnowledgeGraphService,
+        store: SqliteJobStore,
+        config: JobWorkerConfig | None = None,
+        metrics: Metrics | None = None,
+    ) -> None:
+        self.service = service
+        self.store = store
+        self.config = config or JobWorkerConfig()
+        self.metrics = metrics or service.metrics
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+        self._threads: list[threading.Thread] = []
+
+    def start(self) -> "JobWorkerPool":
+        for number in range(self.config.workers):
+            thread = threading.Thread(target=self._run, name=f"job-worker-{number}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        return self
+
+    def notify(self) -> None:
+        """Wake idle workers now instead of at their next poll (called after a submit)."""
+        self._wake.set()
+
+    def stop(self, timeout: float | None = None) -> None:
+        """Let each worker finish its current item; unfinished items stay leased and are reclaimed later."""
+        self._stopping.set()
+        self._wake.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def run_once(self) -> bool:
+        """Claim and process one item; False when nothing was ready."""
+        item = self.store.claim(self.config.max_attempts)
+        if item is None:
+            return False
+        self._process(item)
+        return True
+
+    def _run(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                worked = self.run_once()
+            except Exception:
+                logger.exception("Job worker failed while claiming or storing an item.")
+                worked = False
+            if not worked:
+                self._wake.wait(self.config.poll_interval)
+                self._wake.clear()
+
+    def _process(self, item: ClaimedItem) -> None:
+        request = AnalyzeRequest(
+            **item.request, priority=PRIORITY_NAMES.get(item.priority, NORMAL), include_prompt=False
+        )
+        started = time.monotonic()
+        try:
+            with self._keep_leased(item):
+                response = self.service.analyze(request)
+        except Exception as exc:
+            error = {"error": str(exc), "exception": type(exc).__name__}
+            if isinstance(exc, _FINAL_ERRORS) or item.attempts >= self.config.max_attempts:
+                self.store.fail(item, error)
+                self.metrics.job_items.inc(outcome="failed")
+            else:
+                self.store.fail(item, error, retry_in=self.config.retry_backoff * 2 ** (item.attempts - 1))
+                self.metrics.job_items.inc(outcome="retried")
+            return
+        finally:
+            self.metrics.job_item_seconds.observe(time.monotonic() - started)
+        self.store.complete(item, result_payload(response, item.request.get("output", TURTLE)))
+        self.metrics.job_items.inc(outcome="done")
+
+    @contextmanager
+    def _keep_leased(self, item: ClaimedItem) -> Iterator[None]:
+        done = threading.Event()
+        interval = self.store.lease_seconds / 3
+
+        def renew() -> None:
+            while not done.wait(interval):
+                try:
+                    if not self.store.renew(item):
+                        return
+                except Exception:
+                    logger.exception("Failed to renew the lease of job %s item %s.", item.job_id, item.index)
+
+        thread = threading.Thread(target=renew, name="job-lease", daemon=True)
+        thread.start()
+        try:
+            yield
+        finally:
+            done.set()
+            thread.join()
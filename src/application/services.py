@@ -1,8 +1,132 @@
-from typing import Optional
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from dataclasses import dataclass, replace
+from typing import AsyncIterator, Iterator, Optional, Sequence
 
-from ..domain.models import AnalyzeRequest, AnalyzeResponse
+from ..domain.chunking import estimate_tokens, split_into_chunks
+from ..domain.models import NTRIPLES, TURTLE, AnalyzeRequest, AnalyzeResponse, BatchItemResult, DocumentAnalyzeResponse
+from ..domain.prompt_template import EXAMPLES, USER_TEXT
+from ..domain.triples import TripleGraph, parse_turtle
+from ..domain.turtle_merge import merge_turtle
+from ..domain.turtle_validator import TurtleValidation
+from ..infrastructure.async_ollama_client import AsyncOllamaClient
+from ..infrastructure.generation_cache import GenerationCache, generation_cache_key
+from ..infrastructure.metrics import Counter, Gauge, Metrics
 from ..infrastructure.ollama_client import OllamaClient
 from ..infrastructure.prompt_repository import PromptRepository
+from ..infrastructure.response_log import RDF_VALIDATION
+from ..infrastructure.timing import PROMPT, RENDER, TRIPLES, stage
+from ..infrastructure.triple_store import SqliteTripleStore
+from .admission import AdmissionController
+from .single_flight import SingleFlight
+
+
+# Ollama's num_ctx default; used when OLLAMA_NUM_CTX is not configured.
+DEFAULT_CONTEXT_TOKENS = 2048
+MIN_CHUNK_TOKENS = 64
+DEFAULT_FEW_SHOT_K = 3
+DEFAULT_FEW_SHOT_TOKENS = 600
+# Chat-style turn appended when a prompt has no ${USER_TEXT}; the user text sits between the two.
+CHAT_USER_TURN = "\n\nUser: "
+CHAT_ASSISTANT_TURN = "\nAssistant:"
+
+
+def result_payload(response: AnalyzeResponse, output: str = TURTLE) -> dict:
+    """JSON body for one analysis, shared by the HTTP routes and the job workers."""
+    payload = {"text": response.input_text, "rdf": None}
+    if response.generation and isinstance(response.generation, dict):
+        payload["rdf"] = response.generation.get("response")
+        if RDF_VALIDATION in response.generation:
+            payload[RDF_VALIDATION] = response.generation[RDF_VALIDATION]
+    if response.triples is not None:
+        if output == NTRIPLES:
+            payload["rdf"] = response.triples.to_ntriples()
+        else:
+            # Interned arrays replace the Turtle text instead of duplicating it.
+            del payload["rdf"]
+            payload.update(response.triples.to_json())
+    return payload
+
+
+class AdmittedStream:
+    """
+    Chunk iterator that holds an admission slot. The slot is released once, when the
+    chunks run out or fail, or on close(), even if iteration never started (a client
+    that disconnects before the body is read).
+    """
+
+    def __init__(self, chunks: Iterator[dict], admission: AdmissionController) -> None:
+        self._chunks = chunks
+        self._admission = admission
+        self._started = time.monotonic()
+        self._released = False
+        self._lock = threading.Lock()
+
+    def __iter__(self) -> "AdmittedStream":
+        return self
+
+    def __next__(self) -> dict:
+        try:
+            return next(self._chunks)
+        except BaseException:
+            self.close()
+            raise
+
+    def close(self) -> None:
+        with self._lock:
+            if self._released:
+                return
+            self._released = True
+        try:
+            close = getattr(self._chunks, "close", None)
+            if close is not None:
+                close()
+        finally:
+            self._admission.release(time.monotonic() - self._started)
+
+
+class AsyncAdmittedStream:
+    """async counterpart of AdmittedStream; callers that may drop it unread must aclose() it."""
+
+    def __init__(self, chunks: AsyncIterator[dict], admission: AdmissionController) -> None:
+        self._chunks = chunks
+        self._admission = admission
+        self._started = time.monotonic()
+        self._released = False
+
+    def __aiter__(self) -> "AsyncAdmittedStream":
+        return self
+
+    async def __anext__(self) -> dict:
+        try:
+            return await self._chunks.__anext__()
+        except BaseException:
+            await self.aclose()
+            raise
+
+    async def aclose(self) -> None:
+        # Single event loop: the flag needs no lock, it only has to be set before the first await.
+        if self._released:
+            return
+        self._released = True
+        try:
+            aclose = getattr(self._chunks, "aclose", None)
+            if aclose is not None:
+                await aclose()
+        finally:
+            self._admission.release(time.monotonic() - self._started)
+
+
+@dataclass(frozen=True, slots=True)
+class _PreparedPrompt:
+    prompt_name: str
+    system_prompt_name: str
+    system_prompt_text: str
+    prompt_text: str
+    message: str
 
 
 class KnowledgeGraphService:
@@ -12,43 +136,346 @@ class KnowledgeGraphService:
         default_prompt: str,
         default_system_prompt: str,
         ollama_client: Optional[OllamaClient] = None,
+        generation_cache: Optional[GenerationCache] = None,
+        batch_concurrency: int = 4,
+        metrics: Optional[Metrics] = None,
+        async_ollama_client: Optional[AsyncOllamaClient] = None,
+        context_tokens: Optional[int] = None,
+        document_chunk_tokens: Optional[int] = None,
+        admission: Optional[AdmissionController] = None,
+        triple_store: Optional[SqliteTripleStore] = None,
+        few_shot_bank: Optional[str] = None,
+        few_shot_k: int = DEFAULT_FEW_SHOT_K,
+        few_shot_tokens: int = DEFAULT_FEW_SHOT_TOKENS,
+        single_flight: Optional[SingleFlight] = None,
     ) -> None:
         self.prompt_repository = prompt_repository
         self.default_prompt = default_prompt
         self.default_system_prompt = default_system_prompt
         self.ollama_client = ollama_client
+        self.generation_cache = generation_cache
+        self.batch_concurrency = max(1, batch_concurrency)
+        self.metrics = metrics or Metrics()
+        self.async_ollama_client = async_ollama_client
+        self.context_tokens = context_tokens or DEFAULT_CONTEXT_TOKENS
+        self.document_chunk_tokens = document_chunk_tokens
+        self.admission = admission
+        self.triple_store = triple_store
+        self.few_shot_bank = few_shot_bank
+        self.few_shot_k = few_shot_k
+        self.few_shot_tokens = few_shot_tokens
+        self.single_flight = single_flight
+        if generation_cache is not None:
+            self.metrics.add_collector(self._cache_metrics)
 
     def analyze(self, request: AnalyzeRequest) -> AnalyzeResponse:
+        prepared = self._prepare(request)
+
+        generation_response = None
+        if self.ollama_client:
+            generation_response = self._generate(prepared, request)
+
+        return self._response(prepared, request, generation_response)
+
+    def analyze_stream(self, request: AnalyzeRequest) -> Iterator[dict]:
+        """
+        Resolve prompts eagerly (so lookup errors surface before streaming starts) and
+        return the generation chunk iterator. With admission control it is an AdmittedStream;
+        callers that may drop it unread must close() it to free the slot.
+        """
+        if not self.ollama_client:
+            raise RuntimeError("No generation client is configured for streaming.")
+        prepared = self._prepare(request)
+        if self.admission is None:
+            return self._stream(prepared, request)
+        # Admit before the first chunk so rejections are returned as plain errors.
+        self.admission.acquire(request.priority, self._deadline(request))
+        return AdmittedStream(self._stream(prepared, request), self.admission)
+
+    def _stream(self, prepared: _PreparedPrompt, request: AnalyzeRequest) -> Iterator[dict]:
+        return self.ollama_client.generate_stream(
+            system_prompt=prepared.system_prompt_text,
+            prompt=prepared.message,
+            prompt_name=prepared.prompt_name,
+            input_text=request.text,
+        )
+
+    def analyze_batch(self, requests: Sequence[AnalyzeRequest]) -> list[BatchItemResult]:
+        """Analyze many requests with at most batch_concurrency in flight; results keep input order."""
+
+        def run(indexed: tuple[int, AnalyzeRequest]) -> BatchItemResult:
+            index, request = indexed
+            try:
+                return BatchItemResult(index=index, response=self.analyze(request))
+            except Exception as exc:  # reported per item, the rest of the batch continues
+                return BatchItemResult(index=index, error=exc)
+
+        if not requests:
+            return []
+        workers = min(self.batch_concurrency, len(requests))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="analyze-batch") as executor:
+            return list(executor.map(run, enumerate(requests)))
+
+    def analyze_document(self, request: AnalyzeRequest) -> DocumentAnalyzeResponse:
+        """
+        Split a long text into chunks that fit the context window next to the prompts,
+        extract them concurrently and merge the Turtle into one graph.
+        """
+        chunks = self._document_chunks(request)
+        results = self.analyze_batch(self._chunk_requests(request, chunks))
+        return self._document_response(request, chunks, results)
+
+    def _document_chunks(self, request: AnalyzeRequest) -> list[str]:
+        return split_into_chunks(request.text, self.chunk_token_budget(request))
+
+    @staticmethod
+    def _chunk_requests(request: AnalyzeRequest, chunks: Sequence[str]) -> list[AnalyzeRequest]:
+        # Chunks are merged as Turtle, so they are never parsed into triples individually.
+        return [replace(request, text=chunk, output=TURTLE) for chunk in chunks]
+
+    @staticmethod
+    def _document_response(
+        request: AnalyzeRequest, chunks: Sequence[str], results: Sequence[BatchItemResult]
+    ) -> DocumentAnalyzeResponse:
+        documents = [
+            result.response.generation.get("response")
+            for result in results
+            if result.error is None and isinstance(result.response.generation, dict)
+        ]
+        rdf = merge_turtle(document for document in documents if document) if documents else None
+        return DocumentAnalyzeResponse(
+            input_text=request.text,
+            rdf=rdf,
+            chunks=tuple(chunks),
+            chunk_results=tuple(results),
+        )
+
+    def chunk_token_budget(self, request: AnalyzeRequest) -> int:
+        if self.document_chunk_tokens:
+            return self.document_chunk_tokens
         prompt_name = request.prompt_name or self.default_prompt
         system_prompt_name = request.system_prompt_name or self.default_system_prompt
+        template = self.prompt_repository.load_template(prompt_name)
+        static_tokens = template.static_token_estimate + estimate_tokens(
+            self.prompt_repository.load_prompt(system_prompt_name)
+        )
+        if self.few_shot_bank and template.has_placeholder(EXAMPLES):
+            static_tokens += self.few_shot_tokens
+        # Generated Turtle is usually several times longer than its input; keep most of the window for it.
+        return max(MIN_CHUNK_TOKENS, (self.context_tokens - static_tokens) // 3)
 
-        system_prompt_text = self.prompt_repository.load_prompt(system_prompt_name)
-        prompt_text = self.prompt_repository.load_prompt(prompt_name)
-
-        # If prompt has a placeholder, fill it; otherwise append user text in a chat-style turn.
-        if "${USER_TEXT}" in prompt_text:
-            message = prompt_text.replace("${USER_TEXT}", request.text)
-        else:
-            message = f"{prompt_text}\n\nUser: {request.text}\nAssistant:"
+    async def analyze_async(self, request: AnalyzeRequest) -> AnalyzeResponse:
+        """
+        Same contract as analyze(), awaiting the async client instead of blocking a thread.
+        Prompt loading may stat the prompt tree and cache lookups hit SQLite, so both run on
+        worker threads; the event loop only awaits.
+        """
+        prepared = await asyncio.to_thread(self._prepare, request)
 
         generation_response = None
-        if self.ollama_client:
-            generation_response = self.ollama_client.generate(
-                system_prompt=system_prompt_text,
-                prompt=message,
-                prompt_name=prompt_name,
-                input_text=request.text,
-            )
+        if self.async_ollama_client:
+            generation_response = await self._generate_async(prepared, request)
 
-        return AnalyzeResponse(
+        if self.triple_store is not None:
+            # Parsing and the SQLite write block, so keep them off the event loop.
+            return await asyncio.to_thread(self._response, prepared, request, generation_response)
+        return self._response(prepared, request, generation_response)
+
+    async def analyze_stream_async(self, request: AnalyzeRequest) -> AsyncIterator[dict]:
+        """Same contract as analyze_stream(), over the async client; an AsyncAdmittedStream with admission."""
+        if not self.async_ollama_client:
+            raise RuntimeError("No generation client is configured for streaming.")
+        prepared = await asyncio.to_thread(self._prepare, request)
+        chunks = self.async_ollama_client.generate_stream(
+            system_prompt=prepared.system_prompt_text,
+            prompt=prepared.message,
+            prompt_name=prepared.prompt_name,
+            input_text=request.text,
+        )
+        if self.admission is None:
+            return chunks
+        await self.admission.acquire_async(request.priority, self._deadline(request))
+        return AsyncAdmittedStream(chunks, self.admission)
+
+    async def analyze_document_async(self, request: AnalyzeRequest) -> DocumentAnalyzeResponse:
+        """Same contract as analyze_document(); chunking and the Turtle merge run on worker threads."""
+        chunks = await asyncio.to_thread(self._document_chunks, request)
+        results = await self.analyze_batch_async(self._chunk_requests(request, chunks))
+        return await asyncio.to_thread(self._document_response, request, chunks, results)
+
+    async def analyze_batch_async(self, requests: Sequence[AnalyzeRequest]) -> list[BatchItemResult]:
+        semaphore = asyncio.Semaphore(self.batch_concurrency)
+
+        async def run(index: int, request: AnalyzeRequest) -> BatchItemResult:
+            async with semaphore:
+                try:
+                    return BatchItemResult(index=index, response=await self.analyze_async(request))
+                except Exception as exc:  # reported per item, the rest of the batch continues
+                    return BatchItemResult(index=index, error=exc)
+
+        return list(await asyncio.gather(*(run(index, request) for index, request in enumerate(requests))))
+
+    def stable_prefix(self, prompt_name: Optional[str] = None) -> str:
+        """
+        The part of every message built from this prompt that does not depend on the request:
+        the static text before the first placeholder, or the whole prompt plus the user turn
+        marker for chat-style prompts. _prepare() always emits it byte-for-byte, so Ollama can
+        reuse the evaluated prefix across requests.
+        """
+        template = self.prompt_repository.load_template(prompt_name or self.default_prompt)
+        if template.placeholders:
+            return template.segments[0]
+        return f"{template.source}{CHAT_USER_TURN}"
+
+    def warm_up(self, prompt_name: Optional[str] = None, system_prompt_name: Optional[str] = None) -> list[dict]:
+        """Load the model and evaluate system prompt + stable prefix on every backend ahead of traffic."""
+        if not self.ollama_client:
+            return []
+        system_prompt_text = self.prompt_repository.load_prompt(system_prompt_name or self.default_system_prompt)
+        return self.ollama_client.warm_up(system_prompt_text, self.stable_prefix(prompt_name))
+
+    def _prepare(self, request: AnalyzeRequest) -> _PreparedPrompt:
+        prompt_name = request.prompt_name or self.default_prompt
+        system_prompt_name = request.system_prompt_name or self.default_system_prompt
+
+        with self.metrics.prompt_load_seconds.time():
+            with stage(PROMPT):
+                system_prompt_text = self.prompt_repository.load_prompt(system_prompt_name)
+                template = self.prompt_repository.load_template(prompt_name)
+                examples = None
+                if self.few_shot_bank and template.has_placeholder(EXAMPLES):
+                    examples = self.prompt_repository.load_examples(self.few_shot_bank)
+
+            with stage(RENDER):
+                # If prompt has a placeholder, fill it; otherwise append user text in a chat-style turn.
+                values = {**(request.variables or {}), USER_TEXT: request.text}
+                if examples is not None and EXAMPLES not in values:
+                    values[EXAMPLES] = examples.render(request.text, self.few_shot_k, self.few_shot_tokens)
+                message = template.render(values)
+                if not template.has_placeholder(USER_TEXT):
+                    message = f"{message}{CHAT_USER_TURN}{request.text}{CHAT_ASSISTANT_TURN}"
+
+        return _PreparedPrompt(
             prompt_name=prompt_name,
             system_prompt_name=system_prompt_name,
-            prompt=prompt_text,
+            system_prompt_text=system_prompt_text,
+            prompt_text=template.source,
+            message=message,
+        )
+
+    def _response(
+        self, prepared: _PreparedPrompt, request: AnalyzeRequest, generation_response: Optional[dict]
+    ) -> AnalyzeResponse:
+        triples = None
+        if isinstance(generation_response, dict) and (request.output != TURTLE or self.triple_store is not None):
+            with stage(TRIPLES):
+                triples, validation = parse_turtle(generation_response.get("response"))
+                if self.triple_store is not None:
+                    self._store(triples, validation, generation_response.get("response"))
+            if request.output == TURTLE:
+                triples = None
+        return AnalyzeResponse(
+            prompt_name=prepared.prompt_name,
+            system_prompt_name=prepared.system_prompt_name,
+            prompt=prepared.prompt_text if request.include_prompt else None,
             input_text=request.text,
-            message_for_model=message,
+            message_for_model=prepared.message if request.include_prompt else None,
             generation=generation_response,
+            triples=triples,
         )
 
+    def _store(self, graph: TripleGraph, validation: TurtleValidation, source: str) -> None:
+        # Partial graphs (syntax errors, undeclared prefixes) would leak malformed terms into the store.
+        if not validation.valid:
+            self.metrics.graphs_skipped.inc()
+            return
+        inserted = self.triple_store.add(graph, source=source)
+        self.metrics.triples_stored.inc(inserted, outcome="inserted")
+        self.metrics.triples_stored.inc(len(graph) - inserted, outcome="duplicate")
+
+    def _generate(self, prepared: _PreparedPrompt, request: AnalyzeRequest) -> dict:
+        key = None
+        if self.generation_cache is not None or self.single_flight is not None:
+            # Identical payloads are deterministic when a seed and low temperature are configured.
+            key = generation_cache_key(self.ollama_client.build_payload(prepared.system_prompt_text, prepared.message))
+        if self.generation_cache is not None:
+            cached = self.generation_cache.get(key)
+            if cached is not None:
+                return dict(cached)
+
+        def generate() -> dict:
+            # Cache hits above never take an admission slot; only calls that reach the model do.
+            with self.admission.slot(request.priority, self._deadline(request)) if self.admission else nullcontext():
+                generation_response = self.ollama_client.generate(
+                    system_prompt=prepared.system_prompt_text,
+                    prompt=prepared.message,
+                    prompt_name=prepared.prompt_name,
+                    input_text=request.text,
+                )
+            if self.generation_cache is not None and generation_response.get("done", True):
+                self.generation_cache.set(key, generation_response)
+            return generation_response
+
+        if self.single_flight is None:
+            generation_response = generate()
+        else:
+            # Concurrent identical requests share one generation (and one admission slot).
+            generation_response = self.single_flight.do(key, generate)
+        # Cached and coalesced results are shared objects; every caller gets its own top-level dict.
+        return dict(generation_response)
+
+    async def _generate_async(self, prepared: _PreparedPrompt, request: AnalyzeRequest) -> dict:
+        key = None
+        if self.generation_cache is not None or self.single_flight is not None:
+            key = generation_cache_key(
+                self.async_ollama_client.build_payload(prepared.system_prompt_text, prepared.message)
+            )
+        if self.generation_cache is not None:
+            cached = await asyncio.to_thread(self.generation_cache.get, key)
+            if cached is not None:
+                return dict(cached)
+
+        async def generate() -> dict:
+            async with (
+                self.admission.slot_async(request.priority, self._deadline(request)) if self.admission else nullcontext()
+            ):
+                generation_response = await self.async_ollama_client.generate(
+                    system_prompt=prepared.system_prompt_text,
+                    prompt=prepared.message,
+                    prompt_name=prepared.prompt_name,
+                    input_text=request.text,
+                )
+            if self.generation_cache is not None and generation_response.get("done", True):
+                await asyncio.to_thread(self.generation_cache.set, key, generation_response)
+            return generation_response
+
+        if self.single_flight is None:
+            generation_response = await generate()
+        else:
+            generation_response = await self.single_flight.do_async(key, generate)
+        return dict(generation_response)
+
+    def _deadline(self, request: AnalyzeRequest) -> Optional[float]:
+        # Taken when the request enters the admission queue, not when it was parsed.
+        if request.queue_timeout is None:
+            return None
+        return self.admission.deadline_for(request.queue_timeout)
+
+    def get_cache_stats(self) -> Optional[dict]:
+        if self.generation_cache is None:
+            return None
+        return self.generation_cache.stats()
+
+    def _cache_metrics(self) -> list:
+        stats = self.generation_cache.stats()
+        hits = Counter("kg_generation_cache_hits_total", "Generation cache hits.")
+        hits.inc(stats["hits"])
+        misses = Counter("kg_generation_cache_misses_total", "Generation cache misses.")
+        misses.inc(stats["misses"])
+        hit_rate = Gauge("kg_generation_cache_hit_ratio", "Share of generation lookups served from cache.")
+        hit_rate.set(stats["hit_rate"])
+        return [hits, misses, hit_rate]
+
     def get_default_prompt(self) -> str:
         return self.default_prompt
 
@@ -0,0 +1,77 @@
+"""
+In-flight de-duplication of identical generations: while a call for a key is
+outstanding, later callers with the same key wait for it and share its result
+(or its exception) instead of starting their own. Nothing is kept once the call
+finishes; persistence across time is the generation cache's job.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, TypeVar
+
+from ..infrastructure.metrics import Metrics
+
+T = TypeVar("T")
+
+LEADER = "leader"
+COALESCED = "coalesced"
+
+
+class SingleFlight:
+    """Thread-safe for the Flask path; do_async() coalesces tasks on the calling event loop."""
+
+    def __init__(self, metrics: Metrics | None = None) -> None:
+        self.metrics = metrics or Metrics()
+        self._lock = threading.Lock()
+        self._calls: dict[str, Future] = {}
+        self._tasks: dict[str, asyncio.Task] = {}
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._calls) + len(self._tasks)
+
+    def do(self, key: str, fn: Callable[[], T]) -> T:
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = self._calls[key] = Future()
+        if not leader:
+            self.metrics.single_flight.inc(outcome=COALESCED)
+            return future.result()
+
+        self.metrics.single_flight.inc(outcome=LEADER)
+        try:
+            result = fn()
+        except BaseException as exc:
+            self._finish(key)
+            future.set_exception(exc)
+            raise
+        self._finish(key)
+        future.set_result(result)
+        return result
+
+    async def do_async(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        task = self._tasks.get(key)
+        if task is None:
+            self.metrics.single_flight.inc(outcome=LEADER)
+            # A task of its own, so the first caller disconnecting does not cancel the others.
+            task = self._tasks[key] = asyncio.ensure_future(fn())
+            task.add_done_callback(lambda done: self._task_done(key, done))
+        else:
+            self.metrics.single_flight.inc(outcome=COALESCED)
+        return await asyncio.shield(task)
+
+    def _task_done(self, key: str, task: asyncio.Task) -> None:
+        self._tasks.pop(key, None)
+        if not task.cancelled():
+            # Marks the exception retrieved even if every waiter went away.
+            task.exception()
+
+    def _finish(self, key: str) -> None:
+        # Removed before the result is published, so late arrivals start a fresh call.
+        with self._lock:
+            self._calls.pop(key, None)
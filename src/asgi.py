@@ -0,0 +1,31 @@
+"""
+ASGI entry point for the async serving path:
+
+    uvicorn src.asgi:create_asgi_app --factory --host 127.0.0.1 --port 8000
+"""
+
+from dotenv import load_dotenv
+
+from .app import build_service
+from .controllers.asgi_analyze import create_analyze_asgi_app
+from .controllers.response_encoding import ResponseEncodingConfig
+from .controllers.server_timing import ServerTimingConfig
+from .infrastructure.env import int_from_env
+
+
+def create_asgi_app():
+    load_dotenv()
+
+    service = build_service(use_async_client=True)
+
+    async def on_shutdown() -> None:
+        await service.async_ollama_client.aclose()
+        service.ollama_client.response_logger.close()
+
+    return create_analyze_asgi_app(
+        service,
+        max_batch_items=int_from_env("ANALYZE_BATCH_MAX_ITEMS", 1000),
+        on_shutdown=on_shutdown,
+        encoding=ResponseEncodingConfig.from_env(),
+        server_timing=ServerTimingConfig.from_env(),
+    )
@@ -0,0 +1,4 @@
+from .mock_ollama import MockOllamaConfig, MockOllamaServer
+from .runner import compare, run_benchmark
+
+__all__ = ["MockOllamaConfig", "MockOllamaServer", "compare", "run_benchmark"]
@@ -0,0 +1,185 @@
+"""
+Local stand-in for Ollama's /api/generate and /api/ps with configurable latency,
+token rate, streaming and error injection. Timings are reported in the same
+fields (nanoseconds) as the real server, so metrics and the response log see
+realistic values.
+"""
+
+from __future__ import annotations
+
+import json
+import random
+import threading
+import time
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+
+DEFAULT_RESPONSE = """@prefix ex: <http://example.org/kg/> .
+@prefix schema: <http://schema.org/> .
+@prefix rdfs: <http://www.w3.org/2000/01/rdf-schema#> .
+
+ex:alice a schema:Person ;
+  rdfs:label "Alice" ;
+  schema:knows ex:bob .
+
+ex:bob a schema:Person ;
+  rdfs:label "Bob" .
+"""
+
+
+@dataclass(frozen=True)
+class MockOllamaConfig:
+    # Seconds before the first token (prompt evaluation), plus up to jitter extra.
+    latency: float = 0.05
+    jitter: float = 0.0
+    # Generation speed; 0 returns the whole response at once.
+    tokens_per_second: float = 0.0
+    error_rate: float = 0.0
+    error_status: int = 500
+    response: str = DEFAULT_RESPONSE
+    model: str = "mock"
+    seed: int = 0
+
+
+class MockOllamaServer:
+    """Threaded HTTP server on 127.0.0.1; use as a context manager or call start()/stop()."""
+
+    def __init__(self, config: MockOllamaConfig | None = None, port: int = 0) -> None:
+        self.config = config or MockOllamaConfig()
+        self._random = random.Random(self.config.seed)
+        self._random_lock = threading.Lock()
+        self.requests = 0
+        self.errors = 0
+        self._server = ThreadingHTTPServer(("127.0.0.1", port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "MockOllamaServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, name="mock-ollama", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self) -> "MockOllamaServer":
+        return self.start()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+    def _draw(self) -> tuple[float, bool]:
+        """Latency and error decision for one request, from the seeded generator."""
+        with self._random_lock:
+            self.requests += 1
+            delay = self.config.latency + self._random.random() * self.config.jitter
+            failed = self._random.random() < self.config.error_rate
+            if failed:
+                self.errors += 1
+        return delay, failed
+
+    def _handler_class(self) -> type[BaseHTTPRequestHandler]:
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Headers and body are separate writes; without this, delayed ACKs add ~40ms per response.
+            disable_nagle_algorithm = True
+
+            def log_message(self, format: str, *args: Any) -> None:  # noqa: A002 - signature from the base class
+                return None
+
+            def do_GET(self) -> None:
+                if self.path != "/api/ps":
+                    self._json(404, {"error": "not found"})
+                    return
+                self._json(200, {"models": [{"name": server.config.model, "model": server.config.model}]})
+
+            def do_POST(self) -> None:
+                if self.path != "/api/generate":
+                    self._json(404, {"error": "not found"})
+                    return
+                length = int(self.headers.get("Content-Length") or 0)
+                payload = json.loads(self.rfile.read(length) or b"{}")
+                delay, failed = server._draw()
+                time.sleep(delay)
+                if failed:
+                    self._json(server.config.error_status, {"error": "injected failure"})
+                    return
+                if payload.get("stream", True):
+                    self._stream(payload, delay)
+                else:
+                    pieces = _tokens(server.config.response)
+                    self._sleep_for_tokens(len(pieces))
+                    self._json(200, _final(server.config, payload, delay, len(pieces), server.config.response))
+
+            def _stream(self, payload: dict, delay: float) -> None:
+                pieces = _tokens(server.config.response)
+                self.send_response(200)
+                self.send_header("Content-Type", "application/x-ndjson")
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+                for piece in pieces:
+                    self._sleep_for_tokens(1)
+                    self._chunk({"model": server.config.model, "response": piece, "done": False})
+                self._chunk(_final(server.config, payload, delay, len(pieces), ""))
+                self.wfile.write(b"0\r\n\r\n")
+
+            def _sleep_for_tokens(self, count: int) -> None:
+                if server.config.tokens_per_second > 0:
+                    time.sleep(count / server.config.tokens_per_second)
+
+            def _chunk(self, data: dict) -> None:
+                body = json.dumps(data).encode("utf-8") + b"\n"
+                self.wfile.write(f"{len(body):x}\r\n".encode("ascii") + body + b"\r\n")
+                self.wfile.flush()
+
+            def _json(self, status: int, data: dict) -> None:
+                body = json.dumps(data).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        return Handler
+
+
+def _tokens(text: str) -> list[str]:
+    """Split into word-sized pieces (whitespace kept) that concatenate back to text."""
+    pieces: list[str] = []
+    start = 0
+    for index in range(1, len(text)):
+        if text[index - 1].isspace() and not text[index].isspace():
+            pieces.append(text[start:index])
+            start = index
+    pieces.append(text[start:])
+    return pieces
+
+
+def _final(config: MockOllamaConfig, payload: dict, delay: float, eval_count: int, response: str) -> dict:
+    prompt_tokens = max(1, len(f"{payload.get('system', '')}{payload.get('prompt', '')}") // 4)
+    eval_seconds = eval_count / config.tokens_per_second if config.tokens_per_second > 0 else 0.0
+    return {
+        "model": payload.get("model") or config.model,
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "response": response,
+        "done": True,
+        "done_reason": "stop",
+        "total_duration": int((delay + eval_seconds) * 1e9),
+        "load_duration": 0,
+        "prompt_eval_count": prompt_tokens,
+        "prompt_eval_duration": int(delay * 1e9),
+        "eval_count": eval_count,
+        "eval_duration": int(eval_seconds * 1e9),
+    }
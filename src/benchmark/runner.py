@@ -0,0 +1,301 @@
+"""
+Load-generating scenarios against create_app(), backed by MockOllamaServer.
+
+    python -m src.benchmark --requests 200 --concurrency 8 --output bench/current.json
+    python -m src.benchmark --compare bench/baseline.json --fail-on-regression
+
+Requests go through the Flask app in-process (one test client per worker thread),
+so the numbers cover routing, prompt loading, the service, the HTTP client, Turtle
+validation and the response log, with the model replaced by a seeded mock.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Callable, Sequence
+
+try:  # Unix only; peak RSS is reported as None elsewhere.
+    import resource
+except ImportError:  # pragma: no cover - exercised on Windows
+    resource = None
+
+from .mock_ollama import MockOllamaConfig, MockOllamaServer
+
+_SUBJECTS = ("Alice", "Bob", "Marie Curie", "Alan Turing", "Ada Systems", "The research lab", "Grace Lee", "Paris")
+_VERBS = ("knows", "works with", "founded", "visited", "wrote about", "collaborated with", "moved to", "studied")
+_OBJECTS = ("Bob", "Carol", "Berlin", "radium", "Bletchley Park", "a multimodal model", "Northwind", "the archive")
+
+
+def sentence(index: int) -> str:
+    """Deterministic corpus: the same index always gives the same sentence."""
+    return (
+        f"{_SUBJECTS[index % len(_SUBJECTS)]} {_VERBS[(index // 3) % len(_VERBS)]} "
+        f"{_OBJECTS[(index // 7) % len(_OBJECTS)]} in {1900 + index % 120}."
+    )
+
+
+@dataclass(frozen=True)
+class Scenario:
+    name: str
+    method: str
+    path: str
+    requests: int
+    concurrency: int
+    # Analyses per request (batch items); documents count as one.
+    items_per_request: int
+    body: Callable[[int], dict]
+
+
+def build_scenarios(requests: int, concurrency: int, batch_size: int = 10, document_sentences: int = 60) -> dict[str, Scenario]:
+    return {
+        "single": Scenario("single", "POST", "/analyze", requests, 1, 1, lambda i: {"text": sentence(i)}),
+        "concurrent": Scenario(
+            "concurrent", "POST", "/analyze", requests, concurrency, 1, lambda i: {"text": sentence(i)}
+        ),
+        "batch": Scenario(
+            "batch",
+            "POST",
+            "/analyze/batch",
+            max(1, requests // batch_size),
+            1,
+            batch_size,
+            lambda i: {"texts": [sentence(i * batch_size + j) for j in range(batch_size)]},
+        ),
+        "document": Scenario(
+            "document",
+            "POST",
+            "/analyze/document",
+            max(1, requests // 20),
+            1,
+            1,
+            lambda i: {"text": "\n\n".join(" ".join(sentence(i * 1000 + j * 5 + k) for k in range(5)) for j in range(document_sentences // 5))},
+        ),
+        "stream": Scenario(
+            "stream", "POST", "/analyze/stream", requests, concurrency, 1, lambda i: {"text": sentence(i)}
+        ),
+    }
+
+
+def percentile(values: Sequence[float], fraction: float) -> float:
+    """Linear interpolation between closest ranks (numpy's default method)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * fraction
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def peak_rss_mb() -> float | None:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes.
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def _failed(response) -> bool:
+    if response.status_code >= 400:
+        return True
+    if response.mimetype == "application/json":
+        data = response.get_json(silent=True) or {}
+        results = data.get("results")
+        return bool(data.get("errors")) or (isinstance(results, list) and any("error" in item for item in results))
+    # Streams report failures in their final event (NDJSON line or SSE data line).
+    last = response.get_data(as_text=True).strip().rsplit("\n", 1)[-1]
+    try:
+        event = json.loads(last.removeprefix("data:").strip() or "{}")
+    except ValueError:
+        return True
+    return bool(event.get("error"))
+
+
+def run_scenario(app, scenario: Scenario, warmup: int = 0) -> dict[str, Any]:
+    local = threading.local()
+
+    def call(index: int) -> tuple[float, bool]:
+        client = getattr(local, "client", None)
+        if client is None:
+            client = local.client = app.test_client()
+        started = time.perf_counter()
+        response = client.open(scenario.path, method=scenario.method, json=scenario.body(index))
+        # Reading the body drains streamed responses, so their latency is end-to-end.
+        response.get_data()
+        return time.perf_counter() - started, _failed(response)
+
+    for index in range(warmup):
+        call(-1 - index)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=scenario.concurrency, thread_name_prefix=f"bench-{scenario.name}") as executor:
+        outcomes = list(executor.map(call, range(scenario.requests)))
+    elapsed = time.perf_counter() - started
+
+    latencies = [latency for latency, _ in outcomes]
+    items = scenario.requests * scenario.items_per_request
+    return {
+        "scenario": scenario.name,
+        "endpoint": scenario.path,
+        "requests": scenario.requests,
+        "concurrency": scenario.concurrency,
+        "errors": sum(1 for _, failed in outcomes if failed),
+        "duration_seconds": round(elapsed, 4),
+        "requests_per_second": round(scenario.requests / elapsed, 2) if elapsed else 0.0,
+        "items_per_second": round(items / elapsed, 2) if elapsed else 0.0,
+        "latency_ms": {
+            "p50": round(percentile(latencies, 0.50) * 1000, 3),
+            "p95": round(percentile(latencies, 0.95) * 1000, 3),
+            "p99": round(percentile(latencies, 0.99) * 1000, 3),
+            "mean": round(sum(latencies) / len(latencies) * 1000, 3) if latencies else 0.0,
+            "max": round(max(latencies, default=0.0) * 1000, 3),
+        },
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def build_benchmark_app(mock_url: str, workdir: Path):
+    """create_app() wired to the mock; unrelated settings still come from the environment."""
+    os.environ["OLLAMA_API_URL"] = mock_url
+    os.environ["OLLAMA_CSV_PATH"] = str(workdir / "responses.csv")
+    os.environ.pop("OLLAMA_API_URLS", None)
+    os.environ.setdefault("OLLAMA_MODEL", "mock")
+    os.environ.setdefault("DEFAULT_PROMPT_NAME", "prompts/few-shot.txt")
+    os.environ.setdefault("DEFAULT_SYSTEM_PROMPT_NAME", "system/knowledge_graph.txt")
+    from ..app import create_app
+
+    return create_app()
+
+
+def _git_revision() -> str | None:
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=5, check=True
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return result.stdout.strip() or None
+
+
+def run_benchmark(
+    scenario_names: Sequence[str],
+    requests: int = 200,
+    concurrency: int = 8,
+    mock: MockOllamaConfig | None = None,
+    warmup: int = 5,
+    trace_memory: bool = False,
+) -> dict[str, Any]:
+    mock = mock or MockOllamaConfig()
+    scenarios = build_scenarios(requests, concurrency)
+    unknown = [name for name in scenario_names if name not in scenarios]
+    if unknown:
+        raise ValueError(f"Unknown scenarios: {', '.join(unknown)}. Choose from: {', '.join(scenarios)}.")
+
+    results = []
+    with tempfile.TemporaryDirectory(prefix="kg-bench-") as workdir, MockOllamaServer(mock) as server:
+        app = build_benchmark_app(server.url, Path(workdir))
+        for name in scenario_names:
+            if trace_memory:
+                tracemalloc.start()
+            result = run_scenario(app, scenarios[name], warmup=warmup)
+            if trace_memory:
+                result["python_peak_mb"] = round(tracemalloc.get_traced_memory()[1] / (1024 * 1024), 2)
+                tracemalloc.stop()
+            results.append(result)
+        app.extensions["response_logger"].close()
+        mock_stats = {"requests": server.requests, "injected_errors": server.errors}
+
+    return {
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "git_revision": _git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": {"requests": requests, "concurrency": concurrency, "warmup": warmup, "mock": asdict(mock)},
+        "mock": mock_stats,
+        "scenarios": results,
+    }
+
+
+def compare(current: dict[str, Any], baseline: dict[str, Any], tolerance: float = 0.10) -> list[str]:
+    """Regressions beyond tolerance: higher p95 latency or lower throughput, per scenario."""
+    previous = {result["scenario"]: result for result in baseline.get("scenarios", [])}
+    regressions = []
+    for result in current.get("scenarios", []):
+        before = previous.get(result["scenario"])
+        if before is None:
+            continue
+        p95, old_p95 = result["latency_ms"]["p95"], before["latency_ms"]["p95"]
+        if old_p95 and p95 > old_p95 * (1 + tolerance):
+            regressions.append(f"{result['scenario']}: p95 {old_p95:.1f}ms -> {p95:.1f}ms")
+        rps, old_rps = result["requests_per_second"], before["requests_per_second"]
+        if old_rps and rps < old_rps * (1 - tolerance):
+            regressions.append(f"{result['scenario']}: {old_rps:.1f} -> {rps:.1f} req/s")
+    return regressions
+
+
+def format_report(report: dict[str, Any]) -> str:
+    lines = [f"{'scenario':<12}{'req':>7}{'err':>6}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'rss MB':>9}"]
+    for result in report["scenarios"]:
+        latency = result["latency_ms"]
+        lines.append(
+            f"{result['scenario']:<12}{result['requests']:>7}{result['errors']:>6}{result['requests_per_second']:>10.1f}"
+            f"{latency['p50']:>10.1f}{latency['p95']:>10.1f}{latency['p99']:>10.1f}{result['peak_rss_mb'] or 0:>9.1f}"
+        )
+    return "\n".join(lines)
+
+
+def _parse_args(argv: list[str] | None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark the KG API against a local mock Ollama server.")
+    parser.add_argument("--scenarios", default="single,concurrent,batch,document,stream", help="Comma-separated list.")
+    parser.add_argument("--requests", type=int, default=200, help="Requests per scenario (batch/document use fewer).")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--warmup", type=int, default=5, help="Unmeasured requests before each scenario.")
+    parser.add_argument("--latency", type=float, default=0.05, help="Mock seconds before the first token.")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Extra random latency, seconds.")
+    parser.add_argument("--tokens-per-second", type=float, default=0.0, help="Mock generation speed (0 = instant).")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of mock requests answered with 500.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--trace-memory", action="store_true", help="Also report Python heap peak (slower).")
+    parser.add_argument("--output", type=Path, help="Write the JSON report here.")
+    parser.add_argument("--compare", type=Path, help="Baseline JSON report to compare against.")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="Allowed relative regression.")
+    parser.add_argument("--fail-on-regression", action="store_true")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = _parse_args(argv)
+    mock = MockOllamaConfig(
+        latency=args.latency,
+        jitter=args.jitter,
+        tokens_per_second=args.tokens_per_second,
+        error_rate=args.error_rate,
+        seed=args.seed,
+    )
+    names = [name.strip() for name in args.scenarios.split(",") if name.strip()]
+    report = run_benchmark(names, args.requests, args.concurrency, mock, args.warmup, args.trace_memory)
+    print(format_report(report))
+
+    if args.output is not None:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+
+    if args.compare is not None:
+        regressions = compare(report, json.loads(args.compare.read_text(encoding="utf-8")), args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        if regressions and args.fail_on_regression:
+            return 1
+    return 0
@@ -0,0 +1,237 @@
+"""
+Offline bulk extraction: stream a corpus through KnowledgeGraphService without HTTP.
+
+    python -m src.bulk --input corpus.jsonl --output graph.jsonl --workers 8
+
+Input is read lazily (JSONL objects or plain-text lines, from a file or stdin),
+at most 2 x workers records are in flight, and results are appended to the
+output in input order. Progress is checkpointed next to the output so an
+interrupted run resumes where it stopped.
+"""
+
+from __future__ import annotations
+
+import argparse
+import itertools
+import json
+import os
+import sys
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import IO, Any, Iterable, Iterator
+
+from .application.services import KnowledgeGraphService, result_payload
+from .domain.models import OUTPUT_FORMATS, TURTLE, AnalyzeRequest
+
+JSONL = "jsonl"
+TEXT = "text"
+
+
+@dataclass(frozen=True)
+class BulkItem:
+    record_id: Any = None
+    request: AnalyzeRequest | None = None
+    error: str | None = None
+
+
+@dataclass
+class Checkpoint:
+    completed: int = 0
+    output_offset: int = 0
+
+    @classmethod
+    def load(cls, path: Path) -> "Checkpoint":
+        if not path.exists():
+            return cls()
+        data = json.loads(path.read_text(encoding="utf-8"))
+        return cls(completed=int(data["completed"]), output_offset=int(data["output_offset"]))
+
+    def save(self, path: Path) -> None:
+        tmp_path = path.with_name(path.name + ".tmp")
+        tmp_path.write_text(json.dumps(asdict(self)), encoding="utf-8")
+        os.replace(tmp_path, path)
+
+
+@dataclass(frozen=True)
+class BulkSummary:
+    processed: int
+    failed: int
+    skipped: int
+
+
+def read_items(
+    stream: IO[str],
+    input_format: str,
+    text_field: str = "text",
+    defaults: dict | None = None,
+) -> Iterator[BulkItem]:
+    """Yield one item per input record; malformed records become error items instead of aborting."""
+    defaults = defaults or {}
+    for line in stream:
+        line = line.rstrip("\r\n")
+        if not line.strip():
+            continue
+        if input_format == TEXT:
+            yield BulkItem(
+                request=AnalyzeRequest(
+                    text=line,
+                    prompt_name=defaults.get("prompt_name"),
+                    system_prompt_name=defaults.get("system_prompt_name"),
+                    output=defaults.get("output") or TURTLE,
+                    include_prompt=False,
+                )
+            )
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as exc:
+            yield BulkItem(error=f"Invalid JSON: {exc}")
+            continue
+        if not isinstance(record, dict) or not record.get(text_field):
+            record_id = record.get("id") if isinstance(record, dict) else None
+            yield BulkItem(record_id=record_id, error=f"Field {text_field!r} is required.")
+            continue
+        output = record.get("output", defaults.get("output") or TURTLE)
+        if output not in OUTPUT_FORMATS:
+            error = f"Field 'output' must be one of: {', '.join(OUTPUT_FORMATS)}."
+            yield BulkItem(record_id=record.get("id"), error=error)
+            continue
+        yield BulkItem(
+            record_id=record.get("id"),
+            request=AnalyzeRequest(
+                text=record[text_field],
+                prompt_name=record.get("prompt_name", defaults.get("prompt_name")),
+                system_prompt_name=record.get("system_prompt_name", defaults.get("system_prompt_name")),
+                variables=record.get("variables", defaults.get("variables")),
+                output=output,
+                include_prompt=False,
+            ),
+        )
+
+
+def _analyze(service: KnowledgeGraphService, item: BulkItem) -> dict:
+    if item.error is not None:
+        return {"error": item.error}
+    try:
+        response = service.analyze(item.request)
+    except Exception as exc:  # one bad record must not stop a multi-hour run
+        return {"error": str(exc), "error_type": type(exc).__name__}
+    return result_payload(response, item.request.output)
+
+
+def run_bulk(
+    service: KnowledgeGraphService,
+    items: Iterable[BulkItem],
+    output_path: Path,
+    checkpoint_path: Path | None = None,
+    workers: int = 4,
+    checkpoint_every: int = 100,
+) -> BulkSummary:
+    checkpoint_path = checkpoint_path or output_path.with_name(output_path.name + ".checkpoint")
+    checkpoint = Checkpoint.load(checkpoint_path)
+    if not output_path.exists():
+        checkpoint = Checkpoint()
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+
+    # Drop anything written after the last checkpoint so resumed output has no duplicates.
+    mode = "r+b" if checkpoint.completed else "wb"
+    processed = failed = 0
+    with output_path.open(mode) as output, ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bulk") as executor:
+        output.truncate(checkpoint.output_offset)
+        output.seek(checkpoint.output_offset)
+
+        window: deque[tuple[int, BulkItem, Future]] = deque()
+
+        def drain_one() -> None:
+            nonlocal processed, failed
+            index, item, future = window.popleft()
+            result = future.result()
+            record = {"index": index}
+            if item.record_id is not None:
+                record["id"] = item.record_id
+            record.update(result)
+            output.write((json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8"))
+            processed += 1
+            failed += "error" in result
+            checkpoint.completed = index + 1
+            if checkpoint.completed % checkpoint_every == 0:
+                output.flush()
+                checkpoint.output_offset = output.tell()
+                checkpoint.save(checkpoint_path)
+
+        remaining = itertools.islice(enumerate(items), checkpoint.completed, None)
+        for index, item in remaining:
+            window.append((index, item, executor.submit(_analyze, service, item)))
+            if len(window) >= workers * 2:
+                drain_one()
+        while window:
+            drain_one()
+
+        output.flush()
+        checkpoint.output_offset = output.tell()
+        checkpoint.save(checkpoint_path)
+
+    skipped = checkpoint.completed - processed
+    return BulkSummary(processed=processed, failed=failed, skipped=skipped)
+
+
+def _parse_args(argv: list[str] | None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m src.bulk", description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--input", default="-", help="Input file, or '-' for stdin (default).")
+    parser.add_argument("--output", required=True, type=Path, help="JSONL file results are appended to.")
+    parser.add_argument("--format", choices=("auto", JSONL, TEXT), default="auto", help="Input format.")
+    parser.add_argument("--text-field", default="text", help="JSONL field holding the text.")
+    parser.add_argument("--workers", type=int, default=4, help="Concurrent generations against Ollama.")
+    parser.add_argument("--checkpoint", type=Path, help="Checkpoint file (default: <output>.checkpoint).")
+    parser.add_argument("--checkpoint-every", type=int, default=100, help="Records between checkpoints.")
+    parser.add_argument("--prompt-name", help="Prompt override for every record.")
+    parser.add_argument("--system-prompt-name", help="System prompt override for every record.")
+    parser.add_argument(
+        "--output-format", choices=OUTPUT_FORMATS, help="Result shape for records without 'output' (default: turtle)."
+    )
+    return parser.parse_args(argv)
+
+
+def _input_format(args: argparse.Namespace) -> str:
+    if args.format != "auto":
+        return args.format
+    return JSONL if args.input.endswith((".jsonl", ".ndjson")) else TEXT
+
+
+def main(argv: list[str] | None = None) -> int:
+    from dotenv import load_dotenv
+
+    from .app import build_service
+
+    args = _parse_args(argv)
+    load_dotenv()
+    service = build_service()
+
+    defaults = {
+        "prompt_name": args.prompt_name,
+        "system_prompt_name": args.system_prompt_name,
+        "output": args.output_format,
+    }
+    stream = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8")
+    try:
+        summary = run_bulk(
+            service,
+            read_items(stream, _input_format(args), text_field=args.text_field, defaults=defaults),
+            output_path=args.output,
+            checkpoint_path=args.checkpoint,
+            workers=max(1, args.workers),
+            checkpoint_every=max(1, args.checkpoint_every),
+        )
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+        service.ollama_client.response_logger.flush()
+
+    print(json.dumps(asdict(summary)), file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,48 +1,257 @@
-from flask import Blueprint, jsonify, request
+import json
+from dataclasses import replace
+from typing import Callable, Iterator
+
+from flask import Blueprint, Response, jsonify, request, stream_with_context
 import requests
+from werkzeug.datastructures import MIMEAccept
+
+from ..application.admission import PRIORITIES, AdmissionRejected
+from ..application.services import AdmittedStream, KnowledgeGraphService, result_payload
+from ..domain.models import OUTPUT_FORMATS, TURTLE, AnalyzeRequest, DocumentAnalyzeResponse
+from ..infrastructure.response_log import RDF_VALIDATION
+
+
+PRIORITY_HEADER = "X-Priority"
+TIMEOUT_HEADER = "X-Request-Timeout"
+
+
+def _error_payload(exc: Exception) -> tuple[dict, int]:
+    if isinstance(exc, AdmissionRejected):
+        return {"error": str(exc), "retry_after": exc.retry_after}, exc.status
+    if isinstance(exc, FileNotFoundError):
+        return {"error": str(exc)}, 404
+    if isinstance(exc, requests.RequestException):
+        return {"error": "Failed to generate response from model.", "details": str(exc)}, 502
+    if isinstance(exc, RuntimeError):
+        return {"error": str(exc)}, 502
+    if isinstance(exc, ValueError):
+        return {"error": str(exc)}, 400
+    raise exc
+
+
+def parse_analyze_request(data: dict, defaults: dict | None = None) -> AnalyzeRequest:
+    defaults = defaults or {}
+    text = data.get("text")
+    if not text:
+        raise ValueError("Field 'text' is required.")
+
+    variables = data.get("variables", defaults.get("variables"))
+    if variables is not None and not (
+        isinstance(variables, dict) and all(isinstance(value, str) for value in variables.values())
+    ):
+        raise ValueError("Field 'variables' must be an object of strings.")
+
+    output = data.get("output", defaults.get("output", TURTLE))
+    if output not in OUTPUT_FORMATS:
+        raise ValueError(f"Field 'output' must be one of: {', '.join(OUTPUT_FORMATS)}.")
+
+    return AnalyzeRequest(
+        text=text,
+        prompt_name=data.get("prompt_name", defaults.get("prompt_name")),
+        system_prompt_name=data.get("system_prompt_name", defaults.get("system_prompt_name")),
+        variables=variables,
+        output=output,
+        include_prompt=False,
+    )
+
+
+def _with_admission(
+    service: KnowledgeGraphService, analyze_request: AnalyzeRequest, priority: str | None, timeout: str | None
+) -> AnalyzeRequest:
+    """Attach the caller's priority class and queue timeout (from request headers) when admission is on."""
+    if service.admission is None:
+        return analyze_request
+    if priority is not None and priority not in PRIORITIES:
+        raise ValueError(f"Header {PRIORITY_HEADER} must be one of: {', '.join(PRIORITIES)}.")
+    seconds = service.admission.config.queue_timeout
+    if timeout is not None:
+        try:
+            seconds = float(timeout)
+        except ValueError:
+            seconds = -1.0
+        if seconds <= 0:
+            raise ValueError(f"Header {TIMEOUT_HEADER} must be a positive number of seconds.")
+    return replace(analyze_request, priority=priority, queue_timeout=seconds)
+
+
+def _retry_after_headers(payload: dict) -> dict:
+    return {"Retry-After": str(payload["retry_after"])} if "retry_after" in payload else {}
+
+
+def _stream_event(chunk: dict) -> dict:
+    if chunk.get("done"):
+        event = {"done": True, "rdf": chunk.get("response"), "done_reason": chunk.get("done_reason")}
+        if RDF_VALIDATION in chunk:
+            event[RDF_VALIDATION] = chunk[RDF_VALIDATION]
+        return event
+    return {"done": False, "delta": chunk.get("response") or ""}
+
+
+def _stream_error_event(payload: dict, status: int) -> dict:
+    return {"done": True, **payload, "status": status}
+
+
+def _stream_events(chunks: Iterator[dict]) -> Iterator[dict]:
+    try:
+        for chunk in chunks:
+            yield _stream_event(chunk)
+    except (requests.RequestException, RuntimeError) as exc:
+        yield _stream_error_event(*_error_payload(exc))
+
+
+def _stream_format(accept: MIMEAccept) -> tuple[Callable[[dict], str], str]:
+    """NDJSON unless the client prefers Server-Sent Events."""
+    if accept.best_match(["application/x-ndjson", "text/event-stream"]) == "text/event-stream":
+        return _format_sse, "text/event-stream"
+    return _format_ndjson, "application/x-ndjson"
 
-from ..application.services import KnowledgeGraphService
-from ..domain.models import AnalyzeRequest
 
+def _format_sse(event: dict) -> str:
+    name = "error" if "error" in event else ("done" if event["done"] else "chunk")
+    return f"event: {name}\ndata: {json.dumps(event)}\n\n"
 
-def create_analyze_blueprint(service: KnowledgeGraphService) -> Blueprint:
+
+def _format_ndjson(event: dict) -> str:
+    return json.dumps(event) + "\n"
+
+
+def _document_result(
+    response: DocumentAnalyzeResponse, handle_error: Callable[[Exception], tuple[dict, int]]
+) -> tuple[dict, int, dict]:
+    """Body, status and headers for /analyze/document; the first chunk error decides when every chunk failed."""
+    errors = []
+    for result in response.errors:
+        try:
+            payload, status = handle_error(result.error)
+        except Exception:
+            payload, status = {"error": "Unexpected error while analyzing chunk."}, 500
+        errors.append({"chunk": result.index, **payload, "status": status})
+
+    body = {"text": response.input_text, "rdf": response.rdf, "chunks": len(response.chunks), "errors": errors}
+    if len(errors) == len(response.chunks):
+        if not errors:
+            return body, 400, {}
+        return body, errors[0]["status"], _retry_after_headers(errors[0])
+    return body, 200, {}
+
+
+def create_analyze_blueprint(service: KnowledgeGraphService, max_batch_items: int = 1000) -> Blueprint:
     blueprint = Blueprint("analyze", __name__)
+    metrics = service.metrics
+
+    def handle_error(exc: Exception, endpoint: str) -> tuple[dict, int]:
+        metrics.errors.inc(endpoint=endpoint, exception=type(exc).__name__)
+        return _error_payload(exc)
+
+    def error_response(exc: Exception, endpoint: str) -> tuple:
+        payload, status = handle_error(exc, endpoint)
+        return jsonify(payload), status, _retry_after_headers(payload)
+
+    def parse(data: dict, defaults: dict | None = None) -> AnalyzeRequest:
+        return _with_admission(
+            service,
+            parse_analyze_request(data, defaults=defaults),
+            request.headers.get(PRIORITY_HEADER),
+            request.headers.get(TIMEOUT_HEADER),
+        )
+
+    def tracked_stream(body: Iterator[str]) -> Iterator[str]:
+        # In-flight/latency for streams cover the whole body, not just the headers.
+        with metrics.track_request("analyze_stream"):
+            yield from body
 
     @blueprint.route("/health", methods=["GET"])
     def health() -> tuple:
         return jsonify({"status": "ok"}), 200
 
+    @blueprint.route("/cache/stats", methods=["GET"])
+    def cache_stats() -> tuple:
+        stats = service.get_cache_stats()
+        if stats is None:
+            return jsonify({"enabled": False}), 200
+        return jsonify({"enabled": True, **stats}), 200
+
     @blueprint.route("/analyze", methods=["POST"])
     def analyze() -> tuple:
-        data = request.get_json(silent=True) or {}
-        text = data.get("text")
-        if not text:
-            return jsonify({"error": "Field 'text' is required."}), 400
+        with metrics.track_request("analyze"):
+            data = request.get_json(silent=True) or {}
+            try:
+                analyze_request = parse(data)
+            except ValueError as exc:
+                return error_response(exc, "analyze")
+
+            try:
+                response = service.analyze(analyze_request)
+            except (FileNotFoundError, requests.RequestException, RuntimeError, ValueError) as exc:
+                return error_response(exc, "analyze")
 
-        prompt_name = data.get("prompt_name")
-        system_prompt_name = data.get("system_prompt_name")
+            return jsonify(result_payload(response, analyze_request.output)), 200
 
+    @blueprint.route("/analyze/stream", methods=["POST"])
+    def analyze_stream():
+        data = request.get_json(silent=True) or {}
         try:
-            response = service.analyze(
-                AnalyzeRequest(
-                    text=text,
-                    prompt_name=prompt_name,
-                    system_prompt_name=system_prompt_name,
-                )
-            )
-        except FileNotFoundError as exc:
-            return jsonify({"error": str(exc)}), 404
-        except requests.RequestException as exc:
-            return jsonify({"error": "Failed to generate response from model.", "details": str(exc)}), 502
-        except RuntimeError as exc:
-            return jsonify({"error": str(exc)}), 502
-        except ValueError as exc:
-            return jsonify({"error": str(exc)}), 400
-
-        rdf_output = None
-        if response.generation and isinstance(response.generation, dict):
-            rdf_output = response.generation.get("response")
-
-        return jsonify({"text": response.input_text, "rdf": rdf_output}), 200
+            chunks = service.analyze_stream(parse(data))
+        except (FileNotFoundError, requests.RequestException, RuntimeError, ValueError) as exc:
+            return error_response(exc, "analyze_stream")
+
+        formatter, mimetype = _stream_format(request.accept_mimetypes)
+        body = tracked_stream(formatter(event) for event in _stream_events(chunks))
+        response = Response(stream_with_context(body), mimetype=mimetype, headers={"Cache-Control": "no-cache"})
+        if isinstance(chunks, AdmittedStream):
+            # The WSGI server closes the response even when the body is never read; free the slot then.
+            response.call_on_close(chunks.close)
+        return response
+
+    @blueprint.route("/analyze/document", methods=["POST"])
+    def analyze_document() -> tuple:
+        with metrics.track_request("analyze_document"):
+            data = request.get_json(silent=True) or {}
+            try:
+                response = service.analyze_document(parse(data))
+            except (FileNotFoundError, requests.RequestException, RuntimeError, ValueError) as exc:
+                return error_response(exc, "analyze_document")
+
+            body, status, headers = _document_result(response, lambda exc: handle_error(exc, "analyze_document"))
+            return jsonify(body), status, headers
+
+    @blueprint.route("/analyze/batch", methods=["POST"])
+    def analyze_batch() -> tuple:
+        with metrics.track_request("analyze_batch"):
+            return _analyze_batch()
+
+    def _analyze_batch() -> tuple:
+        data = request.get_json(silent=True) or {}
+        items = data.get("items")
+        if items is None and isinstance(data.get("texts"), list):
+            items = [{"text": text} for text in data["texts"]]
+        if not isinstance(items, list) or not items:
+            return jsonify({"error": "Field 'items' (or 'texts') must be a non-empty list."}), 400
+        if len(items) > max_batch_items:
+            return jsonify({"error": f"Batch exceeds the limit of {max_batch_items} items."}), 413
+
+        results: list[dict | None] = [None] * len(items)
+        pending: list[tuple[int, AnalyzeRequest]] = []
+        for index, item in enumerate(items):
+            try:
+                if not isinstance(item, dict):
+                    raise ValueError("Each item must be an object.")
+                pending.append((index, parse(item, defaults=data)))
+            except ValueError as exc:
+                results[index] = {"index": index, "error": str(exc), "status": 400}
+
+        outcomes = service.analyze_batch([analyze_request for _, analyze_request in pending])
+        for (index, analyze_request), outcome in zip(pending, outcomes):
+            if outcome.error is None:
+                results[index] = {"index": index, **result_payload(outcome.response, analyze_request.output)}
+                continue
+            try:
+                payload, status = handle_error(outcome.error, "analyze_batch")
+            except Exception:
+                payload, status = {"error": "Unexpected error while analyzing item."}, 500
+            results[index] = {"index": index, **payload, "status": status}
+
+        return jsonify({"results": results}), 200
 
     return blueprint
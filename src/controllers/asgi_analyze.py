@@ -0,0 +1,278 @@
+"""
+ASGI adapter for the analyze routes, driven by KnowledgeGraphService.analyze_async.
+Kept framework-free so any ASGI server (uvicorn, hypercorn) can serve it.
+"""
+
+import asyncio
+import itertools
+import json
+import time
+from typing import Any, AsyncIterator, Awaitable, Callable
+from urllib.parse import parse_qsl
+
+from werkzeug.datastructures import MIMEAccept
+from werkzeug.http import parse_accept_header
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover - exercised when httpx is absent
+    httpx = None
+
+from ..application.services import KnowledgeGraphService, result_payload
+from ..infrastructure.timing import TOTAL, collect
+from .analyze_controller import (
+    PRIORITY_HEADER,
+    TIMEOUT_HEADER,
+    _document_result,
+    _error_payload,
+    _retry_after_headers,
+    _stream_error_event,
+    _stream_event,
+    _stream_format,
+    _with_admission,
+    parse_analyze_request,
+)
+from .metrics_controller import CONTENT_TYPE as METRICS_CONTENT_TYPE
+from .response_encoding import ResponseEncodingConfig, compress_asgi, json_bytes
+from .server_timing import ServerTimingConfig, timing_headers, with_timings
+from .triples_controller import NTRIPLES_CONTENT_TYPE, _lookup
+
+Scope = dict[str, Any]
+Receive = Callable[[], Awaitable[dict]]
+Send = Callable[[dict], Awaitable[None]]
+
+_HTTP_ERRORS = (httpx.HTTPError,) if httpx is not None else ()
+_HANDLED = (FileNotFoundError, RuntimeError, ValueError) + _HTTP_ERRORS
+
+
+def _async_error_payload(exc: Exception) -> tuple[dict, int]:
+    if httpx is not None and isinstance(exc, httpx.HTTPError):
+        return {"error": "Failed to generate response from model.", "details": str(exc)}, 502
+    return _error_payload(exc)
+
+
+async def _stream_events(chunks: AsyncIterator[dict]) -> AsyncIterator[dict]:
+    try:
+        async for chunk in chunks:
+            yield _stream_event(chunk)
+    except (RuntimeError,) + _HTTP_ERRORS as exc:
+        yield _stream_error_event(*_async_error_payload(exc))
+
+
+async def _read_json(receive: Receive) -> dict:
+    chunks = []
+    while True:
+        message = await receive()
+        chunks.append(message.get("body", b""))
+        if not message.get("more_body"):
+            break
+    try:
+        data = json.loads(b"".join(chunks) or b"{}")
+    except ValueError:
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def _header(scope: Scope, name: str) -> str | None:
+    wanted = name.lower().encode("latin-1")
+    for key, value in scope.get("headers", ()):
+        if key.lower() == wanted:
+            return value.decode("latin-1")
+    return None
+
+
+async def _send(
+    send: Send, status: int, body: bytes, content_type: str = "application/json", headers: dict | None = None
+) -> None:
+    raw_headers = [(b"content-type", content_type.encode()), (b"content-length", str(len(body)).encode())]
+    for name, value in (headers or {}).items():
+        raw_headers.append((name.lower().encode("latin-1"), value.encode("latin-1")))
+    await send({"type": "http.response.start", "status": status, "headers": raw_headers})
+    await send({"type": "http.response.body", "body": body})
+
+
+async def _send_json(
+    send: Send, payload: Any, status: int = 200, fast_json: bool = False, headers: dict | None = None
+) -> None:
+    if isinstance(payload, dict) and status >= 400:
+        headers = {**(headers or {}), **_retry_after_headers(payload)}
+    await _send(send, status, json_bytes(payload, fast=fast_json), headers=headers)
+
+
+def create_analyze_asgi_app(
+    service: KnowledgeGraphService,
+    max_batch_items: int = 1000,
+    on_shutdown: Callable[[], Awaitable[None]] | None = None,
+    encoding: ResponseEncodingConfig | None = None,
+    server_timing: ServerTimingConfig | None = None,
+) -> Callable[[Scope, Receive, Send], Awaitable[None]]:
+    metrics = service.metrics
+    encoding = encoding or ResponseEncodingConfig()
+    server_timing = server_timing or ServerTimingConfig()
+
+    async def send_json(send: Send, payload: Any, status: int = 200, headers: dict | None = None) -> None:
+        await _send_json(send, payload, status, fast_json=encoding.use_orjson, headers=headers)
+
+    def parse(scope: Scope, data: dict, defaults: dict | None = None):
+        return _with_admission(
+            service,
+            parse_analyze_request(data, defaults=defaults),
+            _header(scope, PRIORITY_HEADER),
+            _header(scope, TIMEOUT_HEADER),
+        )
+
+    def handle_error(exc: Exception, endpoint: str) -> tuple[dict, int]:
+        metrics.errors.inc(endpoint=endpoint, exception=type(exc).__name__)
+        return _async_error_payload(exc)
+
+    async def analyze(scope: Scope, data: dict) -> tuple[dict, int, dict]:
+        try:
+            analyze_request = parse(scope, data)
+            response = await service.analyze_async(analyze_request)
+        except _HANDLED as exc:
+            return *handle_error(exc, "analyze"), {}
+        return result_payload(response, analyze_request.output), 200, {}
+
+    async def analyze_document(scope: Scope, data: dict) -> tuple[dict, int, dict]:
+        try:
+            response = await service.analyze_document_async(parse(scope, data))
+        except _HANDLED as exc:
+            return *handle_error(exc, "analyze_document"), {}
+        return _document_result(response, lambda exc: handle_error(exc, "analyze_document"))
+
+    async def analyze_batch(scope: Scope, data: dict) -> tuple[dict, int, dict]:
+        items = data.get("items")
+        if items is None and isinstance(data.get("texts"), list):
+            items = [{"text": text} for text in data["texts"]]
+        if not isinstance(items, list) or not items:
+            return {"error": "Field 'items' (or 'texts') must be a non-empty list."}, 400, {}
+        if len(items) > max_batch_items:
+            return {"error": f"Batch exceeds the limit of {max_batch_items} items."}, 413, {}
+
+        results: list[dict | None] = [None] * len(items)
+        pending = []
+        for index, item in enumerate(items):
+            try:
+                if not isinstance(item, dict):
+                    raise ValueError("Each item must be an object.")
+                pending.append((index, parse(scope, item, defaults=data)))
+            except ValueError as exc:
+                results[index] = {"index": index, "error": str(exc), "status": 400}
+
+        outcomes = await service.analyze_batch_async([request for _, request in pending])
+        for (index, analyze_request), outcome in zip(pending, outcomes):
+            if outcome.error is None:
+                results[index] = {"index": index, **result_payload(outcome.response, analyze_request.output)}
+                continue
+            try:
+                payload, status = handle_error(outcome.error, "analyze_batch")
+            except Exception:
+                payload, status = {"error": "Unexpected error while analyzing item."}, 500
+            results[index] = {"index": index, **payload, "status": status}
+        return {"results": results}, 200, {}
+
+    async def analyze_stream(scope: Scope, receive: Receive, send: Send) -> None:
+        # In-flight/latency for streams cover the whole body, not just the headers.
+        with metrics.track_request("analyze_stream"):
+            try:
+                chunks = await service.analyze_stream_async(parse(scope, await _read_json(receive)))
+            except _HANDLED as exc:
+                payload, status = handle_error(exc, "analyze_stream")
+                await send_json(send, payload, status)
+                return
+            formatter, content_type = _stream_format(parse_accept_header(_header(scope, "accept"), MIMEAccept))
+            try:
+                await send(
+                    {
+                        "type": "http.response.start",
+                        "status": 200,
+                        "headers": [(b"content-type", content_type.encode()), (b"cache-control", b"no-cache")],
+                    }
+                )
+                async for event in _stream_events(chunks):
+                    await send({"type": "http.response.body", "body": formatter(event).encode("utf-8"), "more_body": True})
+                await send({"type": "http.response.body", "body": b""})
+            finally:
+                # Also runs when the client disconnects mid-stream: frees the backend and the admission slot.
+                await chunks.aclose()
+
+    async def triples(scope: Scope, send: Send) -> None:
+        store = service.triple_store
+        path = scope["path"]
+        if path == "/triples":
+            args = dict(parse_qsl(scope.get("query_string", b"").decode("latin-1")))
+            payload, status = await asyncio.to_thread(_lookup, store, args)
+            await send_json(send, payload, status)
+        elif path == "/triples/stats":
+            await send_json(send, await asyncio.to_thread(store.stats))
+        elif path == "/triples/export":
+            await send(
+                {"type": "http.response.start", "status": 200, "headers": [(b"content-type", NTRIPLES_CONTENT_TYPE.encode())]}
+            )
+            lines = store.export()
+            while True:
+                # Each batch is read on a worker thread so the store never blocks the loop.
+                batch = await asyncio.to_thread(lambda: "".join(itertools.islice(lines, 1000)))
+                if not batch:
+                    break
+                await send({"type": "http.response.body", "body": batch.encode("utf-8"), "more_body": True})
+            await send({"type": "http.response.body", "body": b""})
+        else:
+            await send_json(send, {"error": "Not found."}, 404)
+
+    post_routes = {
+        "/analyze": ("analyze", analyze),
+        "/analyze/batch": ("analyze_batch", analyze_batch),
+        "/analyze/document": ("analyze_document", analyze_document),
+    }
+
+    async def lifespan(receive: Receive, send: Send) -> None:
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                if on_shutdown is not None:
+                    await on_shutdown()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    async def app(scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "lifespan":
+            await lifespan(receive, send)
+            return
+
+        path, method = scope["path"], scope["method"]
+        if method == "GET" and path == "/health":
+            await send_json(send, {"status": "ok"})
+        elif method == "GET" and path == "/cache/stats":
+            stats = service.get_cache_stats()
+            await send_json(send, {"enabled": False} if stats is None else {"enabled": True, **stats})
+        elif method == "GET" and path == "/metrics":
+            await _send(send, 200, metrics.render().encode("utf-8"), METRICS_CONTENT_TYPE)
+        elif method == "GET" and path.startswith("/triples") and service.triple_store is not None:
+            await triples(scope, send)
+        elif path == "/analyze/stream":
+            if method != "POST":
+                await send_json(send, {"error": "Method not allowed."}, 405)
+                return
+            await analyze_stream(scope, receive, send)
+        elif path in post_routes:
+            if method != "POST":
+                await send_json(send, {"error": "Method not allowed."}, 405)
+                return
+            endpoint, handler = post_routes[path]
+            with metrics.track_request(endpoint), collect() as timings:
+                started = time.perf_counter()
+                payload, status, headers = await handler(scope, await _read_json(receive))
+                timings.add(TOTAL, time.perf_counter() - started)
+            await send_json(
+                send,
+                with_timings(payload, timings, server_timing),
+                status,
+                {**headers, **timing_headers(timings, server_timing)},
+            )
+        else:
+            await send_json(send, {"error": "Not found."}, 404)
+
+    return compress_asgi(app, encoding)
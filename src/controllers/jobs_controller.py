@@ -0,0 +1,67 @@
+from typing import Callable
+
+from flask import Blueprint, jsonify, request, url_for
+
+from ..application.admission import PRIORITIES
+from ..application.jobs import PRIORITY_NAMES, submit_job
+from ..infrastructure.job_store import SqliteJobStore
+from .analyze_controller import PRIORITY_HEADER, parse_analyze_request
+from .triples_controller import bounded_int
+
+DEFAULT_PAGE = 100
+MAX_PAGE = 1000
+
+
+def create_jobs_blueprint(
+    store: SqliteJobStore, max_batch_items: int = 1000, on_submit: Callable[[], None] | None = None
+) -> Blueprint:
+    blueprint = Blueprint("jobs", __name__)
+
+    @blueprint.route("/jobs", methods=["POST"])
+    def submit() -> tuple:
+        data = request.get_json(silent=True) or {}
+        items = data.get("items")
+        if items is None and isinstance(data.get("texts"), list):
+            items = [{"text": text} for text in data["texts"]]
+        if items is None and "text" in data:
+            items = [data]
+        if not isinstance(items, list) or not items:
+            return jsonify({"error": "Field 'text', 'items' or 'texts' is required."}), 400
+        if len(items) > max_batch_items:
+            return jsonify({"error": f"Job exceeds the limit of {max_batch_items} items."}), 413
+
+        priority = data.get("priority") or request.headers.get(PRIORITY_HEADER)
+        if priority is not None and priority not in PRIORITIES:
+            return jsonify({"error": f"Priority must be one of: {', '.join(PRIORITIES)}."}), 400
+
+        # Everything is validated up front: a job is accepted whole or not at all.
+        analyze_requests = []
+        for index, item in enumerate(items):
+            try:
+                if not isinstance(item, dict):
+                    raise ValueError("Each item must be an object.")
+                analyze_requests.append(parse_analyze_request(item, defaults=data))
+            except ValueError as exc:
+                return jsonify({"error": str(exc), "index": index}), 400
+
+        job_id = submit_job(store, analyze_requests, priority)
+        if on_submit is not None:
+            on_submit()
+        location = url_for("jobs.status", job_id=job_id)
+        return jsonify({"id": job_id, "status": "queued", "total": len(items)}), 202, {"Location": location}
+
+    @blueprint.route("/jobs/<job_id>", methods=["GET"])
+    def status(job_id: str) -> tuple:
+        try:
+            limit = bounded_int(request.args, "limit", DEFAULT_PAGE, MAX_PAGE)
+            offset = bounded_int(request.args, "offset", 0)
+        except ValueError as exc:
+            return jsonify({"error": str(exc)}), 400
+
+        job = store.get(job_id, offset=offset, limit=limit)
+        if job is None:
+            return jsonify({"error": f"Job '{job_id}' not found."}), 404
+        job["priority"] = PRIORITY_NAMES.get(job["priority"], job["priority"])
+        return jsonify({**job, "offset": offset, "limit": limit}), 200
+
+    return blueprint
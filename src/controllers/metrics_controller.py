@@ -0,0 +1,15 @@
+from flask import Blueprint, Response
+
+from ..infrastructure.metrics import Metrics
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def create_metrics_blueprint(metrics: Metrics) -> Blueprint:
+    blueprint = Blueprint("metrics", __name__)
+
+    @blueprint.route("/metrics", methods=["GET"])
+    def scrape() -> Response:
+        return Response(metrics.render(), status=200, content_type=CONTENT_TYPE)
+
+    return blueprint
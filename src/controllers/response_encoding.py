@@ -0,0 +1,186 @@
+"""
+Opt-in response encoding shared by the Flask and ASGI apps: orjson instead of the
+stdlib encoder, and gzip/zstd compression picked from the client's Accept-Encoding.
+Streams (/analyze/stream, /triples/export) are never buffered for compression.
+"""
+
+from __future__ import annotations
+
+import gzip
+import json
+import os
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable
+
+from flask import Flask, Response, request
+from flask.json.provider import DefaultJSONProvider
+
+try:  # Optional: several times faster than json.dumps on large Turtle payloads.
+    import orjson
+except ImportError:  # pragma: no cover - exercised when orjson is absent
+    orjson = None
+
+try:  # Optional: zstd is only offered when the zstandard package is installed.
+    import zstandard
+except ImportError:  # pragma: no cover - exercised when zstandard is absent
+    zstandard = None
+
+from ..infrastructure.env import bool_from_env, int_from_env
+
+GZIP = "gzip"
+ZSTD = "zstd"
+# Generated Turtle, N-Triples and JSON compress well; anything else is passed through.
+COMPRESSIBLE_TYPES = ("application/json", "application/n-triples", "text/turtle", "text/plain")
+
+
+def _available(encoding: str) -> bool:
+    return encoding == GZIP or (encoding == ZSTD and zstandard is not None)
+
+
+@dataclass(frozen=True)
+class ResponseEncodingConfig:
+    fast_json: bool = False
+    # Encodings the server offers, in order of preference; empty disables compression.
+    compression: tuple[str, ...] = ()
+    min_bytes: int = 1024
+    gzip_level: int = 6
+    zstd_level: int = 3
+
+    @classmethod
+    def from_env(cls) -> "ResponseEncodingConfig":
+        offered = (name.strip().lower() for name in (os.getenv("RESPONSE_COMPRESSION") or "").split(","))
+        return cls(
+            fast_json=bool_from_env("FAST_JSON", False),
+            compression=tuple(encoding for encoding in offered if encoding and _available(encoding)),
+            min_bytes=max(0, int_from_env("RESPONSE_COMPRESSION_MIN_BYTES", 1024)),
+            gzip_level=min(9, max(1, int_from_env("RESPONSE_GZIP_LEVEL", 6))),
+            zstd_level=min(22, max(1, int_from_env("RESPONSE_ZSTD_LEVEL", 3))),
+        )
+
+    @property
+    def use_orjson(self) -> bool:
+        return self.fast_json and orjson is not None
+
+
+def json_bytes(payload: Any, fast: bool = False) -> bytes:
+    if fast and orjson is not None:
+        return orjson.dumps(payload, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(payload).encode("utf-8")
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson; output is compact and keys keep insertion order."""
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        return orjson.dumps(obj, default=self.default, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+
+    def loads(self, s: str | bytes, **kwargs: Any) -> Any:
+        return orjson.loads(s)
+
+    def response(self, *args: Any, **kwargs: Any) -> Response:
+        # Bytes go straight into the response, skipping the str round-trip of dumps().
+        obj = self._prepare_response_obj(args, kwargs)
+        body = orjson.dumps(obj, default=self.default, option=orjson.OPT_NON_STR_KEYS)
+        return self._app.response_class(body, mimetype=self.mimetype)
+
+
+def negotiate(accept_encoding: str | None, offered: tuple[str, ...]) -> str | None:
+    """The server's most preferred encoding the client accepts (q > 0); identity when none match."""
+    if not accept_encoding or not offered:
+        return None
+    accepted: dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[name.strip().lower()] = quality
+    wildcard = accepted.get("*", 0.0)
+    for encoding in offered:
+        if accepted.get(encoding, wildcard) > 0:
+            return encoding
+    return None
+
+
+def compress(body: bytes, encoding: str, config: ResponseEncodingConfig) -> bytes:
+    if encoding == ZSTD:
+        return zstandard.ZstdCompressor(level=config.zstd_level).compress(body)
+    # mtime=0 keeps the output deterministic for identical bodies.
+    return gzip.compress(body, compresslevel=config.gzip_level, mtime=0)
+
+
+def _compressible(content_type: str | None) -> bool:
+    return bool(content_type) and content_type.split(";")[0].strip().lower() in COMPRESSIBLE_TYPES
+
+
+def install_response_encoding(app: Flask, config: ResponseEncodingConfig) -> None:
+    if config.use_orjson:
+        app.json = OrjsonProvider(app)
+    if not config.compression:
+        return
+
+    @app.after_request
+    def compress_response(response: Response) -> Response:
+        if response.is_streamed or response.direct_passthrough or not _compressible(response.content_type):
+            return response
+        response.vary.add("Accept-Encoding")
+        if response.status_code < 200 or response.status_code in (204, 304) or "Content-Encoding" in response.headers:
+            return response
+        encoding = negotiate(request.headers.get("Accept-Encoding"), config.compression)
+        body = response.get_data()
+        if encoding is None or len(body) < config.min_bytes:
+            return response
+        response.set_data(compress(body, encoding, config))
+        response.headers["Content-Encoding"] = encoding
+        return response
+
+
+Scope = dict[str, Any]
+ASGIApp = Callable[[Scope, Callable[[], Awaitable[dict]], Callable[[dict], Awaitable[None]]], Awaitable[None]]
+
+
+def compress_asgi(app: ASGIApp, config: ResponseEncodingConfig) -> ASGIApp:
+    """Compress single-message ASGI responses; multi-part (streamed) bodies pass through untouched."""
+    if not config.compression:
+        return app
+
+    async def wrapped(scope: Scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await app(scope, receive, send)
+            return
+        accept = None
+        for key, value in scope.get("headers", ()):
+            if key.lower() == b"accept-encoding":
+                accept = value.decode("latin-1")
+        encoding = negotiate(accept, config.compression)
+        start: dict | None = None
+
+        async def compressing_send(message: dict) -> None:
+            nonlocal start
+            if message["type"] == "http.response.start":
+                start = message
+                return
+            if start is None:
+                await send(message)
+                return
+            held, start = start, None
+            headers = [(key, value) for key, value in held.get("headers", ())]
+            content_type = next((value.decode("latin-1") for key, value in headers if key == b"content-type"), None)
+            body = message.get("body", b"")
+            if _compressible(content_type) and not message.get("more_body"):
+                headers.append((b"vary", b"Accept-Encoding"))
+                if encoding is not None and len(body) >= config.min_bytes:
+                    body = compress(body, encoding, config)
+                    headers = [(key, value) for key, value in headers if key != b"content-length"]
+                    headers += [(b"content-encoding", encoding.encode()), (b"content-length", str(len(body)).encode())]
+                    message = {**message, "body": body}
+            await send({**held, "headers": headers})
+            await send(message)
+
+        await app(scope, receive, compressing_send)
+
+    return wrapped
@@ -0,0 +1,88 @@
+"""
+Per-request stage timings reported in a Server-Timing header (and, opt-in, under a
+"timings" key of JSON object bodies), plus the hook that runs a sampled share of
+requests under the profiler. Streamed responses only report stages finished
+before the first byte.
+"""
+
+from __future__ import annotations
+
+import time
+from contextlib import ExitStack
+from dataclasses import dataclass
+
+from flask import Flask, Response, g
+
+from ..infrastructure.env import bool_from_env
+from ..infrastructure.profiling import SampledProfiler
+from ..infrastructure.timing import TOTAL, StageTimings, collect
+
+HEADER = "Server-Timing"
+BODY_KEY = "timings"
+
+
+@dataclass(frozen=True)
+class ServerTimingConfig:
+    header: bool = True
+    # Adds a "timings" object (milliseconds per stage) to JSON object responses.
+    body: bool = False
+
+    @property
+    def enabled(self) -> bool:
+        return self.header or self.body
+
+    @classmethod
+    def from_env(cls) -> "ServerTimingConfig":
+        defaults = cls()
+        return cls(
+            header=bool_from_env("SERVER_TIMING", defaults.header),
+            body=bool_from_env("SERVER_TIMING_BODY", defaults.body),
+        )
+
+
+def timing_headers(timings: StageTimings, config: ServerTimingConfig) -> dict[str, str]:
+    return {HEADER: timings.server_timing()} if config.header and timings.stages else {}
+
+
+def with_timings(payload, timings: StageTimings, config: ServerTimingConfig):
+    if config.body and isinstance(payload, dict):
+        return {**payload, BODY_KEY: timings.to_dict()}
+    return payload
+
+
+def install_server_timing(app: Flask, config: ServerTimingConfig, profiler: SampledProfiler | None = None) -> None:
+    """
+    Install after install_response_encoding(): after_request hooks run in reverse order of
+    registration, so timings are added before the body is compressed.
+    """
+    profiling = profiler is not None and profiler.config.enabled
+    if not config.enabled and not profiling:
+        return
+
+    @app.before_request
+    def start_timing() -> None:
+        scope = ExitStack()
+        g.stage_scope = scope
+        g.stage_started = time.perf_counter()
+        g.stage_timings = scope.enter_context(collect())
+        if profiling:
+            scope.enter_context(profiler.maybe_profile())
+
+    @app.after_request
+    def report_timing(response: Response) -> Response:
+        timings = g.get("stage_timings")
+        if timings is None or not config.enabled:
+            return response
+        timings.add(TOTAL, time.perf_counter() - g.stage_started)
+        if config.body and response.is_json and not response.is_streamed:
+            payload = response.get_json(silent=True)
+            if isinstance(payload, dict):
+                response.set_data(app.json.dumps(with_timings(payload, timings, config)))
+        response.headers.update(timing_headers(timings, config))
+        return response
+
+    @app.teardown_request
+    def finish_timing(exc: BaseException | None) -> None:
+        scope = g.pop("stage_scope", None)
+        if scope is not None:
+            scope.close()
@@ -0,0 +1,62 @@
+from typing import Mapping
+
+from flask import Blueprint, Response, jsonify, request
+
+from ..infrastructure.triple_store import SqliteTripleStore, as_term
+
+NTRIPLES_CONTENT_TYPE = "application/n-triples; charset=utf-8"
+DEFAULT_LIMIT = 100
+MAX_LIMIT = 1000
+
+
+def bounded_int(args: Mapping[str, str], name: str, default: int, maximum: int | None = None) -> int:
+    raw = args.get(name)
+    if raw in (None, ""):
+        return default
+    try:
+        value = int(raw)
+    except ValueError:
+        raise ValueError(f"Query parameter '{name}' must be an integer.") from None
+    if value < 0:
+        raise ValueError(f"Query parameter '{name}' must not be negative.")
+    return min(value, maximum) if maximum is not None else value
+
+
+def _lookup(store: SqliteTripleStore, args: Mapping[str, str]) -> tuple[dict, int]:
+    """
+    Shared by the Flask and ASGI routes. Terms are N-Triples (<iri>, "literal", _:b) or bare IRIs;
+    entity matches triples where the term is the subject or the object.
+    """
+    try:
+        limit = bounded_int(args, "limit", DEFAULT_LIMIT, MAX_LIMIT)
+        offset = bounded_int(args, "offset", 0)
+    except ValueError as exc:
+        return {"error": str(exc)}, 400
+
+    terms = {name: as_term(args[name]) for name in ("entity", "subject", "predicate", "object") if args.get(name)}
+    if "entity" in terms:
+        if len(terms) > 1:
+            return {"error": "Query parameter 'entity' cannot be combined with subject/predicate/object."}, 400
+        triples = store.describe(terms["entity"], limit=limit, offset=offset)
+    else:
+        triples = store.find(terms.get("subject"), terms.get("predicate"), terms.get("object"), limit=limit, offset=offset)
+    return {"triples": [list(triple) for triple in triples], "limit": limit, "offset": offset}, 200
+
+
+def create_triples_blueprint(store: SqliteTripleStore) -> Blueprint:
+    blueprint = Blueprint("triples", __name__)
+
+    @blueprint.route("/triples", methods=["GET"])
+    def lookup():
+        payload, status = _lookup(store, request.args)
+        return jsonify(payload), status
+
+    @blueprint.route("/triples/stats", methods=["GET"])
+    def stats():
+        return jsonify(store.stats()), 200
+
+    @blueprint.route("/triples/export", methods=["GET"])
+    def export() -> Response:
+        return Response(store.export(), status=200, content_type=NTRIPLES_CONTENT_TYPE)
+
+    return blueprint
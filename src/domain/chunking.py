@@ -0,0 +1,64 @@
+import re
+
+from .prompt_template import CHARS_PER_TOKEN
+
+_PARAGRAPH_BREAK = re.compile(r"\n\s*\n")
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+(?=[\"'(\[]?[A-Z0-9À-Ý])")
+
+
+def estimate_tokens(text: str) -> int:
+    return -(-len(text) // CHARS_PER_TOKEN)
+
+
+def _split_sentences(paragraph: str) -> list[str]:
+    return [sentence.strip() for sentence in _SENTENCE_END.split(paragraph) if sentence.strip()]
+
+
+def _split_words(sentence: str, max_chars: int) -> list[str]:
+    """Last resort for a single sentence longer than the budget."""
+    pieces: list[str] = []
+    current: list[str] = []
+    length = 0
+    for word in sentence.split():
+        if current and length + 1 + len(word) > max_chars:
+            pieces.append(" ".join(current))
+            current, length = [], 0
+        current.append(word)
+        length += len(word) + (1 if length else 0)
+    if current:
+        pieces.append(" ".join(current))
+    return pieces
+
+
+def split_into_chunks(text: str, max_tokens: int) -> list[str]:
+    """
+    Pack paragraphs, then sentences, into chunks of at most max_tokens (estimated).
+    Paragraph boundaries are preferred; sentences are never split unless one alone
+    exceeds the budget.
+    """
+    max_chars = max(1, max_tokens) * CHARS_PER_TOKEN
+    units: list[tuple[str, str]] = []  # (separator before the unit, unit text)
+    for paragraph in _PARAGRAPH_BREAK.split(text.strip()):
+        paragraph = paragraph.strip()
+        if not paragraph:
+            continue
+        if len(paragraph) <= max_chars:
+            units.append(("\n\n", paragraph))
+            continue
+        for position, sentence in enumerate(_split_sentences(paragraph)):
+            separator = "\n\n" if position == 0 else " "
+            if len(sentence) <= max_chars:
+                units.append((separator, sentence))
+            else:
+                units.extend((separator if index == 0 else " ", piece) for index, piece in enumerate(_split_words(sentence, max_chars)))
+
+    chunks: list[str] = []
+    current = ""
+    for separator, unit in units:
+        if current and len(current) + len(separator) + len(unit) > max_chars:
+            chunks.append(current)
+            current = ""
+        current = unit if not current else current + separator + unit
+    if current:
+        chunks.append(current)
+    return chunks
@@ -0,0 +1,119 @@
+"""
+Few-shot example selection: examples are kept individually, indexed once with
+TF-IDF vectors over their input text, and for each request the most similar
+ones are chosen under a token budget instead of sending the whole bank.
+"""
+
+from __future__ import annotations
+
+import math
+import re
+from collections import Counter
+from dataclasses import dataclass
+from typing import Sequence
+
+try:  # Optional: vectorised scoring for large banks; both paths compute in float64 and give the same ranking.
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised when numpy is absent
+    np = None
+
+from .chunking import estimate_tokens
+
+_WORD = re.compile(r"\w+")
+_RDF_MARKER = re.compile(r"^RDF:\s*$", re.MULTILINE)
+# Scores are rounded so that summation-order differences between the NumPy and
+# pure-Python paths (last-bit noise) cannot reorder ties.
+_SCORE_DIGITS = 12
+EXAMPLE_SEPARATOR = "\n\n"
+
+
+def _terms(text: str) -> list[str]:
+    return [word for word in _WORD.findall(text.lower()) if len(word) > 1]
+
+
+@dataclass(frozen=True)
+class FewShotExample:
+    name: str
+    # The example's input side, used for similarity; content is what goes into the prompt.
+    text: str
+    content: str
+    tokens: int
+
+    @classmethod
+    def parse(cls, name: str, content: str) -> "FewShotExample":
+        """Examples use the prompt's own layout: "Text: ..." then "RDF:" and the Turtle."""
+        content = content.strip()
+        marker = _RDF_MARKER.search(content)
+        text = content[: marker.start()] if marker else content
+        if text.startswith("Text:"):
+            text = text[len("Text:") :]
+        return cls(name=name, text=text.strip(), content=content, tokens=estimate_tokens(content))
+
+
+class FewShotIndex:
+    """TF-IDF index over an example bank; built once, queried per request."""
+
+    def __init__(self, examples: Sequence[FewShotExample]) -> None:
+        self.examples = tuple(examples)
+        documents = [Counter(_terms(example.text)) for example in self.examples]
+        document_frequency = Counter(term for document in documents for term in document)
+        total = len(documents)
+        # Smoothed idf, so terms present in every example still count a little.
+        self._idf = {term: math.log((1 + total) / (1 + count)) + 1.0 for term, count in document_frequency.items()}
+        self._vectors = [self._vector(document) for document in documents]
+        self._matrix = None
+        if np is not None and self.examples:
+            vocabulary = {term: column for column, term in enumerate(self._idf)}
+            self._columns = vocabulary
+            self._matrix = np.zeros((total, len(vocabulary)), dtype=np.float64)
+            for row, vector in enumerate(self._vectors):
+                for term, weight in vector.items():
+                    self._matrix[row, vocabulary[term]] = weight
+
+    def __len__(self) -> int:
+        return len(self.examples)
+
+    def scores(self, text: str) -> list[float]:
+        """Cosine similarity of text to every example, in bank order."""
+        query = self._vector(Counter(term for term in _terms(text) if term in self._idf))
+        if not query:
+            return [0.0] * len(self.examples)
+        if self._matrix is not None:
+            vector = np.zeros(self._matrix.shape[1], dtype=np.float64)
+            for term, weight in query.items():
+                vector[self._columns[term]] = weight
+            return [round(float(score), _SCORE_DIGITS) for score in self._matrix @ vector]
+        return [
+            round(sum(weight * example.get(term, 0.0) for term, weight in query.items()), _SCORE_DIGITS)
+            for example in self._vectors
+        ]
+
+    def select(self, text: str, k: int, token_budget: int) -> list[FewShotExample]:
+        """
+        Up to k examples, most similar first, whose combined size fits token_budget.
+        An example that does not fit is skipped so a smaller, less similar one can still be used.
+        """
+        if k <= 0 or token_budget <= 0:
+            return []
+        scores = self.scores(text)
+        # Ties (including no overlap at all) keep bank order, so selection is deterministic.
+        ranked = sorted(range(len(self.examples)), key=lambda index: (-scores[index], index))
+        chosen: list[FewShotExample] = []
+        remaining = token_budget
+        for index in ranked:
+            example = self.examples[index]
+            if example.tokens <= remaining:
+                chosen.append(example)
+                remaining -= example.tokens
+                if len(chosen) == k:
+                    break
+        return chosen
+
+    def render(self, text: str, k: int, token_budget: int) -> str:
+        # The closest example goes last, right before the input it is meant to resemble.
+        return EXAMPLE_SEPARATOR.join(example.content for example in reversed(self.select(text, k, token_budget)))
+
+    def _vector(self, counts: Counter) -> dict[str, float]:
+        weights = {term: (1.0 + math.log(count)) * self._idf[term] for term, count in counts.items()}
+        norm = math.sqrt(sum(weight * weight for weight in weights.values()))
+        return {term: weight / norm for term, weight in weights.items()} if norm else {}
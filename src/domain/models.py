@@ -1,21 +1,43 @@
 from dataclasses import dataclass
+from typing import Mapping
 
+from .triples import TripleGraph
 
-@dataclass(frozen=True)
+# Output formats for the generated graph: the model's Turtle as-is, or parsed triples
+# as interned JSON arrays or N-Triples.
+TURTLE = "turtle"
+TRIPLES = "triples"
+NTRIPLES = "ntriples"
+OUTPUT_FORMATS = (TURTLE, TRIPLES, NTRIPLES)
+
+
+@dataclass(frozen=True, slots=True)
 class AnalyzeRequest:
     text: str
     prompt_name: str
     system_prompt_name: str | None = None
+    variables: Mapping[str, str] | None = None
+    # Admission control: priority class and how many seconds the request may wait queued,
+    # counted from when it enters the admission queue (a batch item may start much later
+    # than the HTTP request arrived). None waits without a deadline.
+    priority: str | None = None
+    queue_timeout: float | None = None
+    output: str = TURTLE
+    # Keep the template and rendered message on the response; HTTP callers never return them,
+    # so they opt out and the (often large) message is released as soon as generation is done.
+    include_prompt: bool = True
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class AnalyzeResponse:
     prompt_name: str
     system_prompt_name: str
-    prompt: str
+    prompt: str | None
     input_text: str
-    message_for_model: str
+    message_for_model: str | None
     generation: dict | None = None
+    # Parsed from the generated Turtle when the request asked for triples/ntriples output.
+    triples: TripleGraph | None = None
 
     def to_dict(self) -> dict:
         return {
@@ -25,4 +47,24 @@ class AnalyzeResponse:
             "input_text": self.input_text,
             "message_for_model": self.message_for_model,
             "generation": self.generation,
+            "triples": self.triples.to_json() if self.triples is not None else None,
         }
+
+
+@dataclass(frozen=True, slots=True)
+class BatchItemResult:
+    index: int
+    response: AnalyzeResponse | None = None
+    error: Exception | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class DocumentAnalyzeResponse:
+    input_text: str
+    rdf: str | None
+    chunks: tuple[str, ...]
+    chunk_results: tuple[BatchItemResult, ...]
+
+    @property
+    def errors(self) -> list[BatchItemResult]:
+        return [result for result in self.chunk_results if result.error is not None]
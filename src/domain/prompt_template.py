@@ -0,0 +1,62 @@
+import re
+from dataclasses import dataclass
+from typing import Mapping
+
+USER_TEXT = "USER_TEXT"
+# Filled with few-shot examples selected for the input (see KnowledgeGraphService).
+EXAMPLES = "EXAMPLES"
+
+_PLACEHOLDER_PATTERN = re.compile(r"\$\{([A-Za-z_][A-Za-z0-9_]*)\}")
+
+# Rough chars-per-token ratio for Llama-style tokenizers; good enough for budgeting.
+CHARS_PER_TOKEN = 4
+
+
+@dataclass(frozen=True)
+class PromptTemplate:
+    """
+    A prompt file split once into static segments around its ${NAME} placeholders.
+    segments always has one more element than placeholders.
+    """
+
+    source: str
+    segments: tuple[str, ...]
+    placeholders: tuple[str, ...]
+
+    @classmethod
+    def compile(cls, source: str) -> "PromptTemplate":
+        segments: list[str] = []
+        placeholders: list[str] = []
+        position = 0
+        for match in _PLACEHOLDER_PATTERN.finditer(source):
+            segments.append(source[position : match.start()])
+            placeholders.append(match.group(1))
+            position = match.end()
+        segments.append(source[position:])
+        return cls(source=source, segments=tuple(segments), placeholders=tuple(placeholders))
+
+    @property
+    def names(self) -> frozenset[str]:
+        return frozenset(self.placeholders)
+
+    def has_placeholder(self, name: str) -> bool:
+        return name in self.placeholders
+
+    @property
+    def static_length(self) -> int:
+        return sum(len(segment) for segment in self.segments)
+
+    @property
+    def static_token_estimate(self) -> int:
+        return -(-self.static_length // CHARS_PER_TOKEN)
+
+    def render(self, values: Mapping[str, str]) -> str:
+        """Fill placeholders in one join; placeholders without a value are kept verbatim."""
+        if not self.placeholders:
+            return self.source
+        parts: list[str] = [self.segments[0]]
+        for name, segment in zip(self.placeholders, self.segments[1:]):
+            value = values.get(name)
+            parts.append("${" + name + "}" if value is None else value)
+            parts.append(segment)
+        return "".join(parts)
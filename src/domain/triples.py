@@ -0,0 +1,203 @@
+"""
+Parsed triples in a compact form: every distinct term is interned once (as its
+N-Triples encoding) and triples are a flat array of integer term ids.
+"""
+
+from __future__ import annotations
+
+import re
+from array import array
+from typing import Iterator
+from urllib.parse import urljoin
+
+from .turtle_validator import ITEM, OBJECT, SUBJECT, TurtleValidation, TurtleValidator
+
+RDF = "http://www.w3.org/1999/02/22-rdf-syntax-ns#"
+XSD = "http://www.w3.org/2001/XMLSchema#"
+
+_STRING_ESCAPE = re.compile(r"\\(?:u([0-9A-Fa-f]{4})|U([0-9A-Fa-f]{8})|(.))", re.DOTALL)
+_ECHARS = {"t": "\t", "b": "\b", "n": "\n", "r": "\r", "f": "\f", '"': '"', "'": "'", "\\": "\\"}
+_LOCAL_ESCAPE = re.compile(r"\\(.)")
+_NT_ESCAPES = {"\\": "\\\\", '"': '\\"', "\n": "\\n", "\r": "\\r"}
+_NT_ESCAPE = re.compile(r'[\\"\n\r]')
+
+
+def _unescape_string(token: str) -> str:
+    quote = 3 if token[:3] in ('"""', "'''") else 1
+    body = token[quote:-quote]
+    if "\\" not in body:
+        return body
+
+    def replace(match: re.Match) -> str:
+        short, long, char = match.groups()
+        if short or long:
+            return chr(int(short or long, 16))
+        return _ECHARS.get(char, "\\" + char)
+
+    return _STRING_ESCAPE.sub(replace, body)
+
+
+def _literal(lexical: str, language: str | None = None, datatype: str | None = None) -> str:
+    encoded = '"' + _NT_ESCAPE.sub(lambda match: _NT_ESCAPES[match.group()], lexical) + '"'
+    if language:
+        return f"{encoded}@{language.lower()}"
+    if datatype and datatype != XSD + "string":
+        return f"{encoded}^^<{datatype}>"
+    return encoded
+
+
+class TripleGraph:
+    """Interned terms plus an array('I') of subject/predicate/object ids, three per triple."""
+
+    __slots__ = ("terms", "_ids", "_triples")
+
+    def __init__(self) -> None:
+        self.terms: list[str] = []
+        self._ids: dict[str, int] = {}
+        self._triples = array("I")
+
+    def intern(self, term: str) -> int:
+        term_id = self._ids.get(term)
+        if term_id is None:
+            term_id = self._ids[term] = len(self.terms)
+            self.terms.append(term)
+        return term_id
+
+    def add(self, subject: int, predicate: int, obj: int) -> None:
+        self._triples.extend((subject, predicate, obj))
+
+    def __len__(self) -> int:
+        return len(self._triples) // 3
+
+    def __iter__(self) -> Iterator[tuple[int, int, int]]:
+        triples = self._triples
+        for index in range(0, len(triples), 3):
+            yield triples[index], triples[index + 1], triples[index + 2]
+
+    def to_json(self) -> dict:
+        """{"terms": [N-Triples term, ...], "triples": [[s, p, o], ...]} with indexes into terms."""
+        return {"terms": list(self.terms), "triples": [list(triple) for triple in self]}
+
+    def to_ntriples(self) -> str:
+        terms = self.terms
+        return "".join(f"{terms[s]} {terms[p]} {terms[o]} .\n" for s, p, o in self)
+
+    @classmethod
+    def from_json(cls, data: dict) -> "TripleGraph":
+        graph = cls()
+        for term in data["terms"]:
+            graph.intern(term)
+        for subject, predicate, obj in data["triples"]:
+            graph.add(subject, predicate, obj)
+        return graph
+
+
+class TurtleParser(TurtleValidator):
+    """TurtleValidator that also builds a TripleGraph from the parse events."""
+
+    def __init__(self, graph: TripleGraph | None = None) -> None:
+        super().__init__()
+        self.graph = graph if graph is not None else TripleGraph()
+        self._namespaces: dict[str, str] = {}
+        self._base: str | None = None
+        self._blank_nodes: dict[str, int] = {}
+        self._blank_node_count = 0
+        self._subject: int | None = None
+        self._predicate: int | None = None
+        # (kind, role, saved subject, saved predicate, blank node id or collection item ids)
+        self._frames: list[tuple] = []
+
+    def _on_prefix(self, name: str, iri: str) -> None:
+        self._namespaces[name] = self._resolve(iri[1:-1])
+
+    def _on_base(self, iri: str) -> None:
+        self._base = self._resolve(iri[1:-1])
+
+    def _on_term(self, role: str, kind: str, value: str) -> None:
+        self._deliver(role, self._term(kind, value))
+
+    def _on_predicate(self, kind: str, value: str) -> None:
+        self._predicate = self.graph.intern(f"<{RDF}type>") if value == "a" else self._term(kind, value)
+
+    def _on_literal(
+        self, role: str, string: str, language: str | None = None, datatype: tuple[str, str] | None = None
+    ) -> None:
+        datatype_iri = self._iri(*datatype) if datatype else None
+        self._deliver(role, self.graph.intern(_literal(_unescape_string(string), language, datatype_iri)))
+
+    def _on_open(self, kind: str, role: str) -> None:
+        if kind == "[":
+            node = self._new_blank_node()
+            if role != SUBJECT:
+                self._deliver(role, node)
+            self._frames.append((kind, role, self._subject, self._predicate, node))
+            self._subject, self._predicate = node, None
+        else:
+            self._frames.append((kind, role, self._subject, self._predicate, []))
+
+    def _on_close(self, kind: str) -> None:
+        _, role, self._subject, self._predicate, value = self._frames.pop()
+        if kind == "[":
+            if role == SUBJECT:
+                self._subject = value
+            return
+        head = self._build_list(value)
+        self._deliver(role, head)
+
+    def _deliver(self, role: str, term_id: int) -> None:
+        if role == SUBJECT:
+            self._subject = term_id
+        elif role == OBJECT:
+            self.graph.add(self._subject, self._predicate, term_id)
+        elif role == ITEM:
+            self._frames[-1][4].append(term_id)
+
+    def _build_list(self, items: list[int]) -> int:
+        graph = self.graph
+        rest = graph.intern(f"<{RDF}nil>")
+        if not items:
+            return rest
+        first_id, rest_id = graph.intern(f"<{RDF}first>"), graph.intern(f"<{RDF}rest>")
+        for item in reversed(items):
+            node = self._new_blank_node()
+            graph.add(node, first_id, item)
+            graph.add(node, rest_id, rest)
+            rest = node
+        return rest
+
+    def _term(self, kind: str, value: str) -> int:
+        if kind == "bnode":
+            node = self._blank_nodes.get(value)
+            if node is None:
+                node = self._blank_nodes[value] = self._new_blank_node()
+            return node
+        if kind == "number":
+            datatype = "double" if "e" in value.lower() else "decimal" if "." in value else "integer"
+            return self.graph.intern(_literal(value, datatype=XSD + datatype))
+        if kind == "word":  # true / false
+            return self.graph.intern(_literal(value, datatype=XSD + "boolean"))
+        return self.graph.intern(f"<{self._iri(kind, value)}>")
+
+    def _iri(self, kind: str, value: str) -> str:
+        if kind == "iri":
+            return self._resolve(value[1:-1])
+        prefix, local = value.split(":", 1)
+        # Undeclared prefixes (reported by validation) are kept verbatim.
+        namespace = self._namespaces.get(prefix, f"{prefix}:")
+        return namespace + _LOCAL_ESCAPE.sub(r"\1", local)
+
+    def _resolve(self, iri: str) -> str:
+        return urljoin(self._base, iri) if self._base and ":" not in iri.split("/", 1)[0] else iri
+
+    def _new_blank_node(self) -> int:
+        # Labels from the document are renamed too, so they cannot clash with generated ones.
+        self._blank_node_count += 1
+        return self.graph.intern(f"_:b{self._blank_node_count}")
+
+
+def parse_turtle(text: str | None) -> tuple[TripleGraph, TurtleValidation]:
+    """Parse as far as the text is valid; the validation says whether the graph is complete."""
+    parser = TurtleParser()
+    if isinstance(text, str):
+        parser.feed(text)
+    return parser.graph, parser.close()
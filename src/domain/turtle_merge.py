@@ -0,0 +1,179 @@
+"""
+Merge Turtle documents produced for separate chunks of one input into a single graph.
+
+This is a structural merge, not a graph merge: each document is read with the same
+tokenizer and grammar as TurtleValidator (so it accepts exactly what validation
+accepts, and stops at the first syntax error like parse_turtle does), prefixes are
+unified, and predicate/object lists of the same subject (e.g. an ex: entity mentioned
+in several chunks) are combined without duplicates. Blank-node labels are scoped to
+their document, and a prefix a later document binds to a different IRI is renamed
+in that document's terms, so neither changes meaning in the merged graph.
+"""
+
+import re
+from typing import Iterable
+
+from .turtle_validator import TurtleValidator
+
+_FENCE = re.compile(r"```[a-zA-Z]*\n(.*?)```", re.DOTALL)
+
+Token = tuple[str, str]
+
+
+def strip_code_fences(text: str) -> str:
+    """Models often wrap Turtle in ```turtle fences; keep only the fenced content when present."""
+    blocks = _FENCE.findall(text)
+    return "\n".join(blocks) if blocks else text
+
+
+class _StatementReader(TurtleValidator):
+    """Collects the accepted tokens of each complete statement, plus the document's directives."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.statements: list[list[Token]] = []
+        self.prefixes: dict[str, str] = {}
+        self.base: str | None = None
+        self._tokens: list[Token] = []
+        self._directive = False
+
+    def _on_prefix(self, name: str, iri: str) -> None:
+        self.prefixes[name] = iri[1:-1]
+        self._directive = True
+
+    def _on_base(self, iri: str) -> None:
+        self.base = self.base or iri[1:-1]
+        self._directive = True
+
+    def _on_token(self, kind: str, value: str) -> None:
+        self._tokens.append((kind, value))
+        if not self._between_statements:
+            return
+        tokens, self._tokens = self._tokens, []
+        if self._directive:
+            self._directive = False
+        elif tokens[-1] == ("punct", "."):
+            self.statements.append(tokens[:-1])
+
+
+def _render(tokens: Iterable[Token]) -> str:
+    parts: list[str] = []
+    glue = True
+    for kind, value in tokens:
+        # Literal suffixes stay attached ("x"@en, "1"^^xsd:int); separators follow their term.
+        if parts and not glue and kind != "langtag" and value not in ("^^", ",", ";"):
+            parts.append(" ")
+        parts.append(value)
+        glue = value == "^^"
+    return "".join(parts)
+
+
+def _split(tokens: list[Token], separator: str) -> list[list[Token]]:
+    """Split at separator tokens outside [] / () nesting; empty parts (e.g. from ';;') are dropped."""
+    parts: list[list[Token]] = [[]]
+    depth = 0
+    for token in tokens:
+        value = token[1] if token[0] == "punct" else None
+        if value in ("[", "("):
+            depth += 1
+        elif value in ("]", ")"):
+            depth -= 1
+        elif value == separator and not depth:
+            parts.append([])
+            continue
+        parts[-1].append(token)
+    return [part for part in parts if part]
+
+
+class TurtleMerger:
+    """Accumulates documents; render() returns the merged graph."""
+
+    def __init__(self) -> None:
+        self.prefixes: dict[str, str] = {}
+        self.base: str | None = None
+        self.subjects: dict[str, dict[str, list[str]]] = {}
+        self.opaque: list[str] = []
+        self.documents = 0
+
+    def add(self, document: str) -> None:
+        reader = _StatementReader()
+        reader.feed(strip_code_fences(document))
+        reader.close()
+        self.base = self.base or reader.base
+
+        renames = self._bind(reader.prefixes)
+        blank_prefix = f"c{self.documents}_"
+        self.documents += 1
+        for statement in reader.statements:
+            self._add_statement([self._rewrite(token, renames, blank_prefix) for token in statement])
+
+    @staticmethod
+    def _rewrite(token: Token, renames: dict[str, str], blank_prefix: str) -> Token:
+        """Rename prefixes per renames and prepend blank_prefix to blank-node labels (_:b1 -> _:c0_b1)."""
+        kind, value = token
+        if kind == "bnode":
+            return kind, f"_:{blank_prefix}{value[2:]}"
+        if kind == "pname":
+            prefix, local = value.split(":", 1)
+            if prefix in renames:
+                return kind, f"{renames[prefix]}:{local}"
+        return token
+
+    def _bind(self, declared: dict[str, str]) -> dict[str, str]:
+        """Register a document's prefixes; returns renames for names already bound to another IRI."""
+        renames: dict[str, str] = {}
+        for name, iri in declared.items():
+            bound = self.prefixes.setdefault(name, iri)
+            if bound == iri:
+                continue
+            # Reuse a name already bound to this IRI, else pick a fresh one (ex -> ex1, default -> ns1).
+            target = next((other for other, other_iri in self.prefixes.items() if other_iri == iri), None)
+            if target is None:
+                stem, number = name or "ns", 1
+                while f"{stem}{number}" in self.prefixes or f"{stem}{number}" in declared:
+                    number += 1
+                target = f"{stem}{number}"
+                self.prefixes[target] = iri
+            renames[name] = target
+        return renames
+
+    def _add_statement(self, tokens: list[Token]) -> None:
+        subject_kind = tokens[0][0]
+        if subject_kind not in ("iri", "pname", "bnode") or len(tokens) < 3:
+            statement = _render(tokens)
+            if statement not in self.opaque:
+                self.opaque.append(statement)
+            return
+        predicates = self.subjects.setdefault(tokens[0][1], {})
+        for predicate_objects in _split(tokens[1:], ";"):
+            predicate, objects = _render(predicate_objects[:1]), predicate_objects[1:]
+            existing = predicates.setdefault(predicate, [])
+            for obj in _split(objects, ","):
+                rendered = _render(obj)
+                if rendered not in existing:
+                    existing.append(rendered)
+
+    def render(self) -> str:
+        lines: list[str] = []
+        if self.base is not None:
+            lines.append(f"@base <{self.base}> .")
+        lines.extend(f"@prefix {name}: <{iri}> ." for name, iri in self.prefixes.items())
+        blocks: list[str] = []
+        for subject, predicates in self.subjects.items():
+            entries = [f"{predicate} {', '.join(objects)}" for predicate, objects in predicates.items() if objects]
+            if entries:
+                blocks.append(f"{subject} " + " ;\n    ".join(entries) + " .")
+        blocks.extend(f"{statement} ." for statement in self.opaque)
+        if blocks:
+            if lines:
+                lines.append("")
+            lines.append("\n\n".join(blocks))
+        return "\n".join(lines) + "\n"
+
+
+def merge_turtle(documents: Iterable[str]) -> str:
+    merger = TurtleMerger()
+    for document in documents:
+        if document:
+            merger.add(document)
+    return merger.render()
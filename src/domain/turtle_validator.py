@@ -0,0 +1,407 @@
+"""
+Streaming Turtle syntax validator.
+
+Feed generated text in arbitrary chunks (e.g. as NDJSON deltas arrive) and call
+close() for the verdict: whether the document parses, how many triples it states,
+where the first syntax error is, and which prefixes were used without @prefix.
+It checks the Turtle grammar without building a graph, so it costs about one regex
+pass over the text. Markdown code fences (```turtle) are skipped.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+
+_PN_LOCAL_ESC = r"\\[-_~.!$&'()*+,;=/?#@%]"
+_PLX = rf"(?:%[0-9A-Fa-f]{{2}}|{_PN_LOCAL_ESC})"
+_PN_PREFIX = r"[^\W\d_](?:[\w.-]*[\w-])?"
+_PN_LOCAL = rf"(?:[\w:]|{_PLX})(?:(?:[\w.:-]|{_PLX})*(?:[\w:-]|{_PLX}))?"
+
+_TOKEN = re.compile(
+    "|".join(
+        (
+            r"(?P<ws>\s+)",
+            r"(?P<comment>#[^\r\n]*)",
+            r"(?P<fence>```[A-Za-z]*)",
+            r"(?P<iri><[^<>\"{}|^`\\\x00-\x20]*>)",
+            r"(?P<string>\"\"\"(?:[^\"\\]|\\.|\"(?!\"\"))*\"\"\""
+            r"|'''(?:[^'\\]|\\.|'(?!''))*'''"
+            r"|\"(?!\"\")(?:[^\"\\\r\n]|\\.)*\""
+            r"|'(?!'')(?:[^'\\\r\n]|\\.)*')",
+            r"(?P<directive>@(?:prefix|base)(?![\w-]))",
+            r"(?P<langtag>@[A-Za-z]+(?:-[A-Za-z0-9]+)*)",
+            r"(?P<bnode>_:[\w](?:[\w.-]*[\w-])?)",
+            rf"(?P<pname>(?:{_PN_PREFIX})?:(?:{_PN_LOCAL})?)",
+            r"(?P<number>[+-]?(?:\d+\.\d*[eE][+-]?\d+|\.\d+[eE][+-]?\d+|\d+[eE][+-]?\d+|\d*\.\d+|\d+))",
+            r"(?P<word>[A-Za-z]+)",
+            r"(?P<punct>\^\^|[.;,\[\]()])",
+        )
+    )
+)
+_SKIPPED = frozenset({"ws", "comment", "fence"})
+
+# Parser states.
+_STATEMENT = "statement"
+_PREFIX_NAME = "prefix name"
+_PREFIX_IRI = "prefix IRI"
+_BASE_IRI = "base IRI"
+_DIRECTIVE_END = "'.' after directive"
+_PREDICATE = "predicate"
+_OBJECT = "object"
+_AFTER_OBJECT = "',', ';' or '.'"
+_AFTER_SEMICOLON = "predicate or '.'"
+_BNODE_START = "predicate or ']'"
+_AFTER_SUBJECT_BNODE = "predicate or '.'"
+_LITERAL_SUFFIX = "literal suffix"
+_DATATYPE = "datatype IRI"
+_COLLECTION = "collection item or ')'"
+
+# Position of a term in the statement, passed to the parse events below.
+SUBJECT = "subject"
+OBJECT = "object"
+ITEM = "item"
+
+
+def _role(next_state: str) -> str:
+    """Where a term goes, judged from the state the parser resumes in after it."""
+    if next_state == _COLLECTION:
+        return ITEM
+    if next_state == _AFTER_OBJECT:
+        return OBJECT
+    return SUBJECT
+
+
+def _bad_character(char: str) -> str:
+    if char in "\"'":
+        return "unterminated string literal"
+    if char == "<":
+        return "unterminated or malformed IRI"
+    return f"unexpected character {char!r}"
+
+
+@dataclass(frozen=True)
+class TurtleValidation:
+    valid: bool
+    triples: int
+    error: str | None = None
+    error_offset: int | None = None
+    error_line: int | None = None
+    error_column: int | None = None
+    undeclared_prefixes: tuple[str, ...] = ()
+
+    @property
+    def note(self) -> str:
+        """One-line summary for logs; empty when valid."""
+        parts = []
+        if self.error is not None:
+            parts.append(f"line {self.error_line}, column {self.error_column}: {self.error}")
+        if self.undeclared_prefixes:
+            parts.append("undeclared prefixes: " + ", ".join(self.undeclared_prefixes))
+        if not parts and not self.valid:
+            parts.append("no triples found")
+        return "; ".join(parts)
+
+    def to_dict(self) -> dict:
+        return {
+            "valid": self.valid,
+            "triples": self.triples,
+            "error": self.error,
+            "error_offset": self.error_offset,
+            "error_line": self.error_line,
+            "error_column": self.error_column,
+            "undeclared_prefixes": list(self.undeclared_prefixes),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "TurtleValidation":
+        return cls(**{**data, "undeclared_prefixes": tuple(data.get("undeclared_prefixes") or ())})
+
+
+class _TurtleSyntaxError(Exception):
+    def __init__(self, message: str, offset: int) -> None:
+        super().__init__(message)
+        self.offset = offset
+
+
+class TurtleValidator:
+    """Incremental validator; feed() chunks in order, then close() once."""
+
+    def __init__(self) -> None:
+        self._buffer = ""
+        self._buffer_offset = 0  # absolute offset of _buffer[0]
+        self._line = 1  # line number at _buffer[0]
+        self._line_start = 0  # absolute offset where that line starts
+        self._state = _STATEMENT
+        self._stack: list[tuple[str, str]] = []  # (frame kind, state to resume after closing)
+        self._literal_next = _AFTER_OBJECT
+        self._pending_literal = ""
+        self._pending_prefix = ""
+        self._directive_at = False
+        self._prefixes: set[str] = set()
+        self._undeclared: list[str] = []
+        self._triples = 0
+        self._error: _TurtleSyntaxError | None = None
+        self._error_position: tuple[int, int] | None = None
+        self._result: TurtleValidation | None = None
+
+    @property
+    def failed(self) -> bool:
+        """True as soon as a syntax error has been seen (useful to abort a generation early)."""
+        return self._error is not None
+
+    def feed(self, text: str) -> None:
+        if self._error is not None or self._result is not None or not text:
+            return
+        self._buffer += text
+        self._scan(final=False)
+
+    def close(self) -> TurtleValidation:
+        if self._result is None:
+            if self._error is None:
+                self._scan(final=True)
+            if self._error is None and (self._state != _STATEMENT or self._stack):
+                self._fail(_TurtleSyntaxError(f"unexpected end of input, expected {self._expected()}", self._end_offset()))
+            self._result = self._build_result()
+        return self._result
+
+    def _scan(self, final: bool) -> None:
+        buffer = self._buffer
+        # Only tokens followed by whitespace are certain to be complete: "-3e" may become
+        # "-3e4" and "ex:a." may become "ex:a.b" once the next chunk arrives.
+        limit = len(buffer) if final else max(buffer.rfind(char) for char in " \t\r\n") + 1
+        position = 0
+        while position < limit:
+            match = _TOKEN.match(buffer, position)
+            offset = self._buffer_offset + position
+            if match is None:
+                if not final and buffer[position] in "\"'":
+                    break  # a string that may be closed by a later chunk
+                self._fail(_TurtleSyntaxError(_bad_character(buffer[position]), offset), buffer)
+                return
+            if match.end() > limit or (match.lastgroup == "comment" and match.end() == len(buffer) and not final):
+                break
+            kind = match.lastgroup
+            if kind not in _SKIPPED:
+                try:
+                    self._token(kind, match.group(), offset)
+                except _TurtleSyntaxError as exc:
+                    self._fail(exc, buffer)
+                    return
+                self._on_token(kind, match.group())
+            position = match.end()
+        self._consume(position)
+
+    def _consume(self, position: int) -> None:
+        consumed = self._buffer[:position]
+        newlines = consumed.count("\n")
+        if newlines:
+            self._line += newlines
+            self._line_start = self._buffer_offset + consumed.rfind("\n") + 1
+        self._buffer_offset += position
+        self._buffer = self._buffer[position:]
+
+    def _fail(self, error: _TurtleSyntaxError, buffer: str | None = None) -> None:
+        buffer = self._buffer if buffer is None else buffer
+        local = max(0, error.offset - self._buffer_offset)
+        before = buffer[:local]
+        newlines = before.count("\n")
+        line = self._line + newlines
+        line_start = self._buffer_offset + before.rfind("\n") + 1 if newlines else self._line_start
+        self._error = error
+        self._error_position = (line, error.offset - line_start + 1)
+        self._buffer = ""
+
+    @property
+    def _between_statements(self) -> bool:
+        return self._state == _STATEMENT and not self._stack
+
+    def _end_offset(self) -> int:
+        return self._buffer_offset + len(self._buffer)
+
+    def _expected(self) -> str:
+        if self._stack and self._state == _AFTER_OBJECT:
+            return "',', ';' or ']'" if self._stack[-1][0] == "[" else self._state
+        return self._state
+
+    def _build_result(self) -> TurtleValidation:
+        error = self._error
+        line, column = self._error_position or (None, None)
+        return TurtleValidation(
+            valid=error is None and not self._undeclared and self._triples > 0,
+            triples=self._triples,
+            error=str(error) if error is not None else None,
+            error_offset=error.offset if error is not None else None,
+            error_line=line,
+            error_column=column,
+            undeclared_prefixes=tuple(self._undeclared),
+        )
+
+    # Grammar ---------------------------------------------------------------------------
+
+    def _token(self, kind: str, value: str, offset: int) -> None:
+        state = self._state
+        if state == _STATEMENT:
+            self._statement(kind, value, offset)
+        elif state == _PREFIX_NAME:
+            if kind != "pname" or not value.endswith(":") or value.count(":") != 1:
+                self._unexpected(value, offset)
+            self._pending_prefix = value[:-1]
+            self._prefixes.add(self._pending_prefix)
+            self._state = _PREFIX_IRI
+        elif state in (_PREFIX_IRI, _BASE_IRI):
+            if kind != "iri":
+                self._unexpected(value, offset)
+            if state == _PREFIX_IRI:
+                self._on_prefix(self._pending_prefix, value)
+            else:
+                self._on_base(value)
+            self._state = _DIRECTIVE_END if self._directive_at else _STATEMENT
+        elif state == _DIRECTIVE_END:
+            if value != ".":
+                self._unexpected(value, offset)
+            self._state = _STATEMENT
+        elif state in (_PREDICATE, _AFTER_SUBJECT_BNODE, _BNODE_START, _AFTER_SEMICOLON):
+            self._predicate_position(kind, value, offset)
+        elif state == _OBJECT:
+            self._object(kind, value, offset, _AFTER_OBJECT)
+            self._triples += 1
+        elif state == _LITERAL_SUFFIX:
+            if kind == "langtag":
+                self._on_literal(_role(self._literal_next), self._pending_literal, language=value[1:])
+                self._state = self._literal_next
+            elif value == "^^":
+                self._state = _DATATYPE
+            else:
+                self._on_literal(_role(self._literal_next), self._pending_literal)
+                self._state = self._literal_next
+                self._token(kind, value, offset)
+        elif state == _DATATYPE:
+            if kind not in ("iri", "pname"):
+                self._unexpected(value, offset)
+            self._check_prefix(kind, value)
+            self._on_literal(_role(self._literal_next), self._pending_literal, datatype=(kind, value))
+            self._state = self._literal_next
+        elif state == _AFTER_OBJECT:
+            self._after_object(value, offset)
+        elif state == _COLLECTION:
+            if value == ")":
+                self._close_frame("(", value, offset)
+            else:
+                self._object(kind, value, offset, _COLLECTION)
+
+    def _statement(self, kind: str, value: str, offset: int) -> None:
+        keyword = value.upper() if kind == "word" else None
+        if kind == "directive" or keyword in ("PREFIX", "BASE"):
+            self._directive_at = kind == "directive"
+            self._state = _PREFIX_NAME if value.lower().endswith("prefix") else _BASE_IRI
+        elif kind in ("iri", "pname", "bnode"):
+            self._check_prefix(kind, value)
+            self._on_term(SUBJECT, kind, value)
+            self._state = _PREDICATE
+        elif value == "[":
+            self._open_frame("[", _AFTER_SUBJECT_BNODE, SUBJECT)
+        elif value == "(":
+            self._open_frame("(", _PREDICATE, SUBJECT)
+        else:
+            self._unexpected(value, offset)
+
+    def _predicate_position(self, kind: str, value: str, offset: int) -> None:
+        state = self._state
+        if kind in ("iri", "pname") or (kind == "word" and value == "a"):
+            self._check_prefix(kind, value)
+            self._on_predicate(kind, value)
+            self._state = _OBJECT
+        elif value == "]" and state in (_BNODE_START, _AFTER_SEMICOLON):
+            self._close_frame("[", value, offset)
+        elif value == "." and state in (_AFTER_SUBJECT_BNODE, _AFTER_SEMICOLON) and not self._stack:
+            self._state = _STATEMENT
+        elif value == ";" and state == _AFTER_SEMICOLON:
+            pass  # repeated ';' is allowed
+        else:
+            self._unexpected(value, offset)
+
+    def _object(self, kind: str, value: str, offset: int, next_state: str) -> None:
+        if kind in ("iri", "pname", "bnode", "number") or (kind == "word" and value in ("true", "false")):
+            self._check_prefix(kind, value)
+            self._on_term(_role(next_state), kind, value)
+            self._state = next_state
+        elif kind == "string":
+            self._pending_literal = value
+            self._literal_next = next_state
+            self._state = _LITERAL_SUFFIX
+        elif value == "[":
+            self._open_frame("[", next_state, _role(next_state))
+        elif value == "(":
+            self._open_frame("(", next_state, _role(next_state))
+        else:
+            self._unexpected(value, offset)
+
+    def _after_object(self, value: str, offset: int) -> None:
+        if value == ",":
+            self._state = _OBJECT
+        elif value == ";":
+            self._state = _AFTER_SEMICOLON
+        elif value == "." and not self._stack:
+            self._state = _STATEMENT
+        elif value == "]":
+            self._close_frame("[", value, offset)
+        else:
+            self._unexpected(value, offset)
+
+    def _open_frame(self, kind: str, resume_state: str, role: str) -> None:
+        self._stack.append((kind, resume_state))
+        self._on_open(kind, role)
+        self._state = _BNODE_START if kind == "[" else _COLLECTION
+
+    def _close_frame(self, kind: str, value: str, offset: int) -> None:
+        if not self._stack or self._stack[-1][0] != kind:
+            self._unexpected(value, offset)
+        _, self._state = self._stack.pop()
+        self._on_close(kind)
+
+    # Parse events; no-ops here, overridden by parsers that build a graph (see domain.triples)
+    # or regroup the accepted tokens (see domain.turtle_merge).
+
+    def _on_token(self, kind: str, value: str) -> None:
+        pass
+
+    def _on_prefix(self, name: str, iri: str) -> None:
+        pass
+
+    def _on_base(self, iri: str) -> None:
+        pass
+
+    def _on_term(self, role: str, kind: str, value: str) -> None:
+        pass
+
+    def _on_predicate(self, kind: str, value: str) -> None:
+        pass
+
+    def _on_literal(
+        self, role: str, string: str, language: str | None = None, datatype: tuple[str, str] | None = None
+    ) -> None:
+        pass
+
+    def _on_open(self, kind: str, role: str) -> None:
+        pass
+
+    def _on_close(self, kind: str) -> None:
+        pass
+
+    def _check_prefix(self, kind: str, value: str) -> None:
+        if kind != "pname":
+            return
+        prefix = value.split(":", 1)[0]
+        if prefix not in self._prefixes and prefix not in self._undeclared:
+            self._undeclared.append(prefix)
+
+    def _unexpected(self, value: str, offset: int) -> None:
+        raise _TurtleSyntaxError(f"unexpected {value!r}, expected {self._expected()}", offset)
+
+
+def validate_turtle(text: str | None) -> TurtleValidation:
+    validator = TurtleValidator()
+    if isinstance(text, str):
+        validator.feed(text)
+    return validator.close()
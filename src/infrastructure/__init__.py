@@ -1,9 +1,71 @@
-from .ollama_client import OllamaClient, OllamaClientConfig, OllamaOptions
+from .async_ollama_client import AsyncOllamaClient
+from .generation_cache import (
+    GenerationCache,
+    GenerationCacheConfig,
+    InMemoryGenerationCache,
+    SqliteGenerationCache,
+    TieredGenerationCache,
+    build_generation_cache,
+    generation_cache_key,
+)
+from .job_store import JobStoreConfig, SqliteJobStore, build_job_store
+from .metrics import Counter, Gauge, Histogram, Metrics
+from .ollama_backends import BackendPool, BackendPoolConfig, build_backend_pool
+from .ollama_client import OllamaClient, OllamaClientConfig, OllamaHttpSettings, OllamaOptions
 from .prompt_repository import PromptRepository
+from .response_log import (
+    AsyncResponseLogger,
+    CsvResponseSink,
+    ResponseLogConfig,
+    ResponseLogger,
+    ResponseSink,
+    build_log_record,
+    build_response_logger,
+)
+from .response_sinks import (
+    JsonlResponseSink,
+    ParquetResponseSink,
+    ResponseSinkConfig,
+    build_response_sink,
+)
+from .triple_store import SqliteTripleStore, TripleStoreConfig, build_triple_store
 
 __all__ = [
+    "AsyncOllamaClient",
+    "AsyncResponseLogger",
+    "BackendPool",
+    "BackendPoolConfig",
+    "Counter",
+    "CsvResponseSink",
+    "GenerationCache",
+    "GenerationCacheConfig",
+    "Gauge",
+    "Histogram",
+    "InMemoryGenerationCache",
+    "JobStoreConfig",
+    "JsonlResponseSink",
+    "Metrics",
     "OllamaClient",
     "OllamaClientConfig",
+    "OllamaHttpSettings",
     "OllamaOptions",
+    "ParquetResponseSink",
     "PromptRepository",
+    "ResponseLogConfig",
+    "ResponseLogger",
+    "ResponseSink",
+    "ResponseSinkConfig",
+    "SqliteGenerationCache",
+    "SqliteJobStore",
+    "SqliteTripleStore",
+    "TieredGenerationCache",
+    "TripleStoreConfig",
+    "build_backend_pool",
+    "build_generation_cache",
+    "build_job_store",
+    "build_log_record",
+    "build_response_logger",
+    "build_response_sink",
+    "build_triple_store",
+    "generation_cache_key",
 ]
@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import random
+import time
+from contextlib import contextmanager
+from typing import Any, AsyncIterator, Iterator
+
+try:  # Optional dependency; only needed for the ASGI serving path.
+    import httpx
+except ImportError:  # pragma: no cover - exercised when httpx is absent
+    httpx = None
+
+from ..domain.turtle_validator import TurtleValidation, TurtleValidator
+from .metrics import Metrics
+from .ollama_backends import BackendPool
+from .ollama_client import RETRY_STATUS_CODES, OllamaClientConfig, build_generate_payload
+from .response_log import CsvResponseSink, ResponseLogger, attach_validation, build_log_record
+from .timing import LOG, OLLAMA, PARSE, VALIDATE, stage
+
+
+class AsyncOllamaClient:
+    """
+    asyncio counterpart of OllamaClient built on a shared httpx.AsyncClient pool.
+    Applies the same timeouts and retry policy (connection errors and 502/503/504
+    with exponential backoff, never a read timeout) as the synchronous client.
+    """
+
+    def __init__(
+        self,
+        config: OllamaClientConfig,
+        client: "httpx.AsyncClient | None" = None,
+        response_logger: ResponseLogger | None = None,
+        metrics: Metrics | None = None,
+        backend_pool: BackendPool | None = None,
+    ):
+        if httpx is None:
+            raise RuntimeError("The async Ollama client requires httpx (pip install httpx).")
+        self.config = config
+        settings = config.http
+        self.client = client or httpx.AsyncClient(
+            timeout=httpx.Timeout(settings.read_timeout, connect=settings.connect_timeout),
+            limits=httpx.Limits(
+                max_connections=settings.pool_size, max_keepalive_connections=settings.pool_size
+            ),
+        )
+        self.response_logger = response_logger or ResponseLogger(CsvResponseSink(config.csv_path))
+        self.metrics = metrics or Metrics()
+        self.backend_pool = backend_pool
+
+    async def aclose(self) -> None:
+        await self.client.aclose()
+
+    def build_payload(self, system_prompt: str, prompt: str, stream: bool = False) -> dict[str, Any]:
+        return build_generate_payload(self.config, system_prompt, prompt, stream=stream)
+
+    async def generate(
+        self,
+        system_prompt: str,
+        prompt: str,
+        prompt_name: str | None = None,
+        input_text: str | None = None,
+    ) -> dict[str, Any]:
+        payload = self.build_payload(system_prompt, prompt)
+        with self.metrics.ollama_request_seconds.time(mode="async"), self._backend_url() as url:
+            with stage(OLLAMA):
+                response = await self._post_with_retries(f"{url}/api/generate", payload)
+                response.raise_for_status()
+            with stage(PARSE):
+                try:
+                    data = response.json()
+                except ValueError as exc:
+                    raise RuntimeError("Invalid JSON response from generation API") from exc
+        # Turtle validation parses the whole output and submit() may block on a full log queue
+        # (or write the CSV inline), so both run on a worker thread instead of the event loop.
+        await asyncio.to_thread(self._record, data, prompt_name, input_text)
+        return data
+
+    async def generate_stream(
+        self,
+        system_prompt: str,
+        prompt: str,
+        prompt_name: str | None = None,
+        input_text: str | None = None,
+    ) -> AsyncIterator[dict[str, Any]]:
+        """
+        Async counterpart of OllamaClient.generate_stream: yield Ollama's NDJSON chunks as
+        they arrive; the final chunk carries the full response and is logged once.
+        """
+        payload = self.build_payload(system_prompt, prompt, stream=True)
+        validator = TurtleValidator()
+        started = time.perf_counter()
+        # The backend stays reserved until the stream is fully consumed or closed.
+        with self._backend_url() as url:
+            response = await self._post_with_retries(f"{url}/api/generate", payload, stream=True)
+            try:
+                response.raise_for_status()
+                pieces: list[str] = []
+                async for line in response.aiter_lines():
+                    if not line:
+                        continue
+                    try:
+                        chunk = json.loads(line)
+                    except ValueError as exc:
+                        raise RuntimeError("Invalid JSON chunk from generation API") from exc
+                    if "error" in chunk:
+                        raise RuntimeError(f"Generation API error: {chunk['error']}")
+                    pieces.append(chunk.get("response") or "")
+                    validator.feed(chunk.get("response") or "")
+                    if chunk.get("done"):
+                        final = {**chunk, "response": "".join(pieces)}
+                        self.metrics.ollama_request_seconds.observe(time.perf_counter() - started, mode="stream")
+                        await asyncio.to_thread(self._record, final, prompt_name, input_text, validator.close())
+                        yield final
+                        return
+                    yield chunk
+                raise RuntimeError("Generation stream ended without a final chunk")
+            finally:
+                await response.aclose()
+
+    def _record(
+        self,
+        data: dict[str, Any],
+        prompt_name: str | None,
+        input_text: str | None,
+        validation: TurtleValidation | None = None,
+    ) -> None:
+        with stage(VALIDATE):
+            attach_validation(data, validation)
+        self.metrics.observe_generation(data)
+        with self.metrics.log_seconds.time(), stage(LOG):
+            self.response_logger.submit(build_log_record(data, prompt_name=prompt_name, input_text=input_text))
+
+    @contextmanager
+    def _backend_url(self) -> Iterator[str]:
+        if self.backend_pool is None:
+            yield self.config.url
+            return
+        with self.backend_pool.acquire() as backend:
+            yield backend.url
+
+    async def _post_with_retries(self, url: str, payload: dict[str, Any], stream: bool = False) -> "httpx.Response":
+        """Retries happen before the body is read; with stream=True the caller must aclose() the response."""
+        settings = self.config.http
+        attempt = 0
+        while True:
+            try:
+                response = await self.client.send(self.client.build_request("POST", url, json=payload), stream=stream)
+            except (httpx.ConnectError, httpx.ConnectTimeout):
+                # Only errors before the request reached the host; a read timeout is never re-sent.
+                if attempt >= settings.max_retries:
+                    raise
+            else:
+                if response.status_code not in RETRY_STATUS_CODES or attempt >= settings.max_retries:
+                    return response
+                await response.aclose()
+            # Same schedule as urllib3's Retry: backoff * 2^(attempt), with a little jitter.
+            await asyncio.sleep(settings.retry_backoff * (2**attempt) * (1 + random.random() * 0.1))
+            attempt += 1
@@ -0,0 +1,36 @@
+import os
+from pathlib import Path
+
+
+def int_from_env(name: str, default: int | None = None) -> int | None:
+    value = os.getenv(name)
+    if value in (None, ""):
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        return default
+
+
+def float_from_env(name: str, default: float | None = None) -> float | None:
+    value = os.getenv(name)
+    if value in (None, ""):
+        return default
+    try:
+        return float(value)
+    except ValueError:
+        return default
+
+
+def bool_from_env(name: str, default: bool = False) -> bool:
+    value = os.getenv(name)
+    if value in (None, ""):
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def path_from_env(name: str) -> Path | None:
+    value = os.getenv(name)
+    if value in (None, ""):
+        return None
+    return Path(value)
@@ -0,0 +1,204 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from .env import float_from_env, int_from_env, path_from_env
+
+
+def generation_cache_key(payload: dict[str, Any]) -> str:
+    """Content address of a generate payload (model, system, prompt, options)."""
+    encoded = json.dumps(payload, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+@dataclass(frozen=True)
+class GenerationCacheConfig:
+    max_entries: int = 0
+    ttl_seconds: float | None = None
+    sqlite_path: Path | None = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0 or self.sqlite_path is not None
+
+    @classmethod
+    def from_env(cls) -> "GenerationCacheConfig":
+        ttl = float_from_env("GENERATION_CACHE_TTL")
+        return cls(
+            max_entries=int_from_env("GENERATION_CACHE_SIZE", 0),
+            ttl_seconds=ttl if ttl and ttl > 0 else None,
+            sqlite_path=path_from_env("GENERATION_CACHE_PATH"),
+        )
+
+
+class GenerationCache(ABC):
+    """
+    Base class for generation caches keyed on generation_cache_key().
+    Subclasses implement _lookup/_store; hit/miss counting lives here.
+    """
+
+    def __init__(self) -> None:
+        self._stats_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        value = self._lookup(key)
+        with self._stats_lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+
+    def set(self, key: str, value: dict[str, Any]) -> None:
+        self._store(key, value)
+
+    def stats(self) -> dict[str, Any]:
+        with self._stats_lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": (self.hits / total) if total else 0.0,
+            }
+
+    def close(self) -> None:
+        return None
+
+    @abstractmethod
+    def _lookup(self, key: str) -> dict[str, Any] | None:
+        """Cached value for key, or None when absent or expired."""
+
+    @abstractmethod
+    def _store(self, key: str, value: dict[str, Any]) -> None:
+        """Cache value under key."""
+
+
+class InMemoryGenerationCache(GenerationCache):
+    """Thread-safe LRU with optional TTL."""
+
+    def __init__(self, max_entries: int, ttl_seconds: float | None = None) -> None:
+        super().__init__()
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[str, tuple[float, dict[str, Any]]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _lookup(self, key: str) -> dict[str, Any] | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            stored_at, value = entry
+            if self.ttl_seconds is not None and time.monotonic() - stored_at > self.ttl_seconds:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def _store(self, key: str, value: dict[str, Any]) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+class SqliteGenerationCache(GenerationCache):
+    """On-disk tier that survives restarts. TTL is checked against wall-clock time."""
+
+    def __init__(self, path: Path, ttl_seconds: float | None = None) -> None:
+        super().__init__()
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS generations ("
+            "key TEXT PRIMARY KEY, created_at REAL NOT NULL, value TEXT NOT NULL)"
+        )
+        self._conn.commit()
+
+    def _lookup(self, key: str) -> dict[str, Any] | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT created_at, value FROM generations WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            created_at, value = row
+            if self.ttl_seconds is not None and time.time() - created_at > self.ttl_seconds:
+                self._conn.execute("DELETE FROM generations WHERE key = ?", (key,))
+                self._conn.commit()
+                return None
+        return json.loads(value)
+
+    def _store(self, key: str, value: dict[str, Any]) -> None:
+        encoded = json.dumps(value, ensure_ascii=False)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO generations (key, created_at, value) VALUES (?, ?, ?)",
+                (key, time.time(), encoded),
+            )
+            self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class TieredGenerationCache(GenerationCache):
+    """Memory tier in front of a persistent tier; disk hits are promoted to memory."""
+
+    def __init__(self, memory: InMemoryGenerationCache, disk: SqliteGenerationCache) -> None:
+        super().__init__()
+        self.memory = memory
+        self.disk = disk
+
+    def _lookup(self, key: str) -> dict[str, Any] | None:
+        value = self.memory.get(key)
+        if value is not None:
+            return value
+        value = self.disk.get(key)
+        if value is not None:
+            self.memory.set(key, value)
+        return value
+
+    def _store(self, key: str, value: dict[str, Any]) -> None:
+        self.memory.set(key, value)
+        self.disk.set(key, value)
+
+    def stats(self) -> dict[str, Any]:
+        stats = super().stats()
+        stats["memory"] = self.memory.stats()
+        stats["disk"] = self.disk.stats()
+        return stats
+
+    def close(self) -> None:
+        self.disk.close()
+
+
+def build_generation_cache(config: GenerationCacheConfig) -> GenerationCache | None:
+    if not config.enabled:
+        return None
+    if config.sqlite_path is None:
+        return InMemoryGenerationCache(config.max_entries, config.ttl_seconds)
+    disk = SqliteGenerationCache(config.sqlite_path, config.ttl_seconds)
+    if config.max_entries <= 0:
+        return disk
+    return TieredGenerationCache(InMemoryGenerationCache(config.max_entries, config.ttl_seconds), disk)
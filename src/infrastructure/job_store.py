@@ -0,0 +1,253 @@
+"""
+Durable job queue in SQLite (WAL). A job is a list of items, one text each; items
+are the unit of work. Workers claim items with a lease, so an item held by a
+worker that crashed (or a process that restarted) becomes claimable again once
+its lease runs out. Several processes may share one database file.
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Sequence
+
+from .env import float_from_env, path_from_env
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+
+@dataclass(frozen=True)
+class JobStoreConfig:
+    path: Path | None = None
+    # How long a claimed item stays with its worker before another may take it over.
+    # Workers renew it every third of this while they process the item.
+    lease_seconds: float = 600.0
+
+    @property
+    def enabled(self) -> bool:
+        return self.path is not None
+
+    @classmethod
+    def from_env(cls) -> "JobStoreConfig":
+        return cls(
+            path=path_from_env("JOBS_PATH"),
+            lease_seconds=max(1.0, float_from_env("JOBS_LEASE_SECONDS", 600.0)),
+        )
+
+
+@dataclass(frozen=True)
+class ClaimedItem:
+    job_id: str
+    index: int
+    priority: int
+    attempts: int
+    request: dict[str, Any]
+
+
+class SqliteJobStore:
+    def __init__(self, path: Path, lease_seconds: float = 600.0) -> None:
+        self.path = path
+        self.lease_seconds = lease_seconds
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        # Autocommit mode; transactions are opened explicitly with BEGIN IMMEDIATE.
+        self._conn = sqlite3.connect(str(path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA busy_timeout=5000")
+        self._conn.executescript(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            "id TEXT PRIMARY KEY, priority INTEGER NOT NULL, total INTEGER NOT NULL, "
+            "created_at REAL NOT NULL, updated_at REAL NOT NULL);"
+            "CREATE TABLE IF NOT EXISTS job_items ("
+            "job_id TEXT NOT NULL, idx INTEGER NOT NULL, priority INTEGER NOT NULL, status TEXT NOT NULL, "
+            "attempts INTEGER NOT NULL DEFAULT 0, available_at REAL NOT NULL, lease_until REAL, "
+            "request TEXT NOT NULL, result TEXT, error TEXT, UNIQUE (job_id, idx));"
+            "CREATE INDEX IF NOT EXISTS job_items_claim ON job_items (status, priority, available_at);"
+        )
+
+    def submit(self, requests: Sequence[dict[str, Any]], priority: int = 1) -> str:
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        with self._transaction() as conn:
+            conn.execute(
+                "INSERT INTO jobs (id, priority, total, created_at, updated_at) VALUES (?, ?, ?, ?, ?)",
+                (job_id, priority, len(requests), now, now),
+            )
+            conn.executemany(
+                "INSERT INTO job_items (job_id, idx, priority, status, available_at, request) VALUES (?, ?, ?, ?, ?, ?)",
+                ((job_id, index, priority, QUEUED, now, json.dumps(request)) for index, request in enumerate(requests)),
+            )
+        return job_id
+
+    def claim(self, max_attempts: int | None = None) -> ClaimedItem | None:
+        """
+        Lease the next item: highest priority first, then submission order; expired leases count as queued.
+        With max_attempts, an expired item that already used them all failed without reporting back (its
+        worker crashed or hung on it), so it is marked failed instead of being handed out again.
+        """
+        now = time.time()
+        with self._transaction() as conn:
+            if max_attempts is not None:
+                self._fail_exhausted_leases(conn, now, max_attempts)
+            row = conn.execute(
+                "SELECT rowid, job_id, idx, priority, attempts, request FROM job_items "
+                "WHERE (status = ? AND available_at <= ?) OR (status = ? AND lease_until < ?) "
+                "ORDER BY priority, rowid LIMIT 1",
+                (QUEUED, now, RUNNING, now),
+            ).fetchone()
+            if row is None:
+                return None
+            rowid, job_id, index, priority, attempts, request = row
+            conn.execute(
+                "UPDATE job_items SET status = ?, attempts = attempts + 1, lease_until = ? WHERE rowid = ?",
+                (RUNNING, now + self.lease_seconds, rowid),
+            )
+        return ClaimedItem(job_id, index, priority, attempts + 1, json.loads(request))
+
+    def complete(self, item: ClaimedItem, result: dict[str, Any]) -> None:
+        self._finish(item, DONE, result=json.dumps(result))
+
+    def fail(self, item: ClaimedItem, error: dict[str, Any], retry_in: float | None = None) -> None:
+        """Record a failure; with retry_in the item is queued again after that many seconds."""
+        if retry_in is None:
+            self._finish(item, FAILED, error=json.dumps(error))
+            return
+        now = time.time()
+        with self._transaction() as conn:
+            conn.execute(
+                "UPDATE job_items SET status = ?, available_at = ?, lease_until = NULL, error = ? "
+                "WHERE job_id = ? AND idx = ? AND status = ? AND attempts = ?",
+                (QUEUED, now + retry_in, json.dumps(error), item.job_id, item.index, RUNNING, item.attempts),
+            )
+            conn.execute("UPDATE jobs SET updated_at = ? WHERE id = ?", (now, item.job_id))
+
+    def renew(self, item: ClaimedItem) -> bool:
+        """Extend the lease of an item still being worked on; False once another worker has taken it over."""
+        with self._transaction() as conn:
+            renewed = conn.execute(
+                "UPDATE job_items SET lease_until = ? WHERE job_id = ? AND idx = ? AND status = ? AND attempts = ?",
+                (time.time() + self.lease_seconds, item.job_id, item.index, RUNNING, item.attempts),
+            ).rowcount
+        return renewed == 1
+
+    @staticmethod
+    def _fail_exhausted_leases(conn: sqlite3.Connection, now: float, max_attempts: int) -> None:
+        exhausted = "status = ? AND lease_until < ? AND attempts >= ?"
+        conn.execute(
+            f"UPDATE jobs SET updated_at = ? WHERE id IN (SELECT job_id FROM job_items WHERE {exhausted})",
+            (now, RUNNING, now, max_attempts),
+        )
+        error = {"error": f"Lease expired on each of {max_attempts} attempts.", "exception": "LeaseExpired"}
+        conn.execute(
+            f"UPDATE job_items SET status = ?, lease_until = NULL, error = ? WHERE {exhausted}",
+            (FAILED, json.dumps(error), RUNNING, now, max_attempts),
+        )
+
+    def get(self, job_id: str, offset: int = 0, limit: int | None = None) -> dict[str, Any] | None:
+        with self._lock:
+            job = self._conn.execute(
+                "SELECT priority, total, created_at, updated_at FROM jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+            if job is None:
+                return None
+            counts = dict(
+                self._conn.execute(
+                    "SELECT status, COUNT(*) FROM job_items WHERE job_id = ? GROUP BY status", (job_id,)
+                ).fetchall()
+            )
+            rows = self._conn.execute(
+                "SELECT idx, status, attempts, result, error FROM job_items WHERE job_id = ? "
+                "ORDER BY idx LIMIT ? OFFSET ?",
+                (job_id, -1 if limit is None else limit, offset),
+            ).fetchall()
+        priority, total, created_at, updated_at = job
+        return {
+            "id": job_id,
+            "status": _job_status(counts, total),
+            "priority": priority,
+            "total": total,
+            "counts": {status: counts.get(status, 0) for status in (QUEUED, RUNNING, DONE, FAILED)},
+            "created_at": created_at,
+            "updated_at": updated_at,
+            "items": [
+                {
+                    "index": index,
+                    "status": status,
+                    "attempts": attempts,
+                    "result": json.loads(result) if result else None,
+                    "error": json.loads(error) if error else None,
+                }
+                for index, status, attempts, result, error in rows
+            ],
+        }
+
+    def queued(self) -> int:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM job_items WHERE status IN (?, ?)", (QUEUED, RUNNING)
+            ).fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _finish(self, item: ClaimedItem, status: str, result: str | None = None, error: str | None = None) -> None:
+        now = time.time()
+        with self._transaction() as conn:
+            # Guarded on RUNNING: a worker whose lease expired must not overwrite the new holder's outcome.
+            conn.execute(
+                "UPDATE job_items SET status = ?, result = ?, error = ?, lease_until = NULL "
+                "WHERE job_id = ? AND idx = ? AND status = ? AND attempts = ?",
+                (status, result, error, item.job_id, item.index, RUNNING, item.attempts),
+            )
+            conn.execute("UPDATE jobs SET updated_at = ? WHERE id = ?", (now, item.job_id))
+
+    def _transaction(self):
+        return _Transaction(self._conn, self._lock)
+
+
+class _Transaction:
+    """BEGIN IMMEDIATE under the in-process lock, so claims never race across threads or processes."""
+
+    def __init__(self, conn: sqlite3.Connection, lock: threading.Lock) -> None:
+        self._conn = conn
+        self._lock = lock
+
+    def __enter__(self) -> sqlite3.Connection:
+        self._lock.acquire()
+        try:
+            self._conn.execute("BEGIN IMMEDIATE")
+        except BaseException:
+            self._lock.release()
+            raise
+        return self._conn
+
+    def __exit__(self, exc_type, exc, traceback) -> None:
+        try:
+            self._conn.execute("ROLLBACK" if exc_type is not None else "COMMIT")
+        finally:
+            self._lock.release()
+
+
+def _job_status(counts: dict[str, int], total: int) -> str:
+    finished = counts.get(DONE, 0) + counts.get(FAILED, 0)
+    if finished == total:
+        return FAILED if counts.get(DONE, 0) == 0 and total else DONE
+    if finished or counts.get(RUNNING, 0):
+        return RUNNING
+    return QUEUED
+
+
+def build_job_store(config: JobStoreConfig) -> SqliteJobStore | None:
+    if not config.enabled:
+        return None
+    return SqliteJobStore(config.path, lease_seconds=config.lease_seconds)
@@ -0,0 +1,234 @@
+from __future__ import annotations
+
+import bisect
+import math
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+TOKEN_RATE_BUCKETS = (1, 5, 10, 20, 40, 80, 160, 320, 640, 1280, 2560, 5120)
+
+LabelKey = tuple[tuple[str, str], ...]
+
+
+def _label_key(labels: dict[str, str]) -> LabelKey:
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(key: LabelKey, extra: tuple[tuple[str, str], ...] = ()) -> str:
+    pairs = key + extra
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric(ABC):
+    kind = ""
+
+    def __init__(self, name: str, help_text: str) -> None:
+        self.name = name
+        self.help_text = help_text
+        self._lock = threading.Lock()
+
+    def render(self, const: LabelKey = ()) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self._samples(const))
+        return lines
+
+    @abstractmethod
+    def _samples(self, const: LabelKey = ()) -> list[str]:
+        """Exposition lines for every label set, prefixed with the const labels, without HELP/TYPE."""
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str) -> None:
+        super().__init__(name, help_text)
+        self._values: dict[LabelKey, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(_label_key(labels), 0.0)
+
+    def _samples(self, const: LabelKey = ()) -> list[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(const + key)} {_format_value(value)}" for key, value in items]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, amount: float = 1.0, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels: str) -> None:
+        with self._lock:
+            self._values[_label_key(labels)] = value
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, buckets: tuple[float, ...] = LATENCY_BUCKETS) -> None:
+        super().__init__(name, help_text)
+        self.buckets = tuple(sorted(buckets))
+        self._series: dict[LabelKey, list[float]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = _label_key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            # Layout: one slot per bucket, then +Inf, then sum.
+            series = self._series.setdefault(key, [0.0] * (len(self.buckets) + 2))
+            series[index] += 1
+            series[-1] += value
+
+    def count(self, **labels: str) -> int:
+        series = self._series.get(_label_key(labels))
+        return int(sum(series[:-1])) if series else 0
+
+    @contextmanager
+    def time(self, **labels: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def _samples(self, const: LabelKey = ()) -> list[str]:
+        with self._lock:
+            items = sorted((key, list(series)) for key, series in self._series.items())
+        lines: list[str] = []
+        for key, series in items:
+            key = const + key
+            cumulative = 0.0
+            for bound, count in zip(self.buckets + (math.inf,), series[:-1]):
+                cumulative += count
+                lines.append(f"{self.name}_bucket{_format_labels(key, (('le', _format_value(bound)),))} {_format_value(cumulative)}")
+            lines.append(f"{self.name}_sum{_format_labels(key)} {_format_value(series[-1])}")
+            lines.append(f"{self.name}_count{_format_labels(key)} {_format_value(cumulative)}")
+        return lines
+
+
+class Metrics:
+    """
+    In-process registry rendered in the Prometheus text exposition format.
+    Components receive the shared instance from create_app and record into it.
+    const_labels are added to every sample, e.g. pid to tell pre-forked workers apart.
+    """
+
+    def __init__(self, const_labels: dict[str, str] | None = None) -> None:
+        self.const_labels = _label_key(const_labels or {})
+        self._metrics: list[_Metric] = []
+        self._collectors: list[Callable[[], list[_Metric]]] = []
+
+        self.request_seconds = self.histogram("kg_http_request_duration_seconds", "End-to-end request latency by endpoint.")
+        self.in_flight = self.gauge("kg_http_requests_in_flight", "Requests currently being handled by endpoint.")
+        self.errors = self.counter("kg_http_errors_total", "Errors handled by the analyze controller by exception class.")
+        self.prompt_load_seconds = self.histogram("kg_prompt_load_duration_seconds", "Time spent loading and rendering prompts.")
+        self.ollama_request_seconds = self.histogram("kg_ollama_request_duration_seconds", "Ollama HTTP round-trip time.")
+        self.log_seconds = self.histogram("kg_response_log_duration_seconds", "Time spent handing a generation to the response log.")
+        self.ollama_load_seconds = self.histogram("kg_ollama_load_duration_seconds", "Model load time reported by Ollama.")
+        self.prompt_eval_rate = self.histogram(
+            "kg_ollama_prompt_eval_tokens_per_second", "Prompt evaluation throughput reported by Ollama.", TOKEN_RATE_BUCKETS
+        )
+        self.eval_rate = self.histogram(
+            "kg_ollama_eval_tokens_per_second", "Generation throughput reported by Ollama.", TOKEN_RATE_BUCKETS
+        )
+        self.prompt_eval_seconds = self.histogram(
+            "kg_ollama_prompt_eval_duration_seconds", "Prompt evaluation time reported by Ollama by phase (warmup or request)."
+        )
+        self.prompt_tokens = self.counter("kg_ollama_prompt_eval_tokens_total", "Prompt tokens evaluated by Ollama.")
+        self.generated_tokens = self.counter("kg_ollama_eval_tokens_total", "Tokens generated by Ollama.")
+        self.backend_up = self.gauge("kg_ollama_backend_up", "1 when an Ollama backend is in rotation, 0 while ejected.")
+        self.backend_outstanding = self.gauge("kg_ollama_backend_outstanding", "Requests in flight per Ollama backend.")
+        self.admission_in_flight = self.gauge("kg_admission_in_flight", "Generations holding an admission slot.")
+        self.admission_queue_depth = self.gauge("kg_admission_queue_depth", "Requests waiting for an admission slot.")
+        self.admission_wait_seconds = self.histogram("kg_admission_wait_seconds", "Time spent queued for an admission slot.")
+        self.admission_rejected = self.counter("kg_admission_rejected_total", "Requests rejected by admission control by reason.")
+        self.single_flight = self.counter(
+            "kg_single_flight_total", "Generations by single-flight role: leader (called the model) or coalesced (shared its result)."
+        )
+        self.triples_stored = self.counter("kg_triple_store_triples_total", "Triples offered to the triple store by outcome.")
+        self.graphs_skipped = self.counter("kg_triple_store_skipped_total", "Generations not stored because their Turtle was invalid.")
+        self.job_items = self.counter("kg_job_items_total", "Job items finished by queue workers by outcome (done, retried, failed).")
+        self.job_item_seconds = self.histogram("kg_job_item_duration_seconds", "Time a queue worker spent on one job item.")
+
+    def counter(self, name: str, help_text: str) -> Counter:
+        return self._register(Counter(name, help_text))
+
+    def gauge(self, name: str, help_text: str) -> Gauge:
+        return self._register(Gauge(name, help_text))
+
+    def histogram(self, name: str, help_text: str, buckets: tuple[float, ...] = LATENCY_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, help_text, buckets))
+
+    def add_collector(self, collector: Callable[[], list[_Metric]]) -> None:
+        """Register a callback producing metrics at scrape time (e.g. cache counters)."""
+        self._collectors.append(collector)
+
+    @contextmanager
+    def track_request(self, endpoint: str) -> Iterator[None]:
+        self.in_flight.inc(endpoint=endpoint)
+        try:
+            with self.request_seconds.time(endpoint=endpoint):
+                yield
+        finally:
+            self.in_flight.dec(endpoint=endpoint)
+
+    def observe_generation(self, data: dict[str, Any], phase: str = "request") -> None:
+        """Record the timing fields Ollama returns with a finished generation (durations are ns)."""
+        load_duration = data.get("load_duration")
+        if isinstance(load_duration, (int, float)):
+            self.ollama_load_seconds.observe(load_duration / 1e9)
+        prompt_eval_duration = data.get("prompt_eval_duration")
+        if isinstance(prompt_eval_duration, (int, float)):
+            # Comparing the phases shows how much of the prompt the server's prefix cache saves.
+            self.prompt_eval_seconds.observe(prompt_eval_duration / 1e9, phase=phase)
+        if phase != "request":
+            return
+        for count_field, duration_field, rate, total in (
+            ("prompt_eval_count", "prompt_eval_duration", self.prompt_eval_rate, self.prompt_tokens),
+            ("eval_count", "eval_duration", self.eval_rate, self.generated_tokens),
+        ):
+            count = data.get(count_field)
+            duration = data.get(duration_field)
+            if not isinstance(count, (int, float)):
+                continue
+            total.inc(count)
+            if isinstance(duration, (int, float)) and duration > 0:
+                rate.observe(count / (duration / 1e9))
+
+    def render(self) -> str:
+        metrics = list(self._metrics)
+        for collector in self._collectors:
+            metrics.extend(collector())
+        lines: list[str] = []
+        for metric in metrics:
+            lines.extend(metric.render(self.const_labels))
+        return "\n".join(lines) + "\n"
+
+    def _register(self, metric):
+        self._metrics.append(metric)
+        return metric
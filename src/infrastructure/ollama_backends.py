@@ -0,0 +1,213 @@
+"""
+Client-side load balancing across several Ollama hosts.
+
+Each request is routed to the healthy backend with the fewest outstanding
+requests (or the lowest expected latency), preferring hosts that already have
+the model loaded. Hosts that fail a request or a health probe are ejected for
+a while; if every host is ejected the one due back soonest is still used.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Iterator
+
+import requests
+
+try:  # Optional: lets the pool classify failures raised by the async client too.
+    import httpx
+except ImportError:  # pragma: no cover - exercised when httpx is absent
+    httpx = None
+
+from .env import bool_from_env, float_from_env
+from .metrics import Metrics
+
+LEAST_OUTSTANDING = "least_outstanding"
+LATENCY = "latency"
+STRATEGIES = (LEAST_OUTSTANDING, LATENCY)
+
+
+@dataclass(frozen=True)
+class BackendPoolConfig:
+    urls: tuple[str, ...] = ()
+    strategy: str = LEAST_OUTSTANDING
+    health_interval: float = 10.0
+    eject_seconds: float = 30.0
+    prefer_loaded_model: bool = True
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.urls)
+
+    @classmethod
+    def from_env(cls) -> "BackendPoolConfig":
+        urls = tuple(url.strip().rstrip("/") for url in os.getenv("OLLAMA_API_URLS", "").split(",") if url.strip())
+        strategy = (os.getenv("OLLAMA_BALANCE_STRATEGY") or LEAST_OUTSTANDING).strip().lower()
+        if strategy not in STRATEGIES:
+            strategy = LEAST_OUTSTANDING
+        return cls(
+            urls=urls,
+            strategy=strategy,
+            health_interval=float_from_env("OLLAMA_HEALTH_INTERVAL", 10.0),
+            eject_seconds=float_from_env("OLLAMA_EJECT_SECONDS", 30.0),
+            prefer_loaded_model=bool_from_env("OLLAMA_PREFER_LOADED_MODEL", True),
+        )
+
+
+@dataclass
+class Backend:
+    url: str
+    outstanding: int = 0
+    # Smoothed request latency in seconds; None until the first completed request.
+    latency: float | None = None
+    ejected_until: float = 0.0
+    model_loaded: bool | None = None
+    failures: int = 0
+
+    def is_healthy(self, now: float) -> bool:
+        return self.ejected_until <= now
+
+
+def _is_backend_failure(exc: BaseException) -> bool:
+    """Unreachable hosts and 5xx answers count against a backend; 4xx and caller aborts do not."""
+    if isinstance(exc, (requests.ConnectionError, requests.Timeout)):
+        return True
+    if isinstance(exc, requests.HTTPError):
+        return exc.response is not None and exc.response.status_code >= 500
+    if httpx is not None:
+        if isinstance(exc, httpx.TransportError):
+            return True
+        if isinstance(exc, httpx.HTTPStatusError):
+            return exc.response.status_code >= 500
+    return False
+
+
+class BackendPool:
+    """Thread-safe backend selection shared by the sync and async Ollama clients."""
+
+    def __init__(self, config: BackendPoolConfig, model: str | None = None, metrics: Metrics | None = None) -> None:
+        if not config.urls:
+            raise ValueError("BackendPool needs at least one backend URL.")
+        self.config = config
+        self.model = model
+        self.metrics = metrics or Metrics()
+        self.backends = [Backend(url) for url in config.urls]
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._health_thread: threading.Thread | None = None
+        self._probe_session = requests.Session()
+        for backend in self.backends:
+            self._update_gauges(backend, time.monotonic())
+
+    @contextmanager
+    def acquire(self) -> Iterator[Backend]:
+        """Reserve a backend for one request; failures raised by the body eject it."""
+        backend = self.select()
+        started = time.monotonic()
+        try:
+            yield backend
+        except BaseException as exc:
+            if _is_backend_failure(exc):
+                self.mark_failed(backend)
+            raise
+        else:
+            self.mark_succeeded(backend, time.monotonic() - started)
+        finally:
+            with self._lock:
+                backend.outstanding -= 1
+                self._update_gauges(backend, time.monotonic())
+
+    def select(self) -> Backend:
+        now = time.monotonic()
+        with self._lock:
+            candidates = [backend for backend in self.backends if backend.is_healthy(now)]
+            if not candidates:
+                # Fail open: a backend that may have recovered beats refusing the request.
+                candidates = [min(self.backends, key=lambda backend: backend.ejected_until)]
+            backend = min(candidates, key=self._cost)
+            backend.outstanding += 1
+            self._update_gauges(backend, now)
+            return backend
+
+    def mark_failed(self, backend: Backend) -> None:
+        now = time.monotonic()
+        with self._lock:
+            backend.failures += 1
+            backend.ejected_until = now + self.config.eject_seconds
+            self._update_gauges(backend, now)
+
+    def mark_succeeded(self, backend: Backend, latency: float | None = None) -> None:
+        now = time.monotonic()
+        with self._lock:
+            backend.failures = 0
+            backend.ejected_until = 0.0
+            if latency is not None:
+                backend.latency = latency if backend.latency is None else 0.8 * backend.latency + 0.2 * latency
+                # The model answered, so it is resident on this host now.
+                backend.model_loaded = True
+            self._update_gauges(backend, now)
+
+    def probe(self, backend: Backend, timeout: float = 2.0) -> bool:
+        """GET /api/ps: reachability plus which models are currently loaded."""
+        try:
+            response = self._probe_session.get(f"{backend.url}/api/ps", timeout=timeout)
+            response.raise_for_status()
+            loaded = {
+                name
+                for model in response.json().get("models", [])
+                for name in (model.get("name"), model.get("model"))
+                if name
+            }
+        except (requests.RequestException, ValueError, AttributeError):
+            self.mark_failed(backend)
+            return False
+        # A passing probe does not cut an ejection short; the host rejoins once it expires.
+        with self._lock:
+            backend.model_loaded = self.model in loaded if self.model else None
+        return True
+
+    def probe_all(self) -> None:
+        for backend in self.backends:
+            self.probe(backend)
+
+    def start_health_checks(self) -> None:
+        if self._health_thread is not None or self.config.health_interval <= 0:
+            return
+        self._health_thread = threading.Thread(target=self._run_health_checks, name="ollama-health", daemon=True)
+        self._health_thread.start()
+
+    def close(self) -> None:
+        self._stop.set()
+        if self._health_thread is not None:
+            self._health_thread.join(timeout=self.config.health_interval)
+            self._health_thread = None
+        self._probe_session.close()
+
+    def _run_health_checks(self) -> None:
+        while not self._stop.is_set():
+            self.probe_all()
+            self._stop.wait(self.config.health_interval)
+
+    def _cost(self, backend: Backend) -> tuple:
+        # A host with the model loaded only breaks ties; it must not take all traffic once it has answered.
+        cold = self.config.prefer_loaded_model and not backend.model_loaded
+        if self.config.strategy == LATENCY:
+            # Expected wait: queued work times per-request latency; unknown latency is tried first.
+            return ((backend.outstanding + 1) * (backend.latency or 0.0), cold, backend.outstanding)
+        return (backend.outstanding, cold, backend.latency or 0.0)
+
+    def _update_gauges(self, backend: Backend, now: float) -> None:
+        self.metrics.backend_up.set(1 if backend.is_healthy(now) else 0, backend=backend.url)
+        self.metrics.backend_outstanding.set(backend.outstanding, backend=backend.url)
+
+
+def build_backend_pool(config: BackendPoolConfig, model: str | None, metrics: Metrics | None = None) -> BackendPool | None:
+    if not config.enabled:
+        return None
+    pool = BackendPool(config, model=model, metrics=metrics)
+    pool.start_health_checks()
+    return pool
@@ -1,41 +1,27 @@
 from __future__ import annotations
 
-import csv
 import json
 import os
+import time
+from contextlib import contextmanager
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterator
 
 import requests
 from requests import Response
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
+from ..domain.turtle_validator import TurtleValidation, TurtleValidator
+from .env import float_from_env, int_from_env
+from .metrics import Metrics
+from .ollama_backends import BackendPool
+from .response_log import CsvResponseSink, ResponseLogger, attach_validation, build_log_record
+from .timing import LOG, OLLAMA, PARSE, VALIDATE, stage
 
-def _int_from_env(name: str) -> int | None:
-    value = os.getenv(name)
-    if value in (None, ""):
-        return None
-    try:
-        return int(value)
-    except ValueError:
-        return None
-
-
-def _float_from_env(name: str) -> float | None:
-    value = os.getenv(name)
-    if value in (None, ""):
-        return None
-    try:
-        return float(value)
-    except ValueError:
-        return None
-
-
-def _is_likely_turtle(text: str) -> bool:
-    """Lightweight heuristic to flag RDF/Turtle-like responses."""
-    if not text or not isinstance(text, str):
-        return False
-    return "@prefix" in text and (";" in text or "." in text)
+# Transient statuses worth retrying; 503 is what Ollama returns while a model is still loading.
+RETRY_STATUS_CODES = (502, 503, 504)
 
 
 @dataclass(frozen=True)
@@ -70,12 +56,50 @@ class OllamaOptions:
         return payload
 
 
+@dataclass(frozen=True)
+class OllamaHttpSettings:
+    pool_size: int = 10
+    connect_timeout: float = 5.0
+    read_timeout: float = 300.0
+    max_retries: int = 3
+    retry_backoff: float = 0.5
+
+    @property
+    def timeout(self) -> tuple[float, float]:
+        return (self.connect_timeout, self.read_timeout)
+
+    @classmethod
+    def from_env(cls) -> "OllamaHttpSettings":
+        defaults = cls()
+        return cls(
+            pool_size=int_from_env("OLLAMA_POOL_SIZE", defaults.pool_size),
+            connect_timeout=float_from_env("OLLAMA_CONNECT_TIMEOUT", defaults.connect_timeout),
+            read_timeout=float_from_env("OLLAMA_READ_TIMEOUT", defaults.read_timeout),
+            max_retries=int_from_env("OLLAMA_MAX_RETRIES", defaults.max_retries),
+            retry_backoff=float_from_env("OLLAMA_RETRY_BACKOFF", defaults.retry_backoff),
+        )
+
+
+def keep_alive_from_env(name: str = "OLLAMA_KEEP_ALIVE") -> str | int | None:
+    """Durations ("30m") pass through; bare numbers are seconds, and -1 keeps the model loaded."""
+    value = (os.getenv(name) or "").strip()
+    if not value:
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        return value
+
+
 @dataclass(frozen=True)
 class OllamaClientConfig:
     url: str
     model: str
     csv_path: Path
     options: OllamaOptions
+    http: OllamaHttpSettings = OllamaHttpSettings()
+    # How long Ollama keeps the model (and its prompt cache) loaded after a request.
+    keep_alive: str | int | None = None
 
     @classmethod
     def from_env(cls) -> "OllamaClientConfig":
@@ -83,30 +107,98 @@ class OllamaClientConfig:
         model = os.getenv("OLLAMA_MODEL")
         csv_path = Path(os.getenv("OLLAMA_CSV_PATH"))
         options = OllamaOptions(
-            seed=_int_from_env("OLLAMA_SEED"),
-            temperature=_float_from_env("OLLAMA_TEMPERATURE"),
-            top_k=_int_from_env("OLLAMA_TOP_K"),
-            top_p=_float_from_env("OLLAMA_TOP_P"),
-            min_p=_float_from_env("OLLAMA_MIN_P"),
+            seed=int_from_env("OLLAMA_SEED"),
+            temperature=float_from_env("OLLAMA_TEMPERATURE"),
+            top_k=int_from_env("OLLAMA_TOP_K"),
+            top_p=float_from_env("OLLAMA_TOP_P"),
+            min_p=float_from_env("OLLAMA_MIN_P"),
             stop=os.getenv("OLLAMA_STOP"),
-            num_ctx=_int_from_env("OLLAMA_NUM_CTX"),
-            num_predict=_int_from_env("OLLAMA_NUM_PREDICT"),
+            num_ctx=int_from_env("OLLAMA_NUM_CTX"),
+            num_predict=int_from_env("OLLAMA_NUM_PREDICT"),
         )
         return cls(
             url=url,
             model=model,
             csv_path=csv_path,
             options=options,
+            http=OllamaHttpSettings.from_env(),
+            keep_alive=keep_alive_from_env(),
         )
 
 
+def build_generate_payload(
+    config: OllamaClientConfig, system_prompt: str, prompt: str, stream: bool = False
+) -> dict[str, Any]:
+    payload: dict[str, Any] = {
+        "model": config.model,
+        "system": system_prompt,
+        "prompt": prompt,
+        # Non-streaming calls receive a single JSON object we can log directly.
+        "stream": stream,
+    }
+    options_payload = config.options.to_payload()
+    if options_payload:
+        payload["options"] = options_payload
+    if config.keep_alive is not None:
+        payload["keep_alive"] = config.keep_alive
+    return payload
+
+
+def _build_session(settings: OllamaHttpSettings) -> requests.Session:
+    retry = Retry(
+        total=settings.max_retries,
+        connect=settings.max_retries,
+        # Never after a read error or timeout: the generation may have finished server-side,
+        # and re-sending it would cost the GPU time again and log the answer twice.
+        read=0,
+        status=settings.max_retries,
+        backoff_factor=settings.retry_backoff,
+        status_forcelist=RETRY_STATUS_CODES,
+        # POST is not retried by default; a generation that was refused or never reached the host is safe to repeat.
+        allowed_methods=frozenset({"GET", "POST"}),
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=settings.pool_size,
+        pool_maxsize=settings.pool_size,
+        max_retries=retry,
+    )
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
 class OllamaClient:
     """
-    Thin HTTP client for Ollama's /api/generate endpoint with CSV logging.
+    Thin HTTP client for Ollama's /api/generate endpoint that records each generation
+    to the response log (CSV, JSONL or Parquet, see response_sinks).
+    Keeps a pooled keep-alive session so connections are reused across requests.
+    Logging is synchronous unless a background ResponseLogger is injected.
     """
 
-    def __init__(self, config: OllamaClientConfig):
+    def __init__(
+        self,
+        config: OllamaClientConfig,
+        session: requests.Session | None = None,
+        response_logger: ResponseLogger | None = None,
+        metrics: Metrics | None = None,
+        backend_pool: BackendPool | None = None,
+    ):
         self.config = config
+        self.session = session or _build_session(config.http)
+        self.response_logger = response_logger or ResponseLogger(CsvResponseSink(config.csv_path))
+        self.metrics = metrics or Metrics()
+        self.backend_pool = backend_pool
+
+    def close(self) -> None:
+        self.session.close()
+        self.response_logger.close()
+        if self.backend_pool is not None:
+            self.backend_pool.close()
+
+    def build_payload(self, system_prompt: str, prompt: str, stream: bool = False) -> dict[str, Any]:
+        return build_generate_payload(self.config, system_prompt, prompt, stream=stream)
 
     def generate(
         self,
@@ -115,78 +207,122 @@ class OllamaClient:
         prompt_name: str | None = None,
         input_text: str | None = None,
     ) -> dict[str, Any]:
-        payload: dict[str, Any] = {
-            "model": self.config.model,
-            "system": system_prompt,
-            "prompt": prompt,
-            # Disable streaming to ensure we receive a single JSON object we can log.
-            "stream": False,
-        }
-        options_payload = self.config.options.to_payload()
-        if options_payload:
-            payload["options"] = options_payload
-
-        response = requests.post(f"{self.config.url}/api/generate", json=payload)
-        response.raise_for_status()
-        data = self._parse_response(response)
-        self._log_to_csv(data, prompt_name=prompt_name, input_text=input_text)
+        payload = self.build_payload(system_prompt, prompt)
+        with self.metrics.ollama_request_seconds.time(mode="sync"), self._backend_url() as url:
+            with stage(OLLAMA):
+                response = self.session.post(
+                    f"{url}/api/generate",
+                    json=payload,
+                    timeout=self.config.http.timeout,
+                )
+                response.raise_for_status()
+            with stage(PARSE):
+                data = self._parse_response(response)
+        self._log(data, prompt_name=prompt_name, input_text=input_text)
         return data
 
-    def _parse_response(self, response: Response) -> dict[str, Any]:
-        try:
-            return response.json()
-        except ValueError as exc:  # pragma: no cover - defensive guard
-            raise RuntimeError("Invalid JSON response from generation API") from exc
-
-    def _log_to_csv(self, data: dict[str, Any], prompt_name: str | None, input_text: str | None) -> None:
-        csv_path = self.config.csv_path
-        csv_path.parent.mkdir(parents=True, exist_ok=True)
-
-        fieldnames = [
-            "prompt_name",
-            "input_text",
-            "model",
-            "created_at",
-            "response",
-            "thinking",
-            "done",
-            "done_reason",
-            "total_duration",
-            "load_duration",
-            "prompt_eval_count",
-            "prompt_eval_duration",
-            "eval_count",
-            "eval_duration",
-            "logprobs",
-            "rdf_valid",
-            "rdf_note",
-        ]
-        write_header = not csv_path.exists()
-        response_text = data.get("response")
-        rdf_valid = _is_likely_turtle(response_text)
-        rdf_note = "" if rdf_valid else "Response not recognized as RDF/Turtle."
-        with csv_path.open("a", encoding="utf-8", newline="") as csv_file:
-            writer = csv.DictWriter(csv_file, fieldnames=fieldnames)
-            if write_header:
-                writer.writeheader()
-            writer.writerow(
+    def warm_up(self, system_prompt: str, prompt: str) -> list[dict[str, Any]]:
+        """
+        Load the model on every backend and evaluate the shared prompt prefix once, so the first
+        real requests find both the model and the prefix in Ollama's cache. Not logged as a response.
+        """
+        payload = self.build_payload(system_prompt, prompt)
+        # Same options as real requests (a different num_ctx would reload the model), one token out.
+        payload["options"] = {**payload.get("options", {}), "num_predict": 1}
+        urls = [backend.url for backend in self.backend_pool.backends] if self.backend_pool else [self.config.url]
+        results = []
+        for url in urls:
+            try:
+                response = self.session.post(f"{url}/api/generate", json=payload, timeout=self.config.http.timeout)
+                response.raise_for_status()
+                data = self._parse_response(response)
+            except (requests.RequestException, RuntimeError) as exc:
+                results.append({"url": url, "error": str(exc)})
+                continue
+            self.metrics.observe_generation(data, phase="warmup")
+            results.append(
                 {
-                    "prompt_name": prompt_name,
-                    "input_text": input_text,
-                    "model": data.get("model"),
-                    "created_at": data.get("created_at"),
-                    "response": data.get("response"),
-                    "thinking": data.get("thinking"),
-                    "done": data.get("done"),
-                    "done_reason": data.get("done_reason"),
-                    "total_duration": data.get("total_duration"),
+                    "url": url,
                     "load_duration": data.get("load_duration"),
                     "prompt_eval_count": data.get("prompt_eval_count"),
                     "prompt_eval_duration": data.get("prompt_eval_duration"),
-                    "eval_count": data.get("eval_count"),
-                    "eval_duration": data.get("eval_duration"),
-                    "logprobs": json.dumps(data.get("logprobs")),
-                    "rdf_valid": rdf_valid,
-                    "rdf_note": rdf_note,
                 }
             )
+        return results
+
+    def generate_stream(
+        self,
+        system_prompt: str,
+        prompt: str,
+        prompt_name: str | None = None,
+        input_text: str | None = None,
+    ) -> Iterator[dict[str, Any]]:
+        """
+        Yield Ollama's NDJSON chunks as they arrive. The final chunk (done=true) is
+        yielded with the full concatenated response and logged once.
+        """
+        payload = self.build_payload(system_prompt, prompt, stream=True)
+        validator = TurtleValidator()
+        started = time.perf_counter()
+        # The backend stays reserved until the stream is fully consumed or closed.
+        with self._backend_url() as url:
+            response = self.session.post(
+                f"{url}/api/generate",
+                json=payload,
+                timeout=self.config.http.timeout,
+                stream=True,
+            )
+            try:
+                response.raise_for_status()
+                pieces: list[str] = []
+                for line in response.iter_lines():
+                    if not line:
+                        continue
+                    chunk = self._parse_chunk(line)
+                    if "error" in chunk:
+                        raise RuntimeError(f"Generation API error: {chunk['error']}")
+                    pieces.append(chunk.get("response") or "")
+                    validator.feed(chunk.get("response") or "")
+                    if chunk.get("done"):
+                        final = {**chunk, "response": "".join(pieces)}
+                        self.metrics.ollama_request_seconds.observe(time.perf_counter() - started, mode="stream")
+                        self._log(final, prompt_name=prompt_name, input_text=input_text, validation=validator.close())
+                        yield final
+                        return
+                    yield chunk
+                raise RuntimeError("Generation stream ended without a final chunk")
+            finally:
+                response.close()
+
+    @contextmanager
+    def _backend_url(self) -> Iterator[str]:
+        if self.backend_pool is None:
+            yield self.config.url
+            return
+        with self.backend_pool.acquire() as backend:
+            yield backend.url
+
+    def _parse_chunk(self, line: bytes) -> dict[str, Any]:
+        try:
+            return json.loads(line)
+        except ValueError as exc:
+            raise RuntimeError("Invalid JSON chunk from generation API") from exc
+
+    def _parse_response(self, response: Response) -> dict[str, Any]:
+        try:
+            return response.json()
+        except ValueError as exc:  # pragma: no cover - defensive guard
+            raise RuntimeError("Invalid JSON response from generation API") from exc
+
+    def _log(
+        self,
+        data: dict[str, Any],
+        prompt_name: str | None,
+        input_text: str | None,
+        validation: TurtleValidation | None = None,
+    ) -> None:
+        with stage(VALIDATE):
+            attach_validation(data, validation)
+        self.metrics.observe_generation(data)
+        with self.metrics.log_seconds.time(), stage(LOG):
+            self.response_logger.submit(build_log_record(data, prompt_name=prompt_name, input_text=input_text))
@@ -0,0 +1,102 @@
+"""
+Sampled request profiling: a configurable share of requests runs under cProfile,
+and their statistics are merged and dumped to disk every N samples (and on
+close) as .prof files readable with pstats or snakeviz. One request is profiled
+at a time; a sample that would overlap another is skipped rather than queued.
+"""
+
+from __future__ import annotations
+
+import cProfile
+import os
+import pstats
+import random
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator
+
+from .env import float_from_env, int_from_env, path_from_env
+
+
+@dataclass(frozen=True)
+class ProfilerConfig:
+    # Share of requests profiled (0 disables, 1 profiles every request that does not overlap another).
+    sample_rate: float = 0.0
+    directory: Path = Path("data/profiles")
+    dump_every: int = 50
+
+    @property
+    def enabled(self) -> bool:
+        return self.sample_rate > 0
+
+    @classmethod
+    def from_env(cls) -> "ProfilerConfig":
+        defaults = cls()
+        return cls(
+            sample_rate=min(1.0, max(0.0, float_from_env("PROFILE_SAMPLE_RATE", defaults.sample_rate))),
+            directory=path_from_env("PROFILE_DIR") or defaults.directory,
+            dump_every=max(1, int_from_env("PROFILE_DUMP_EVERY", defaults.dump_every)),
+        )
+
+
+class SampledProfiler:
+    def __init__(self, config: ProfilerConfig, seed: int | None = None) -> None:
+        self.config = config
+        self.samples = 0
+        self.dumps: list[Path] = []
+        self._random = random.Random(seed)
+        # cProfile allows one active profiler per process on newer Pythons, and profiles one thread anyway.
+        self._active = threading.Lock()
+        self._lock = threading.Lock()
+        self._stats: pstats.Stats | None = None
+        self._pending = 0
+
+    @contextmanager
+    def maybe_profile(self) -> Iterator[bool]:
+        """Profile the enclosed block if this request is sampled; yields whether it was."""
+        if not self.config.enabled or self._random.random() >= self.config.sample_rate:
+            yield False
+            return
+        if not self._active.acquire(blocking=False):
+            yield False
+            return
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+            try:
+                yield True
+            finally:
+                profile.disable()
+        finally:
+            self._active.release()
+        self._add(profile)
+
+    def dump(self) -> Path | None:
+        """Write the samples merged since the last dump; None when there are none."""
+        with self._lock:
+            stats, self._stats, self._pending = self._stats, None, 0
+        if stats is None:
+            return None
+        self.config.directory.mkdir(parents=True, exist_ok=True)
+        path = self.config.directory / f"profile-{os.getpid()}-{time.strftime('%Y%m%d-%H%M%S')}-{len(self.dumps)}.prof"
+        stats.dump_stats(str(path))
+        self.dumps.append(path)
+        return path
+
+    def close(self) -> None:
+        self.dump()
+
+    def _add(self, profile: cProfile.Profile) -> None:
+        with self._lock:
+            if self._stats is None:
+                self._stats = pstats.Stats(profile)
+            else:
+                self._stats.add(profile)
+            self.samples += 1
+            self._pending += 1
+            due = self._pending >= self.config.dump_every
+        if due:
+            self.dump()
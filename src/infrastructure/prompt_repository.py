@@ -1,18 +1,134 @@
+import logging
+import threading
+from dataclasses import dataclass
 from pathlib import Path
 
+from ..domain.few_shot import FewShotExample, FewShotIndex
+from ..domain.prompt_template import PromptTemplate
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class _CachedPrompt:
+    path: Path
+    mtime_ns: int
+    size: int
+    text: str
+
+
+@dataclass(frozen=True)
+class _CachedBank:
+    path: Path
+    mtime_ns: int
+    texts: tuple[str, ...]
+    index: FewShotIndex
+
 
 class PromptRepository:
     """
     Infrastructure layer for reading prompt files.
     Prevents path traversal and provides clear errors to the application layer.
+    Loaded prompts are kept in memory; with auto_reload they are revalidated by
+    a single stat() (mtime/size), otherwise only reload() refreshes them.
     """
 
-    def __init__(self, prompt_dir: Path | None = None) -> None:
+    def __init__(self, prompt_dir: Path | None = None, auto_reload: bool = True) -> None:
         # Default to repository root / prompt directory
         base_dir = Path(__file__).resolve().parents[2]
         self.prompt_dir = prompt_dir or (base_dir / "prompt")
+        self.auto_reload = auto_reload
+        self._cache: dict[str, _CachedPrompt] = {}
+        self._templates: dict[str, PromptTemplate] = {}
+        self._example_banks: dict[str, _CachedBank] = {}
+        self._lock = threading.Lock()
 
     def load_prompt(self, prompt_name: str) -> str:
+        cached = self._cache.get(prompt_name)
+        if cached is not None and (not self.auto_reload or self._is_fresh(cached)):
+            return cached.text
+
+        entry = self._read(prompt_name)
+        with self._lock:
+            self._cache[prompt_name] = entry
+        return entry.text
+
+    def load_template(self, prompt_name: str) -> PromptTemplate:
+        """Compiled form of load_prompt(); recompiled only when the prompt text changes."""
+        text = self.load_prompt(prompt_name)
+        template = self._templates.get(prompt_name)
+        if template is None or (template.source is not text and template.source != text):
+            template = PromptTemplate.compile(text)
+            with self._lock:
+                self._templates[prompt_name] = template
+        return template
+
+    def load_examples(self, bank: str) -> FewShotIndex:
+        """
+        Index over the *.txt files of an example bank directory (one example per file).
+        With auto_reload it is revalidated by a single stat() of the directory: adding,
+        removing or renaming an example (most editors save by rename) re-reads the bank,
+        and it is re-indexed only when the text of its files changed. Use reload() after
+        editing an example file in place.
+        """
+        cached = self._example_banks.get(bank)
+        if cached is not None and (not self.auto_reload or self._bank_is_fresh(cached)):
+            return cached.index
+
+        bank_path = self._bank_path(bank)
+        # Stat before listing, so a change made while listing is seen by the next request.
+        mtime_ns = bank_path.stat().st_mtime_ns
+        names = [f"{bank.rstrip('/')}/{path.name}" for path in sorted(bank_path.glob("*.txt")) if path.is_file()]
+        texts = tuple(self.load_prompt(name) for name in names)
+        if cached is not None and len(cached.texts) == len(texts) and all(a is b for a, b in zip(cached.texts, texts)):
+            index = cached.index
+        else:
+            index = FewShotIndex([FewShotExample.parse(name, text) for name, text in zip(names, texts)])
+        with self._lock:
+            self._example_banks[bank] = _CachedBank(path=bank_path, mtime_ns=mtime_ns, texts=texts, index=index)
+        return index
+
+    def preload(self) -> int:
+        """
+        Read every file under prompt_dir so requests never touch the filesystem on a hit.
+        Hidden files (editor swap files, .DS_Store) are skipped, and so is anything that is
+        not UTF-8 text, with a warning; such a file still fails when a request names it.
+        """
+        loaded: dict[str, _CachedPrompt] = {}
+        for path in sorted(self.prompt_dir.rglob("*")):
+            name = path.relative_to(self.prompt_dir).as_posix()
+            if not path.is_file() or any(part.startswith(".") for part in name.split("/")):
+                continue
+            try:
+                loaded[name] = self._read(name)
+            except (ValueError, OSError) as exc:  # UnicodeDecodeError is a ValueError
+                logger.warning("Not preloading prompt file %s: %s", name, exc)
+        with self._lock:
+            self._cache.update(loaded)
+        return len(loaded)
+
+    def reload(self, prompt_name: str | None = None) -> None:
+        """Drop cached prompts (all of them, or a single one) so the next load re-reads the file."""
+        with self._lock:
+            if prompt_name is None:
+                self._cache.clear()
+                self._templates.clear()
+                self._example_banks.clear()
+            else:
+                self._cache.pop(prompt_name, None)
+                self._templates.pop(prompt_name, None)
+                for bank in [bank for bank in self._example_banks if prompt_name.startswith(f"{bank.rstrip('/')}/")]:
+                    del self._example_banks[bank]
+
+    def _bank_path(self, bank: str) -> Path:
+        bank_path = (self.prompt_dir / bank).resolve()
+        if self.prompt_dir not in bank_path.parents:
+            raise ValueError(f"Example bank {bank!r} is outside the prompt directory.")
+        if not bank_path.is_dir():
+            raise FileNotFoundError(f"Example bank {bank!r} not found at {bank_path}.")
+        return bank_path
+
+    def _read(self, prompt_name: str) -> _CachedPrompt:
         prompt_path = (self.prompt_dir / prompt_name).resolve()
         if self.prompt_dir not in prompt_path.parents:
             raise ValueError(f"Prompt path {prompt_name!r} is outside the prompt directory.")
@@ -20,4 +136,21 @@ class PromptRepository:
         if not prompt_path.is_file():
             raise FileNotFoundError(f"Prompt {prompt_name!r} not found at {prompt_path}.")
 
-        return prompt_path.read_text(encoding="utf-8").strip()
+        stat = prompt_path.stat()
+        text = prompt_path.read_text(encoding="utf-8").strip()
+        return _CachedPrompt(path=prompt_path, mtime_ns=stat.st_mtime_ns, size=stat.st_size, text=text)
+
+    @staticmethod
+    def _bank_is_fresh(cached: _CachedBank) -> bool:
+        try:
+            return cached.path.stat().st_mtime_ns == cached.mtime_ns
+        except OSError:
+            return False
+
+    @staticmethod
+    def _is_fresh(cached: _CachedPrompt) -> bool:
+        try:
+            stat = cached.path.stat()
+        except OSError:
+            return False
+        return stat.st_mtime_ns == cached.mtime_ns and stat.st_size == cached.size
@@ -0,0 +1,294 @@
+from __future__ import annotations
+
+import csv
+import io
+import json
+import os
+import queue
+import threading
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Sequence
+
+try:  # POSIX advisory locks keep rows intact across worker processes.
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+from ..domain.turtle_validator import TurtleValidation, validate_turtle
+from .env import bool_from_env, float_from_env, int_from_env
+
+LOG_FIELDS = [
+    "prompt_name",
+    "input_text",
+    "model",
+    "created_at",
+    "response",
+    "thinking",
+    "done",
+    "done_reason",
+    "total_duration",
+    "load_duration",
+    "prompt_eval_count",
+    "prompt_eval_duration",
+    "eval_count",
+    "eval_duration",
+    "logprobs",
+    "rdf_valid",
+    "rdf_note",
+    "rdf_triples",
+]
+
+# Key under which clients attach the Turtle validation of a generation (TurtleValidation.to_dict()).
+RDF_VALIDATION = "rdf_validation"
+
+DROP = "drop"
+BLOCK = "block"
+
+
+def attach_validation(data: dict[str, Any], validation: TurtleValidation | None = None) -> TurtleValidation:
+    """Validate the generated Turtle (unless a streaming validator already did) and record it on data."""
+    if validation is None:
+        validation = validate_turtle(data.get("response"))
+    data[RDF_VALIDATION] = validation.to_dict()
+    return validation
+
+
+def build_log_record(data: dict[str, Any], prompt_name: str | None, input_text: str | None) -> dict[str, Any]:
+    """Raw log record for one generation; sinks decide how to encode it."""
+    if isinstance(data.get(RDF_VALIDATION), dict):
+        validation = TurtleValidation.from_dict(data[RDF_VALIDATION])
+    else:
+        validation = validate_turtle(data.get("response"))
+    return {
+        "prompt_name": prompt_name,
+        "input_text": input_text,
+        "model": data.get("model"),
+        "created_at": data.get("created_at"),
+        "response": data.get("response"),
+        "thinking": data.get("thinking"),
+        "done": data.get("done"),
+        "done_reason": data.get("done_reason"),
+        "total_duration": data.get("total_duration"),
+        "load_duration": data.get("load_duration"),
+        "prompt_eval_count": data.get("prompt_eval_count"),
+        "prompt_eval_duration": data.get("prompt_eval_duration"),
+        "eval_count": data.get("eval_count"),
+        "eval_duration": data.get("eval_duration"),
+        "logprobs": data.get("logprobs"),
+        "rdf_valid": validation.valid,
+        "rdf_note": validation.note,
+        "rdf_triples": validation.triples,
+    }
+
+
+class ResponseSink(ABC):
+    """Destination for batches of log records (see build_log_record)."""
+
+    @abstractmethod
+    def write_batch(self, records: Sequence[dict[str, Any]]) -> None:
+        """Write records in order; called from one thread at a time."""
+
+    def idle(self) -> None:
+        """Called by the background writer when no record arrived for a flush interval."""
+        return None
+
+    def close(self) -> None:
+        return None
+
+
+class CsvResponseSink(ResponseSink):
+    """Appends records to a CSV file; one locked write per batch."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+
+    def write_batch(self, records: Sequence[dict[str, Any]]) -> None:
+        if not records:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=LOG_FIELDS)
+        for record in records:
+            writer.writerow({**record, "logprobs": json.dumps(record.get("logprobs"))})
+        rows = buffer.getvalue()
+
+        with self.path.open("a", encoding="utf-8", newline="") as csv_file:
+            if fcntl is not None:
+                fcntl.flock(csv_file.fileno(), fcntl.LOCK_EX)
+            try:
+                # Checked under the lock so concurrent processes write the header exactly once.
+                if csv_file.tell() == 0 and os.fstat(csv_file.fileno()).st_size == 0:
+                    header = io.StringIO()
+                    csv.DictWriter(header, fieldnames=LOG_FIELDS).writeheader()
+                    csv_file.write(header.getvalue())
+                csv_file.write(rows)
+                csv_file.flush()
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(csv_file.fileno(), fcntl.LOCK_UN)
+
+
+class ResponseLogger:
+    """Synchronous logger: every record is written before submit() returns."""
+
+    def __init__(self, sink: ResponseSink) -> None:
+        self.sink = sink
+        self._lock = threading.Lock()
+
+    def submit(self, record: dict[str, Any]) -> bool:
+        with self._lock:
+            self.sink.write_batch([record])
+        return True
+
+    def flush(self) -> None:
+        return None
+
+    def close(self) -> None:
+        self.sink.close()
+
+
+@dataclass(frozen=True)
+class ResponseLogConfig:
+    async_enabled: bool = True
+    queue_size: int = 10000
+    batch_size: int = 256
+    flush_interval: float = 1.0
+    full_policy: str = BLOCK
+
+    @classmethod
+    def from_env(cls) -> "ResponseLogConfig":
+        defaults = cls()
+        policy = (os.getenv("RESPONSE_LOG_FULL_POLICY") or defaults.full_policy).strip().lower()
+        return cls(
+            async_enabled=bool_from_env("RESPONSE_LOG_ASYNC", defaults.async_enabled),
+            queue_size=int_from_env("RESPONSE_LOG_QUEUE_SIZE", defaults.queue_size),
+            batch_size=int_from_env("RESPONSE_LOG_BATCH_SIZE", defaults.batch_size),
+            flush_interval=float_from_env("RESPONSE_LOG_FLUSH_INTERVAL", defaults.flush_interval),
+            full_policy=policy if policy in (DROP, BLOCK) else defaults.full_policy,
+        )
+
+
+class AsyncResponseLogger(ResponseLogger):
+    """
+    Hands records to a background thread through a bounded queue. The writer collects
+    records into one write until batch_size is reached or flush_interval has passed
+    since the first of them, so a steady trickle is still written in batches.
+    When the queue is full, records are either dropped (counted) or the caller blocks.
+    """
+
+    _STOP = object()
+    _FLUSH = object()
+
+    def __init__(
+        self,
+        sink: ResponseSink,
+        queue_size: int = 10000,
+        batch_size: int = 256,
+        flush_interval: float = 1.0,
+        full_policy: str = BLOCK,
+    ) -> None:
+        super().__init__(sink)
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.full_policy = full_policy
+        self.dropped = 0
+        self.write_errors = 0
+        self._queue: queue.Queue = queue.Queue(maxsize=max(1, queue_size))
+        self._closed = False
+        # Orders submit() against close(), so nothing is queued behind _STOP. Separate from _lock,
+        # which the writer thread takes: a submitter blocked on a full queue must not stall it.
+        self._state_lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name="response-log-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, record: dict[str, Any]) -> bool:
+        with self._state_lock:
+            if self._closed:
+                return False
+            if self.full_policy == DROP:
+                try:
+                    self._queue.put_nowait(record)
+                except queue.Full:
+                    with self._lock:
+                        self.dropped += 1
+                    return False
+                return True
+            self._queue.put(record)
+            return True
+
+    def flush(self) -> None:
+        """Block until every record submitted so far has been written."""
+        with self._state_lock:
+            if not self._closed:
+                # Ends the batch being collected instead of waiting out flush_interval.
+                self._queue.put(self._FLUSH)
+        self._queue.join()
+
+    def close(self) -> None:
+        with self._state_lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(self._STOP)
+        self._thread.join()
+        self.sink.close()
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            try:
+                first = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                self._idle()
+                continue
+            batch: list[dict[str, Any]] = []
+            taken = 1
+            if first is self._STOP:
+                stopping = True
+            elif first is not self._FLUSH:
+                batch.append(first)
+            write_at = time.monotonic() + self.flush_interval
+            while batch and len(batch) < self.batch_size and not stopping:
+                try:
+                    item = self._queue.get(timeout=max(0.0, write_at - time.monotonic()))
+                except queue.Empty:
+                    break
+                taken += 1
+                if item is self._STOP:
+                    stopping = True
+                elif item is self._FLUSH:
+                    break
+                else:
+                    batch.append(item)
+            try:
+                if batch:
+                    self.sink.write_batch(batch)
+            except Exception:  # keep the writer alive; a lost batch must not stop logging
+                with self._lock:
+                    self.write_errors += 1
+            finally:
+                for _ in range(taken):
+                    self._queue.task_done()
+
+
+    def _idle(self) -> None:
+        try:
+            self.sink.idle()
+        except Exception:
+            with self._lock:
+                self.write_errors += 1
+
+
+def build_response_logger(sink: ResponseSink, config: ResponseLogConfig) -> ResponseLogger:
+    if not config.async_enabled:
+        return ResponseLogger(sink)
+    return AsyncResponseLogger(
+        sink,
+        queue_size=config.queue_size,
+        batch_size=config.batch_size,
+        flush_interval=config.flush_interval,
+        full_policy=config.full_policy,
+    )
@@ -0,0 +1,253 @@
+from __future__ import annotations
+
+import gzip
+import json
+import os
+import shutil
+import threading
+import time
+from abc import abstractmethod
+from dataclasses import dataclass
+from pathlib import Path
+from typing import IO, Any, Sequence
+
+try:  # Optional dependency; only needed for the Parquet sink.
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - exercised when pyarrow is absent
+    pa = None
+    pq = None
+
+from .env import int_from_env, path_from_env
+from .response_log import LOG_FIELDS, CsvResponseSink, ResponseSink
+
+CSV = "csv"
+JSONL = "jsonl"
+PARQUET = "parquet"
+
+INT_FIELDS = frozenset(
+    {
+        "total_duration",
+        "load_duration",
+        "prompt_eval_count",
+        "prompt_eval_duration",
+        "eval_count",
+        "eval_duration",
+        "rdf_triples",
+    }
+)
+BOOL_FIELDS = frozenset({"done", "rdf_valid"})
+
+ROTATE_BYTES = 64 * 1024 * 1024
+ROTATE_SECONDS = 3600
+# An open Parquet file is unreadable until its footer is written on close.
+PARQUET_ROTATE_BYTES = 8 * 1024 * 1024
+PARQUET_ROTATE_SECONDS = 300
+
+
+def _segment_name(prefix: str, suffix: str) -> str:
+    # The pid keeps segments from different worker processes apart.
+    return f"{prefix}-{time.strftime('%Y%m%dT%H%M%S')}-{os.getpid()}-{time.monotonic_ns()}{suffix}"
+
+
+class _RotatingSink(ResponseSink):
+    """Writes to one open segment at a time and starts a new one by size or age."""
+
+    suffix = ""
+
+    def __init__(self, directory: Path, max_bytes: int, max_seconds: int, prefix: str = "responses") -> None:
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.max_seconds = max_seconds
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        self._path: Path | None = None
+        self._opened_at = 0.0
+
+    def write_batch(self, records: Sequence[dict[str, Any]]) -> None:
+        if not records:
+            return
+        with self._lock:
+            if self._path is not None and self._should_rotate():
+                self._finish_segment()
+            if self._path is None:
+                self.directory.mkdir(parents=True, exist_ok=True)
+                self._path = self.directory / _segment_name(self.prefix, self.suffix)
+                self._opened_at = time.monotonic()
+                self._open_segment(self._path)
+            self._write(records)
+
+    def idle(self) -> None:
+        # Without traffic no write would come to rotate an old segment, and a Parquet
+        # segment is unreadable until its footer is written on close.
+        with self._lock:
+            if self._path is not None and self._should_rotate():
+                self._finish_segment()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._path is not None:
+                self._finish_segment()
+
+    def _should_rotate(self) -> bool:
+        if self.max_seconds and time.monotonic() - self._opened_at >= self.max_seconds:
+            return True
+        return bool(self.max_bytes) and self._segment_size() >= self.max_bytes
+
+    def _finish_segment(self) -> None:
+        self._close_segment()
+        self._path = None
+
+    @abstractmethod
+    def _open_segment(self, path: Path) -> None:
+        """Start writing a new segment at path."""
+
+    @abstractmethod
+    def _write(self, records: Sequence[dict[str, Any]]) -> None:
+        """Append records to the open segment."""
+
+    @abstractmethod
+    def _segment_size(self) -> int:
+        """Bytes written to the open segment so far."""
+
+    @abstractmethod
+    def _close_segment(self) -> None:
+        """Finish the open segment (self._path is still set)."""
+
+
+class JsonlResponseSink(_RotatingSink):
+    """
+    JSON lines with native types, rotated by size/age. Finished segments are
+    gzip-compressed when compress is set; the active segment stays plain.
+    """
+
+    suffix = ".jsonl"
+
+    def __init__(
+        self,
+        directory: Path,
+        max_bytes: int = ROTATE_BYTES,
+        max_seconds: int = ROTATE_SECONDS,
+        compress: bool = True,
+        prefix: str = "responses",
+    ) -> None:
+        super().__init__(directory, max_bytes, max_seconds, prefix)
+        self.compress = compress
+        self._file: IO[str] | None = None
+
+    def _open_segment(self, path: Path) -> None:
+        self._file = path.open("a", encoding="utf-8")
+
+    def _write(self, records: Sequence[dict[str, Any]]) -> None:
+        self._file.write("".join(json.dumps(record, ensure_ascii=False) + "\n" for record in records))
+        self._file.flush()
+
+    def _segment_size(self) -> int:
+        return self._file.tell()
+
+    def _close_segment(self) -> None:
+        self._file.close()
+        self._file = None
+        if self.compress:
+            compressed = self._path.with_name(self._path.name + ".gz")
+            with self._path.open("rb") as source, gzip.open(compressed, "wb") as target:
+                shutil.copyfileobj(source, target)
+            self._path.unlink()
+
+
+def _parquet_schema():
+    fields = []
+    for name in LOG_FIELDS:
+        if name in INT_FIELDS:
+            fields.append(pa.field(name, pa.int64()))
+        elif name in BOOL_FIELDS:
+            fields.append(pa.field(name, pa.bool_()))
+        else:
+            fields.append(pa.field(name, pa.string()))
+    return pa.schema(fields)
+
+
+class ParquetResponseSink(_RotatingSink):
+    """
+    Columnar log: each batch becomes a zstd-compressed row group with typed
+    duration/count/flag columns. logprobs is stored as a JSON string column.
+    A segment has no footer until it is closed, so a crash loses the open one;
+    segments are therefore kept smaller and shorter-lived than JSONL ones.
+    """
+
+    suffix = ".parquet"
+
+    def __init__(
+        self,
+        directory: Path,
+        max_bytes: int = PARQUET_ROTATE_BYTES,
+        max_seconds: int = PARQUET_ROTATE_SECONDS,
+        prefix: str = "responses",
+    ) -> None:
+        if pa is None:
+            raise RuntimeError("The Parquet response log requires pyarrow (pip install pyarrow).")
+        super().__init__(directory, max_bytes, max_seconds, prefix)
+        self.schema = _parquet_schema()
+        self._writer = None
+
+    def _open_segment(self, path: Path) -> None:
+        self._writer = pq.ParquetWriter(str(path), self.schema, compression="zstd")
+
+    def _write(self, records: Sequence[dict[str, Any]]) -> None:
+        columns: dict[str, list[Any]] = {name: [] for name in LOG_FIELDS}
+        for record in records:
+            for name in LOG_FIELDS:
+                value = record.get(name)
+                if name == "logprobs":
+                    value = None if value is None else json.dumps(value)
+                elif name in INT_FIELDS:
+                    value = None if value is None else int(value)
+                elif name in BOOL_FIELDS:
+                    value = None if value is None else bool(value)
+                elif value is not None:
+                    value = str(value)
+                columns[name].append(value)
+        self._writer.write_table(pa.Table.from_pydict(columns, schema=self.schema))
+
+    def _segment_size(self) -> int:
+        return self._path.stat().st_size
+
+    def _close_segment(self) -> None:
+        self._writer.close()
+        self._writer = None
+
+
+@dataclass(frozen=True)
+class ResponseSinkConfig:
+    format: str = CSV
+    directory: Path | None = None
+    # None uses the format's default (smaller and shorter for Parquet).
+    rotate_bytes: int | None = None
+    rotate_seconds: int | None = None
+
+    @classmethod
+    def from_env(cls) -> "ResponseSinkConfig":
+        defaults = cls()
+        return cls(
+            format=(os.getenv("RESPONSE_LOG_FORMAT") or defaults.format).strip().lower(),
+            directory=path_from_env("RESPONSE_LOG_DIR"),
+            rotate_bytes=int_from_env("RESPONSE_LOG_ROTATE_BYTES", defaults.rotate_bytes),
+            rotate_seconds=int_from_env("RESPONSE_LOG_ROTATE_SECONDS", defaults.rotate_seconds),
+        )
+
+    def rotation(self, max_bytes: int, max_seconds: int) -> dict[str, int]:
+        return {
+            "max_bytes": max_bytes if self.rotate_bytes is None else self.rotate_bytes,
+            "max_seconds": max_seconds if self.rotate_seconds is None else self.rotate_seconds,
+        }
+
+
+def build_response_sink(config: ResponseSinkConfig, csv_path: Path) -> ResponseSink:
+    if config.format == CSV:
+        return CsvResponseSink(csv_path)
+    directory = config.directory or (csv_path.parent / "responses")
+    if config.format == JSONL:
+        return JsonlResponseSink(directory, **config.rotation(ROTATE_BYTES, ROTATE_SECONDS))
+    if config.format == PARQUET:
+        return ParquetResponseSink(directory, **config.rotation(PARQUET_ROTATE_BYTES, PARQUET_ROTATE_SECONDS))
+    raise ValueError(f"Unknown RESPONSE_LOG_FORMAT {config.format!r}; expected csv, jsonl or parquet.")
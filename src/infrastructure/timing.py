@@ -0,0 +1,67 @@
+"""
+Per-request stage timers. A request opts in with collect(); code on the hot path
+wraps its stages in stage(name), which is a no-op when nothing is collecting.
+Timings follow the contextvars context, so they stay with one request across
+threads (asyncio.to_thread) and tasks, but are not shared with pool workers.
+"""
+
+from __future__ import annotations
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator
+
+PROMPT = "prompt"
+RENDER = "render"
+OLLAMA = "ollama"
+PARSE = "parse"
+VALIDATE = "validate"
+LOG = "log"
+TRIPLES = "triples"
+TOTAL = "total"
+
+
+class StageTimings:
+    __slots__ = ("stages",)
+
+    def __init__(self) -> None:
+        # Seconds per stage, in first-seen order; repeated stages accumulate.
+        self.stages: dict[str, float] = {}
+
+    def add(self, name: str, seconds: float) -> None:
+        self.stages[name] = self.stages.get(name, 0.0) + seconds
+
+    def to_dict(self) -> dict[str, float]:
+        """Milliseconds per stage."""
+        return {name: round(seconds * 1000, 3) for name, seconds in self.stages.items()}
+
+    def server_timing(self) -> str:
+        """Server-Timing header value, e.g. "prompt;dur=0.21, ollama;dur=812.4"."""
+        return ", ".join(f"{name};dur={seconds * 1000:.3f}" for name, seconds in self.stages.items())
+
+
+_current: ContextVar[StageTimings | None] = ContextVar("stage_timings", default=None)
+
+
+@contextmanager
+def collect() -> Iterator[StageTimings]:
+    timings = StageTimings()
+    token = _current.set(timings)
+    try:
+        yield timings
+    finally:
+        _current.reset(token)
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    timings = _current.get()
+    if timings is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.add(name, time.perf_counter() - started)
@@ -0,0 +1,167 @@
+"""
+Embedded triple store: generated graphs are merged into one SQLite database as
+they are produced, so the knowledge graph is assembled at write time instead of
+in a post-processing pass over the response log.
+
+Terms are interned in their own table and triples are stored as id triples with
+SPO, POS and OSP indexes, which makes any single-term lookup an index range scan.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import sqlite3
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator
+
+from ..domain.triples import TripleGraph
+from .env import path_from_env
+
+# SQLite's default limit on host parameters is 999 on older builds.
+_LOOKUP_CHUNK = 500
+_EXPORT_BATCH = 1000
+
+
+@dataclass(frozen=True)
+class TripleStoreConfig:
+    path: Path | None = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.path is not None
+
+    @classmethod
+    def from_env(cls) -> "TripleStoreConfig":
+        return cls(path=path_from_env("TRIPLE_STORE_PATH"))
+
+
+def as_term(value: str) -> str:
+    """Accept N-Triples terms as-is and treat anything else as a bare IRI."""
+    if value.startswith(("<", '"', "_:")):
+        return value
+    return f"<{value}>"
+
+
+class SqliteTripleStore:
+    """
+    Thread-safe, de-duplicating triple store. Blank nodes are scoped to the source
+    text they were parsed from, so graphs from different generations never share a
+    blank node while a repeated generation maps onto the same one.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(
+            "CREATE TABLE IF NOT EXISTS terms (id INTEGER PRIMARY KEY, term TEXT NOT NULL UNIQUE);"
+            "CREATE TABLE IF NOT EXISTS triples ("
+            "s INTEGER NOT NULL, p INTEGER NOT NULL, o INTEGER NOT NULL, PRIMARY KEY (s, p, o)) WITHOUT ROWID;"
+            "CREATE INDEX IF NOT EXISTS triples_pos ON triples (p, o, s);"
+            "CREATE INDEX IF NOT EXISTS triples_osp ON triples (o, s, p);"
+        )
+        self._conn.commit()
+
+    def add(self, graph: TripleGraph, source: str | None = None) -> int:
+        """Merge a graph into the store in one transaction; returns the number of new triples."""
+        if not len(graph):
+            return 0
+        terms = graph.terms
+        if source is not None and any(term.startswith("_:") for term in terms):
+            scope = hashlib.sha256(source.encode("utf-8")).hexdigest()[:16]
+            terms = [f"_:s{scope}{term[2:]}" if term.startswith("_:") else term for term in terms]
+
+        with self._lock, self._conn:
+            self._conn.executemany("INSERT OR IGNORE INTO terms (term) VALUES (?)", ((term,) for term in terms))
+            ids = self._term_ids(terms)
+            before = self._conn.total_changes
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO triples (s, p, o) VALUES (?, ?, ?)",
+                ((ids[terms[s]], ids[terms[p]], ids[terms[o]]) for s, p, o in graph),
+            )
+            return self._conn.total_changes - before
+
+    def find(
+        self,
+        subject: str | None = None,
+        predicate: str | None = None,
+        obj: str | None = None,
+        limit: int = 100,
+        offset: int = 0,
+    ) -> list[tuple[str, str, str]]:
+        """Triples matching the given N-Triples terms; None matches anything."""
+        clauses, params = [], []
+        for column, term in (("s", subject), ("p", predicate), ("o", obj)):
+            if term is None:
+                continue
+            clauses.append(f"t.{column} = (SELECT id FROM terms WHERE term = ?)")
+            params.append(term)
+        return self._select(clauses, params, limit, offset)
+
+    def describe(self, entity: str, limit: int = 100, offset: int = 0) -> list[tuple[str, str, str]]:
+        """Triples in which the entity is the subject or the object."""
+        with self._lock:
+            row = self._conn.execute("SELECT id FROM terms WHERE term = ?", (entity,)).fetchone()
+        if row is None:
+            return []
+        return self._select(["(t.s = ? OR t.o = ?)"], [row[0], row[0]], limit, offset)
+
+    def export(self) -> Iterator[str]:
+        """All triples as N-Triples lines, read in batches so the store is never loaded at once."""
+        last = (-1, -1, -1)
+        while True:
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT t.s, t.p, t.o, s.term, p.term, o.term FROM triples t "
+                    "JOIN terms s ON s.id = t.s JOIN terms p ON p.id = t.p JOIN terms o ON o.id = t.o "
+                    "WHERE (t.s, t.p, t.o) > (?, ?, ?) ORDER BY t.s, t.p, t.o LIMIT ?",
+                    (*last, _EXPORT_BATCH),
+                ).fetchall()
+            if not rows:
+                return
+            for row in rows:
+                yield f"{row[3]} {row[4]} {row[5]} .\n"
+            last = rows[-1][:3]
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            triples = self._conn.execute("SELECT COUNT(*) FROM triples").fetchone()[0]
+            terms = self._conn.execute("SELECT COUNT(*) FROM terms").fetchone()[0]
+        return {"triples": triples, "terms": terms}
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _term_ids(self, terms: list[str]) -> dict[str, int]:
+        ids: dict[str, int] = {}
+        for start in range(0, len(terms), _LOOKUP_CHUNK):
+            chunk = terms[start : start + _LOOKUP_CHUNK]
+            placeholders = ",".join("?" * len(chunk))
+            for term_id, term in self._conn.execute(
+                f"SELECT id, term FROM terms WHERE term IN ({placeholders})", chunk
+            ):
+                ids[term] = term_id
+        return ids
+
+    def _select(self, clauses: list[str], params: list, limit: int, offset: int) -> list[tuple[str, str, str]]:
+        where = f"WHERE {' AND '.join(clauses)} " if clauses else ""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT s.term, p.term, o.term FROM triples t "
+                "JOIN terms s ON s.id = t.s JOIN terms p ON p.id = t.p JOIN terms o ON o.id = t.o "
+                f"{where}ORDER BY t.s, t.p, t.o LIMIT ? OFFSET ?",
+                (*params, limit, offset),
+            ).fetchall()
+        return [tuple(row) for row in rows]
+
+
+def build_triple_store(config: TripleStoreConfig) -> SqliteTripleStore | None:
+    if not config.enabled:
+        return None
+    return SqliteTripleStore(config.path)
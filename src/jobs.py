@@ -0,0 +1,53 @@
+"""
+Standalone job queue worker: drains JOBS_PATH without serving HTTP.
+
+    JOBS_PATH=data/jobs.sqlite3 python -m src.jobs --workers 4
+
+Run it next to (or instead of) the API's own workers; any number of processes
+may share the queue file. Ctrl-C lets each worker finish its current item.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import threading
+from dataclasses import replace
+
+
+def _parse_args(argv: list[str] | None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m src.jobs", description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--workers", type=int, default=None, help="Worker threads (default: JOBS_WORKERS, else 2).")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    from dotenv import load_dotenv
+
+    from .app import build_service
+    from .application.jobs import JobWorkerConfig, JobWorkerPool
+    from .infrastructure.job_store import JobStoreConfig, build_job_store
+
+    args = _parse_args(argv)
+    load_dotenv()
+    store = build_job_store(JobStoreConfig.from_env())
+    if store is None:
+        print("JOBS_PATH is not set.", file=sys.stderr)
+        return 2
+
+    config = JobWorkerConfig.from_env()
+    # JOBS_WORKERS=0 means "API only" for the web process; a worker process always runs at least one.
+    config = replace(config, workers=max(1, config.workers if args.workers is None else args.workers))
+    workers = JobWorkerPool(build_service(), store, config).start()
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        workers.stop()
+        store.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,186 @@
+"""
+Production entry point: the Flask app behind pre-forked gunicorn workers.
+
+    pip install gunicorn
+    python -m src.serve --bind 0.0.0.0:5000 --workers 4 --threads 8
+
+Prompts, compiled templates and the few-shot index are loaded once in the master
+and shared copy-on-write by the workers. Everything holding sockets, files or
+threads (HTTP sessions, the response log writer, SQLite stores, job workers) is
+built inside each worker after the fork. On SIGTERM, workers stop accepting,
+finish in-flight requests within the graceful timeout, then flush the response log.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import logging
+import os
+import sys
+from dataclasses import dataclass, replace
+from typing import Any
+
+from .infrastructure.env import bool_from_env, int_from_env
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class ServeConfig:
+    bind: str = "127.0.0.1:5000"
+    workers: int = 2
+    # Requests mostly wait on Ollama, so each process serves several at once.
+    threads: int = 8
+    # Seconds a worker gets to finish in-flight generations after SIGTERM before it is killed.
+    graceful_timeout: int = 120
+    keepalive: int = 5
+    preload: bool = True
+    warm_up: bool = False
+
+    @classmethod
+    def from_env(cls) -> "ServeConfig":
+        defaults = cls()
+        return cls(
+            bind=os.getenv("SERVE_BIND") or defaults.bind,
+            workers=max(1, int_from_env("SERVE_WORKERS", defaults.workers)),
+            threads=max(1, int_from_env("SERVE_THREADS", defaults.threads)),
+            graceful_timeout=max(0, int_from_env("SERVE_GRACEFUL_TIMEOUT", defaults.graceful_timeout)),
+            keepalive=max(0, int_from_env("SERVE_KEEPALIVE", defaults.keepalive)),
+            preload=bool_from_env("SERVE_PRELOAD", defaults.preload),
+            warm_up=bool_from_env("OLLAMA_WARM_UP", defaults.warm_up),
+        )
+
+    def gunicorn_options(self) -> dict[str, Any]:
+        return {
+            "bind": [self.bind],
+            "workers": self.workers,
+            "worker_class": "gthread",
+            "threads": self.threads,
+            "graceful_timeout": self.graceful_timeout,
+            "keepalive": self.keepalive,
+        }
+
+
+def preload_prompts():
+    """
+    Read the prompt tree, compile the default template and index the few-shot bank in the
+    master. Lookup errors are left for requests to report, as without preloading.
+    """
+    from .app import DEFAULT_FEW_SHOT_BANK, build_prompt_repository
+
+    repository = build_prompt_repository()
+    default_prompt = os.getenv("DEFAULT_PROMPT_NAME")
+    bank = os.getenv("FEW_SHOT_BANK") or DEFAULT_FEW_SHOT_BANK
+    try:
+        if default_prompt:
+            repository.load_template(default_prompt)
+        if (repository.prompt_dir / bank).is_dir():
+            repository.load_examples(bank)
+    except (FileNotFoundError, ValueError) as exc:
+        logger.warning("Prompt preload incomplete: %s", exc)
+    return repository
+
+
+def warm_up(prompt_repository) -> list[dict]:
+    """
+    One warm-up for the whole server instead of one per worker. Built without health checks,
+    a log writer or caches, so no thread or socket is left behind for fork() to copy.
+    """
+    from .application.services import KnowledgeGraphService
+    from .infrastructure import BackendPool, BackendPoolConfig, OllamaClient, OllamaClientConfig
+
+    ollama_config = OllamaClientConfig.from_env()
+    pool_config = BackendPoolConfig.from_env()
+    backend_pool = BackendPool(pool_config, model=ollama_config.model) if pool_config.enabled else None
+    client = OllamaClient(config=ollama_config, backend_pool=backend_pool)
+    service = KnowledgeGraphService(
+        prompt_repository,
+        default_prompt=os.getenv("DEFAULT_PROMPT_NAME"),
+        default_system_prompt=os.getenv("DEFAULT_SYSTEM_PROMPT_NAME"),
+        ollama_client=client,
+    )
+    try:
+        return service.warm_up()
+    finally:
+        client.close()
+
+
+def _gunicorn_application(config: ServeConfig, prompt_repository):
+    from gunicorn.app.base import BaseApplication
+
+    from .app import create_app, shutdown_app
+
+    def worker_exit(server, worker) -> None:
+        app = getattr(worker, "wsgi", None)
+        if app is not None:
+            shutdown_app(app, timeout=config.graceful_timeout)
+
+    class KnowledgeGraphApplication(BaseApplication):
+        def load_config(self) -> None:
+            for key, value in {**config.gunicorn_options(), "worker_exit": worker_exit}.items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            # Called in each worker after the fork; warm-up already ran once in the master.
+            return create_app(prompt_repository=prompt_repository, warm_up=False)
+
+    return KnowledgeGraphApplication()
+
+
+def _parse_args(argv: list[str] | None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m src.serve", description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--bind", help="Address to listen on (default: SERVE_BIND, else 127.0.0.1:5000).")
+    parser.add_argument("--workers", type=int, help="Worker processes (default: SERVE_WORKERS, else 2).")
+    parser.add_argument("--threads", type=int, help="Threads per worker (default: SERVE_THREADS, else 8).")
+    parser.add_argument("--graceful-timeout", type=int, help="Seconds to drain in-flight requests on shutdown.")
+    parser.add_argument("--no-preload", action="store_true", help="Load prompts in each worker instead of once.")
+    parser.add_argument("--warm-up", action="store_true", help="Warm up Ollama before starting (or OLLAMA_WARM_UP).")
+    return parser.parse_args(argv)
+
+
+def _config(args: argparse.Namespace) -> ServeConfig:
+    config = ServeConfig.from_env()
+    overrides = {
+        "bind": args.bind,
+        "workers": max(1, args.workers) if args.workers is not None else None,
+        "threads": max(1, args.threads) if args.threads is not None else None,
+        "graceful_timeout": args.graceful_timeout,
+        "preload": False if args.no_preload else None,
+        "warm_up": True if args.warm_up else None,
+    }
+    return replace(config, **{key: value for key, value in overrides.items() if value is not None})
+
+
+def main(argv: list[str] | None = None) -> int:
+    from dotenv import load_dotenv
+
+    args = _parse_args(argv)
+    load_dotenv()
+    config = _config(args)
+    try:
+        import gunicorn  # noqa: F401 - only checking availability
+    except ImportError:
+        print("The serving entry point needs gunicorn: pip install gunicorn", file=sys.stderr)
+        return 2
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    if config.workers > 1:
+        # A scrape reaches one worker; label its series so they are not mistaken for the whole server.
+        os.environ.setdefault("METRICS_PID_LABEL", "true")
+    prompt_repository = preload_prompts() if config.preload or config.warm_up else None
+    if config.warm_up:
+        for result in warm_up(prompt_repository):
+            logger.info("Ollama warm-up: %s", result)
+    if not config.preload:
+        prompt_repository = None
+    # Objects created so far live for the whole process; keeping the collector off them
+    # stops it from writing to their pages, which would otherwise un-share them in every worker.
+    gc.collect()
+    gc.freeze()
+    _gunicorn_application(config, prompt_repository).run()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
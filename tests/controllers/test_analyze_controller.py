@@ -39,6 +39,12 @@ class StubOllamaClient:
         self.calls.append({"system": system_prompt, "prompt": prompt, "prompt_name": prompt_name, "input_text": input_text})
         return {"model": "llama3:8b", "response": "ok", "done": True}
 
+    def generate_stream(self, system_prompt: str, prompt: str, prompt_name: str | None = None, input_text: str | None = None):
+        self.calls.append({"system": system_prompt, "prompt": prompt, "prompt_name": prompt_name, "input_text": input_text})
+        yield {"response": "o", "done": False}
+        yield {"response": "k", "done": False}
+        yield {"response": "ok", "done": True, "done_reason": "stop"}
+
 
 @pytest.fixture()
 def client():
@@ -137,3 +143,366 @@ def test_analyze_includes_generation_payload():
         assert data["text"] == "Some text"
         assert data["rdf"] == "ok"
         assert ollama.calls[0]["system"] == "System prompt content"
+
+
+def test_analyze_rejects_non_string_variables(client):
+    payload = {"text": "Some text", "variables": {"DOMAIN": 3}}
+    resp = client.post("/analyze", data=json.dumps(payload), content_type="application/json")
+
+    assert resp.status_code == 400
+    assert "variables" in resp.get_json()["error"]
+
+
+def test_analyze_batch_returns_results_and_errors_in_input_order():
+    repo = StubPromptRepo(prompt_text="Prompt content", system_prompt_text="System prompt content")
+    ollama = StubOllamaClient()
+    service = KnowledgeGraphService(
+        repo,
+        default_prompt="test_prompt.txt",
+        default_system_prompt="system_prompt.txt",
+        ollama_client=ollama,
+        batch_concurrency=3,
+    )
+
+    from flask import Flask
+
+    app = Flask(__name__)
+    app.register_blueprint(create_analyze_blueprint(service))
+    app.config.update({"TESTING": True})
+
+    with app.test_client() as client:
+        payload = {
+            "items": [
+                {"text": "First"},
+                {"text": "Second", "prompt_name": "missing.txt"},
+                {},
+                {"text": "Fourth"},
+            ]
+        }
+        resp = client.post("/analyze/batch", data=json.dumps(payload), content_type="application/json")
+
+        assert resp.status_code == 200
+        results = resp.get_json()["results"]
+        assert [item["index"] for item in results] == [0, 1, 2, 3]
+        assert results[0] == {"index": 0, "text": "First", "rdf": "ok"}
+        assert results[1]["status"] == 404
+        assert results[2]["status"] == 400
+        assert results[3]["text"] == "Fourth"
+        assert len(ollama.calls) == 2
+
+
+def test_analyze_batch_accepts_texts_and_enforces_limit(client):
+    resp = client.post("/analyze/batch", data=json.dumps({"texts": ["a", "b"]}), content_type="application/json")
+    assert resp.status_code == 200
+    assert [item["text"] for item in resp.get_json()["results"]] == ["a", "b"]
+
+    resp = client.post("/analyze/batch", data=json.dumps({"items": []}), content_type="application/json")
+    assert resp.status_code == 400
+
+
+def test_analyze_stream_emits_ndjson_and_sse():
+    repo = StubPromptRepo(prompt_text="Prompt content", system_prompt_text="System prompt content")
+    service = KnowledgeGraphService(
+        repo,
+        default_prompt="test_prompt.txt",
+        default_system_prompt="system_prompt.txt",
+        ollama_client=StubOllamaClient(),
+    )
+
+    from flask import Flask
+
+    app = Flask(__name__)
+    app.register_blueprint(create_analyze_blueprint(service))
+    app.config.update({"TESTING": True})
+
+    with app.test_client() as client:
+        payload = json.dumps({"text": "Some text"})
+        resp = client.post("/analyze/stream", data=payload, content_type="application/json")
+        assert resp.mimetype == "application/x-ndjson"
+        events = [json.loads(line) for line in resp.get_data(as_text=True).splitlines()]
+        assert events == [
+            {"done": False, "delta": "o"},
+            {"done": False, "delta": "k"},
+            {"done": True, "rdf": "ok", "done_reason": "stop"},
+        ]
+
+        resp = client.post(
+            "/analyze/stream",
+            data=payload,
+            content_type="application/json",
+            headers={"Accept": "text/event-stream"},
+        )
+        assert resp.mimetype == "text/event-stream"
+        body = resp.get_data(as_text=True)
+        assert body.startswith("event: chunk\ndata: ")
+        assert "event: done" in body
+
+
+def test_analyze_stream_missing_prompt_returns_404_before_streaming():
+    repo = StubPromptRepo(prompt_text="Prompt content")
+    service = KnowledgeGraphService(
+        repo,
+        default_prompt="test_prompt.txt",
+        default_system_prompt="system_prompt.txt",
+        ollama_client=StubOllamaClient(),
+    )
+
+    from flask import Flask
+
+    app = Flask(__name__)
+    app.register_blueprint(create_analyze_blueprint(service))
+
+    with app.test_client() as client:
+        payload = {"text": "Some text", "prompt_name": "missing.txt"}
+        resp = client.post("/analyze/stream", data=json.dumps(payload), content_type="application/json")
+        assert resp.status_code == 404
+
+
+def test_analyze_document_merges_chunks_and_reports_errors():
+    class TurtleOllamaClient(StubOllamaClient):
+        def generate(self, system_prompt, prompt, prompt_name=None, input_text=None):
+            subject = input_text.split()[0]
+            return {"response": f"@prefix ex: <http://example.org/> .\nex:{subject} ex:says ex:hi .", "done": True}
+
+    repo = StubPromptRepo(prompt_text="Prompt ${USER_TEXT}", system_prompt_text="System prompt content")
+    service = KnowledgeGraphService(
+        repo,
+        default_prompt="test_prompt.txt",
+        default_system_prompt="system_prompt.txt",
+        ollama_client=TurtleOllamaClient(),
+        document_chunk_tokens=5,
+    )
+
+    from flask import Flask
+
+    app = Flask(__name__)
+    app.register_blueprint(create_analyze_blueprint(service))
+    app.config.update({"TESTING": True})
+
+    with app.test_client() as client:
+        text = "Alice knows Bob.\n\nBob knows Carol."
+        resp = client.post("/analyze/document", data=json.dumps({"text": text}), content_type="application/json")
+        assert resp.status_code == 200
+        body = resp.get_json()
+        assert body["chunks"] == 2
+        assert body["errors"] == []
+        assert body["rdf"] == (
+            "@prefix ex: <http://example.org/> .\n\nex:Alice ex:says ex:hi .\n\nex:Bob ex:says ex:hi .\n"
+        )
+
+        resp = client.post(
+            "/analyze/document",
+            data=json.dumps({"text": text, "prompt_name": "missing.txt"}),
+            content_type="application/json",
+        )
+        assert resp.status_code == 404
+
+
+def test_analyze_rejects_with_retry_after_when_admission_is_saturated():
+    from src.application.admission import AdmissionConfig, AdmissionController
+
+    admission = AdmissionController(AdmissionConfig(max_in_flight=1, queue_size=0, min_retry_after=3))
+    service = KnowledgeGraphService(
+        StubPromptRepo(prompt_text="Prompt content"),
+        default_prompt="test_prompt.txt",
+        default_system_prompt="system_prompt.txt",
+        ollama_client=StubOllamaClient(),
+        admission=admission,
+    )
+
+    from flask import Flask
+
+    app = Flask(__name__)
+    app.register_blueprint(create_analyze_blueprint(service))
+
+    with app.test_client() as client:
+        body = json.dumps({"text": "Alice knows Bob."})
+        resp = client.post("/analyze", data=body, content_type="application/json", headers={"X-Priority": "high"})
+        assert resp.status_code == 200
+        assert admission.in_flight == 0
+
+        admission.acquire()
+        resp = client.post("/analyze", data=body, content_type="application/json")
+        assert resp.status_code == 429
+        assert resp.headers["Retry-After"] == "3"
+        assert resp.get_json()["retry_after"] == 3
+
+        resp = client.post("/analyze", data=body, content_type="application/json", headers={"X-Priority": "urgent"})
+        assert resp.status_code == 400
+
+
+def test_batch_queue_timeout_starts_when_each_item_is_queued():
+    import time
+
+    from src.application.admission import AdmissionConfig, AdmissionController
+
+    class SlowOllamaClient(StubOllamaClient):
+        def generate(self, system_prompt, prompt, prompt_name=None, input_text=None):
+            time.sleep(0.05)
+            return super().generate(system_prompt, prompt, prompt_name, input_text)
+
+    service = KnowledgeGraphService(
+        StubPromptRepo(prompt_text="Prompt ${USER_TEXT}"),
+        default_prompt="test_prompt.txt",
+        default_system_prompt="system_prompt.txt",
+        ollama_client=SlowOllamaClient(),
+        batch_concurrency=2,
+        admission=AdmissionController(AdmissionConfig(max_in_flight=1, queue_size=10)),
+    )
+
+    from flask import Flask
+
+    app = Flask(__name__)
+    app.register_blueprint(create_analyze_blueprint(service))
+
+    # 12 items take ~0.6s in total, but none of them waits in the queue for more than ~0.05s.
+    with app.test_client() as client:
+        resp = client.post(
+            "/analyze/batch",
+            data=json.dumps({"texts": [f"t{index}" for index in range(12)]}),
+            content_type="application/json",
+            headers={"X-Request-Timeout": "0.3"},
+        )
+
+    assert resp.status_code == 200
+    assert [item.get("status") for item in resp.get_json()["results"]] == [None] * 12
+
+
+def test_analyze_output_formats_return_parsed_triples():
+    class TurtleOllamaClient(StubOllamaClient):
+        def generate(self, system_prompt, prompt, prompt_name=None, input_text=None):
+            return {"response": "@prefix ex: <http://example.org/> .\nex:a ex:p ex:b .\n", "done": True}
+
+    repo = StubPromptRepo(prompt_text="Prompt content")
+    service = KnowledgeGraphService(
+        repo,
+        default_prompt="test_prompt.txt",
+        default_system_prompt="system_prompt.txt",
+        ollama_client=TurtleOllamaClient(),
+    )
+
+    from flask import Flask
+
+    app = Flask(__name__)
+    app.register_blueprint(create_analyze_blueprint(service))
+
+    with app.test_client() as client:
+        triples = client.post("/analyze", json={"text": "t", "output": "triples"}).get_json()
+        ntriples = client.post("/analyze", json={"text": "t", "output": "ntriples"}).get_json()
+        invalid = client.post("/analyze", json={"text": "t", "output": "xml"})
+
+    assert "rdf" not in triples
+    assert triples["terms"] == ["<http://example.org/a>", "<http://example.org/p>", "<http://example.org/b>"]
+    assert triples["triples"] == [[0, 1, 2]]
+    assert ntriples["rdf"] == "<http://example.org/a> <http://example.org/p> <http://example.org/b> .\n"
+    assert invalid.status_code == 400
+
+
+def test_triples_routes_lookup_and_export(tmp_path):
+    from flask import Flask
+
+    from src.controllers.triples_controller import create_triples_blueprint
+    from src.domain.triples import parse_turtle
+    from src.infrastructure.triple_store import SqliteTripleStore
+
+    store = SqliteTripleStore(tmp_path / "kg.sqlite")
+    store.add(parse_turtle("@prefix ex: <http://example.org/> .\nex:a ex:p ex:b .\nex:b ex:p ex:c .\n")[0])
+    app = Flask(__name__)
+    app.register_blueprint(create_triples_blueprint(store))
+
+    with app.test_client() as client:
+        by_subject = client.get("/triples", query_string={"subject": "http://example.org/a"}).get_json()
+        by_entity = client.get("/triples", query_string={"entity": "<http://example.org/b>"}).get_json()
+        bad_limit = client.get("/triples", query_string={"limit": "many"})
+        stats = client.get("/triples/stats").get_json()
+        export = client.get("/triples/export")
+
+    assert by_subject["triples"] == [["<http://example.org/a>", "<http://example.org/p>", "<http://example.org/b>"]]
+    assert len(by_entity["triples"]) == 2
+    assert bad_limit.status_code == 400
+    assert stats == {"triples": 2, "terms": 4}
+    assert export.content_type.startswith("application/n-triples")
+    assert export.get_data(as_text=True).count(" .\n") == 2
+
+
+def test_jobs_routes_queue_and_report_results(tmp_path):
+    from flask import Flask
+
+    from src.application.jobs import JobWorkerConfig, JobWorkerPool
+    from src.controllers.jobs_controller import create_jobs_blueprint
+    from src.infrastructure.job_store import SqliteJobStore
+
+    repo = StubPromptRepo(prompt_text="Prompt content")
+    service = KnowledgeGraphService(
+        repo,
+        default_prompt="test_prompt.txt",
+        default_system_prompt="system_prompt.txt",
+        ollama_client=StubOllamaClient(),
+    )
+    store = SqliteJobStore(tmp_path / "jobs.sqlite3")
+    workers = JobWorkerPool(service, store, JobWorkerConfig(workers=0))
+    app = Flask(__name__)
+    app.register_blueprint(create_jobs_blueprint(store, max_batch_items=2, on_submit=workers.notify))
+
+    with app.test_client() as client:
+        single = client.post("/jobs", json={"text": "Alice"})
+        batch = client.post("/jobs", json={"items": [{"text": "a"}, {"text": "b", "prompt_name": "missing.txt"}]})
+        invalid = client.post("/jobs", json={"items": [{"text": "a"}, {}]})
+        too_many = client.post("/jobs", json={"texts": ["a", "b", "c"]})
+        bad_priority = client.post("/jobs", json={"text": "a"}, headers={"X-Priority": "urgent"})
+        queued = client.get(single.headers["Location"]).get_json()
+
+        while workers.run_once():
+            pass
+
+        done = client.get(single.headers["Location"]).get_json()
+        page = client.get(f"/jobs/{batch.get_json()['id']}", query_string={"offset": 1, "limit": 1}).get_json()
+        missing = client.get("/jobs/unknown")
+
+    assert single.status_code == 202 and single.get_json()["total"] == 1
+    assert invalid.status_code == 400 and invalid.get_json()["index"] == 1
+    assert too_many.status_code == 413
+    assert bad_priority.status_code == 400
+    assert queued["status"] == "queued" and queued["priority"] == "normal"
+    assert done["status"] == "done"
+    assert done["items"][0]["result"] == {"text": "Alice", "rdf": "ok"}
+    assert [item["index"] for item in page["items"]] == [1]
+    assert page["items"][0]["status"] == "failed" and page["items"][0]["error"]["exception"] == "FileNotFoundError"
+    assert missing.status_code == 404
+
+
+def test_analyze_stream_releases_admission_slot_when_body_is_never_read():
+    from src.application.admission import AdmissionConfig, AdmissionController
+
+    admission = AdmissionController(AdmissionConfig(max_in_flight=1, queue_size=0))
+    service = KnowledgeGraphService(
+        StubPromptRepo(prompt_text="Prompt content"),
+        default_prompt="test_prompt.txt",
+        default_system_prompt="system_prompt.txt",
+        ollama_client=StubOllamaClient(),
+        admission=admission,
+    )
+
+    from flask import Flask
+
+    app = Flask(__name__)
+    app.register_blueprint(create_analyze_blueprint(service))
+
+    with app.test_client() as client:
+        resp = client.post("/analyze/stream", json={"text": "Alice"}, buffered=False)
+        assert admission.in_flight == 1
+        resp.close()
+        assert admission.in_flight == 0
+
+        resp = client.post("/analyze/stream", json={"text": "Alice"})
+        assert b'"done": true' in resp.get_data()
+        assert admission.in_flight == 0
+        resp.close()
+        assert admission.in_flight == 0
+
+    from src.domain.models import AnalyzeRequest
+
+    stream = service.analyze_stream(AnalyzeRequest(text="Alice", prompt_name=None))
+    stream.close()
+    stream.close()
+    assert admission.in_flight == 0
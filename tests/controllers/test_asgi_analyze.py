@@ -0,0 +1,163 @@
+import asyncio
+import json
+import time
+from pathlib import Path
+
+from src.application.services import KnowledgeGraphService
+from src.controllers.asgi_analyze import create_analyze_asgi_app
+from src.infrastructure.prompt_repository import PromptRepository
+
+
+class StubPromptRepo(PromptRepository):
+    def __init__(self):
+        super().__init__(prompt_dir=Path("unused"))
+
+    def load_prompt(self, prompt_name: str) -> str:  # type: ignore[override]
+        if prompt_name == "missing.txt":
+            raise FileNotFoundError("not found")
+        return "Prompt ${USER_TEXT}"
+
+
+class SlowAsyncOllamaClient:
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def build_payload(self, system_prompt: str, prompt: str, stream: bool = False) -> dict:
+        return {"system": system_prompt, "prompt": prompt}
+
+    async def generate(self, system_prompt: str, prompt: str, prompt_name=None, input_text=None) -> dict:
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(self.delay)
+        self.in_flight -= 1
+        return {"response": f"rdf:{input_text}", "done": True}
+
+    async def generate_stream(self, system_prompt: str, prompt: str, prompt_name=None, input_text=None):
+        if input_text == "fail":
+            raise RuntimeError("Generation API error: boom")
+        yield {"response": "rdf:", "done": False}
+        yield {"response": f"rdf:{input_text}", "done": True, "done_reason": "stop"}
+
+
+def _app(client: SlowAsyncOllamaClient, **kwargs):
+    service = KnowledgeGraphService(
+        StubPromptRepo(),
+        default_prompt="p.txt",
+        default_system_prompt="s.txt",
+        async_ollama_client=client,
+        **kwargs,
+    )
+    return create_analyze_asgi_app(service)
+
+
+async def _call(app, method: str, path: str, payload: dict | None = None) -> tuple[int, dict]:
+    body = json.dumps(payload).encode() if payload is not None else b""
+    messages = [{"type": "http.request", "body": body, "more_body": False}]
+    sent = []
+
+    async def receive():
+        return messages.pop(0)
+
+    async def send(message):
+        sent.append(message)
+
+    await app({"type": "http", "method": method, "path": path}, receive, send)
+    return sent[0]["status"], json.loads(sent[1]["body"])
+
+
+async def _call_raw(app, path: str, payload: dict, headers: list | None = None) -> list[dict]:
+    messages = [{"type": "http.request", "body": json.dumps(payload).encode(), "more_body": False}]
+    sent = []
+
+    async def receive():
+        return messages.pop(0)
+
+    async def send(message):
+        sent.append(message)
+
+    await app({"type": "http", "method": "POST", "path": path, "headers": headers or []}, receive, send)
+    return sent
+
+
+def test_asgi_analyze_and_errors():
+    app = _app(SlowAsyncOllamaClient())
+
+    async def run():
+        return (
+            await _call(app, "GET", "/health"),
+            await _call(app, "POST", "/analyze", {"text": "Alice"}),
+            await _call(app, "POST", "/analyze", {"text": "Alice", "prompt_name": "missing.txt"}),
+            await _call(app, "POST", "/analyze", {}),
+            await _call(app, "GET", "/analyze"),
+        )
+
+    health, ok, missing, invalid, wrong_method = asyncio.run(run())
+
+    assert health == (200, {"status": "ok"})
+    assert ok == (200, {"text": "Alice", "rdf": "rdf:Alice"})
+    assert missing[0] == 404
+    assert invalid[0] == 400
+    assert wrong_method[0] == 405
+
+
+def test_asgi_handles_many_in_flight_extractions_on_one_loop():
+    client = SlowAsyncOllamaClient(delay=0.2)
+    app = _app(client)
+
+    async def run():
+        return await asyncio.gather(*(_call(app, "POST", "/analyze", {"text": f"t{index}"}) for index in range(100)))
+
+    started = time.perf_counter()
+    results = asyncio.run(run())
+    elapsed = time.perf_counter() - started
+
+    assert all(status == 200 for status, _ in results)
+    assert client.max_in_flight == 100
+    assert elapsed < 2.0
+
+
+def test_asgi_batch_respects_concurrency_limit():
+    client = SlowAsyncOllamaClient(delay=0.01)
+    app = _app(client, batch_concurrency=3)
+
+    status, body = asyncio.run(_call(app, "POST", "/analyze/batch", {"texts": [f"t{index}" for index in range(10)]}))
+
+    assert status == 200
+    assert [item["rdf"] for item in body["results"]] == [f"rdf:t{index}" for index in range(10)]
+    assert client.max_in_flight == 3
+
+
+def test_asgi_streams_ndjson_and_sse():
+    app = _app(SlowAsyncOllamaClient())
+
+    async def run():
+        return (
+            await _call_raw(app, "/analyze/stream", {"text": "Alice"}),
+            await _call_raw(app, "/analyze/stream", {"text": "Alice"}, [(b"accept", b"text/event-stream")]),
+            await _call_raw(app, "/analyze/stream", {"text": "fail"}),
+            await _call_raw(app, "/analyze/stream", {}),
+        )
+
+    ndjson, sse, failed, invalid = asyncio.run(run())
+
+    assert ndjson[0]["status"] == 200
+    assert dict(ndjson[0]["headers"])[b"content-type"] == b"application/x-ndjson"
+    events = [json.loads(message["body"]) for message in ndjson[1:] if message["body"]]
+    assert events == [{"done": False, "delta": "rdf:"}, {"done": True, "rdf": "rdf:Alice", "done_reason": "stop"}]
+    assert dict(sse[0]["headers"])[b"content-type"] == b"text/event-stream"
+    assert sse[-2]["body"].startswith(b"event: done\ndata: ")
+    assert json.loads(failed[-2]["body"]) == {"done": True, "error": "Generation API error: boom", "status": 502}
+    assert invalid[0]["status"] == 400
+
+
+def test_asgi_analyze_document_merges_chunks():
+    app = _app(SlowAsyncOllamaClient(), document_chunk_tokens=64)
+    text = " ".join(f"Sentence number {index} is here." for index in range(80))
+
+    status, body = asyncio.run(_call(app, "POST", "/analyze/document", {"text": text}))
+
+    assert status == 200
+    assert body["chunks"] > 1
+    assert body["errors"] == []
@@ -0,0 +1,121 @@
+import asyncio
+import gzip
+import json
+
+from flask import Flask, Response, jsonify
+
+from src.controllers.response_encoding import (
+    GZIP,
+    ZSTD,
+    OrjsonProvider,
+    ResponseEncodingConfig,
+    compress_asgi,
+    install_response_encoding,
+    negotiate,
+)
+
+BIG = {"rdf": "ex:alice ex:knows ex:bob .\n" * 200}
+
+
+def _app(config: ResponseEncodingConfig) -> Flask:
+    app = Flask(__name__)
+    install_response_encoding(app, config)
+
+    @app.route("/big")
+    def big():
+        return jsonify(BIG)
+
+    @app.route("/small")
+    def small():
+        return jsonify({"ok": True})
+
+    @app.route("/stream")
+    def stream():
+        return Response((line for line in ["a\n"] * 2000), mimetype="text/plain")
+
+    return app
+
+
+def test_negotiate_honours_quality_and_server_preference():
+    assert negotiate("gzip, deflate, br", (ZSTD, GZIP)) == GZIP
+    assert negotiate("zstd;q=0.5, gzip", (ZSTD, GZIP)) == ZSTD
+    assert negotiate("gzip;q=0", (GZIP,)) is None
+    assert negotiate("*", (GZIP,)) == GZIP
+    assert negotiate(None, (GZIP,)) is None
+    assert negotiate("gzip", ()) is None
+
+
+def test_flask_compresses_negotiated_json_responses():
+    app = _app(ResponseEncodingConfig(compression=(GZIP,), min_bytes=100))
+
+    with app.test_client() as client:
+        compressed = client.get("/big", headers={"Accept-Encoding": "gzip"})
+        identity = client.get("/big")
+        small = client.get("/small", headers={"Accept-Encoding": "gzip"})
+        streamed = client.get("/stream", headers={"Accept-Encoding": "gzip"})
+
+    assert compressed.headers["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in compressed.headers["Vary"]
+    assert json.loads(gzip.decompress(compressed.data)) == BIG
+    assert int(compressed.headers["Content-Length"]) == len(compressed.data) < len(identity.data)
+    assert "Content-Encoding" not in identity.headers
+    assert "Content-Encoding" not in small.headers
+    assert "Content-Encoding" not in streamed.headers and streamed.data == b"a\n" * 2000
+
+
+def test_orjson_provider_round_trips_requests_and_responses():
+    app = _app(ResponseEncodingConfig(fast_json=True))
+    assert isinstance(app.json, OrjsonProvider)
+
+    @app.route("/echo", methods=["POST"])
+    def echo():
+        from flask import request
+
+        return jsonify(request.get_json())
+
+    with app.test_client() as client:
+        response = client.post("/echo", json={"text": "Zoë", "n": [1, 2]})
+
+    assert response.get_json() == {"text": "Zoë", "n": [1, 2]}
+    assert response.data == b'{"text":"Zo\xc3\xab","n":[1,2]}'
+
+
+def test_config_from_env_drops_unavailable_encodings(monkeypatch):
+    monkeypatch.setenv("RESPONSE_COMPRESSION", "br, gzip")
+    monkeypatch.setenv("FAST_JSON", "true")
+    config = ResponseEncodingConfig.from_env()
+    assert config.compression == (GZIP,)
+    assert config.fast_json
+
+
+def test_asgi_middleware_compresses_whole_bodies_only():
+    body = json.dumps(BIG).encode()
+
+    async def app(scope, receive, send):
+        headers = [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())]
+        await send({"type": "http.response.start", "status": 200, "headers": headers})
+        if scope["path"] == "/stream":
+            await send({"type": "http.response.body", "body": body, "more_body": True})
+            await send({"type": "http.response.body", "body": b""})
+        else:
+            await send({"type": "http.response.body", "body": body})
+
+    wrapped = compress_asgi(app, ResponseEncodingConfig(compression=(GZIP,)))
+
+    async def call(path):
+        sent = []
+
+        async def send(message):
+            sent.append(message)
+
+        scope = {"type": "http", "path": path, "headers": [(b"accept-encoding", b"gzip")]}
+        await wrapped(scope, None, send)
+        return dict(sent[0]["headers"]), b"".join(message.get("body", b"") for message in sent[1:])
+
+    headers, data = asyncio.run(call("/analyze"))
+    assert headers[b"content-encoding"] == b"gzip"
+    assert int(headers[b"content-length"]) == len(data)
+    assert gzip.decompress(data) == body
+
+    headers, data = asyncio.run(call("/stream"))
+    assert b"content-encoding" not in headers and data == body
@@ -0,0 +1,107 @@
+import asyncio
+import json
+from pathlib import Path
+
+from flask import Flask
+
+from src.application.services import KnowledgeGraphService
+from src.controllers.analyze_controller import create_analyze_blueprint
+from src.controllers.asgi_analyze import create_analyze_asgi_app
+from src.controllers.server_timing import ServerTimingConfig, install_server_timing
+from src.infrastructure.profiling import ProfilerConfig, SampledProfiler
+from src.infrastructure.prompt_repository import PromptRepository
+
+
+class StubPromptRepo(PromptRepository):
+    def __init__(self):
+        super().__init__(prompt_dir=Path("unused"))
+
+    def load_prompt(self, prompt_name: str) -> str:  # type: ignore[override]
+        return "Prompt ${USER_TEXT}"
+
+
+class StubOllamaClient:
+    def generate(self, system_prompt: str, prompt: str, prompt_name=None, input_text=None) -> dict:
+        return {"response": "ok", "done": True}
+
+
+class StubAsyncOllamaClient:
+    async def generate(self, system_prompt: str, prompt: str, prompt_name=None, input_text=None) -> dict:
+        return {"response": "ok", "done": True}
+
+
+def _service() -> KnowledgeGraphService:
+    return KnowledgeGraphService(
+        StubPromptRepo(),
+        default_prompt="p.txt",
+        default_system_prompt="s.txt",
+        ollama_client=StubOllamaClient(),
+        async_ollama_client=StubAsyncOllamaClient(),
+    )
+
+
+def _stages(header: str) -> dict[str, float]:
+    stages = {}
+    for part in header.split(","):
+        name, _, duration = part.strip().partition(";dur=")
+        stages[name] = float(duration)
+    return stages
+
+
+def _flask_app(config: ServerTimingConfig, profiler: SampledProfiler | None = None) -> Flask:
+    app = Flask(__name__)
+    install_server_timing(app, config, profiler)
+    app.register_blueprint(create_analyze_blueprint(_service()))
+    return app
+
+
+def test_flask_reports_stage_timings_in_header():
+    with _flask_app(ServerTimingConfig()).test_client() as client:
+        resp = client.post("/analyze", json={"text": "Alice"})
+        health = client.get("/health")
+
+    stages = _stages(resp.headers["Server-Timing"])
+    assert {"prompt", "render", "total"} <= stages.keys()
+    assert stages["total"] >= stages["prompt"] >= 0
+    assert "timings" not in resp.get_json()
+    assert _stages(health.headers["Server-Timing"]).keys() == {"total"}
+
+
+def test_flask_adds_timings_to_json_body_when_enabled():
+    with _flask_app(ServerTimingConfig(header=False, body=True)).test_client() as client:
+        resp = client.post("/analyze", json={"text": "Alice"})
+
+    assert "Server-Timing" not in resp.headers
+    data = resp.get_json()
+    assert data["rdf"] == "ok"
+    assert {"prompt", "render", "total"} <= data["timings"].keys()
+
+
+def test_flask_sampled_profiles_are_dumped(tmp_path):
+    profiler = SampledProfiler(ProfilerConfig(sample_rate=1.0, directory=tmp_path, dump_every=2))
+    with _flask_app(ServerTimingConfig(header=False), profiler).test_client() as client:
+        for _ in range(3):
+            assert client.post("/analyze", json={"text": "Alice"}).status_code == 200
+
+    assert profiler.samples == 3
+    assert len(profiler.dumps) == 1
+    profiler.close()
+    assert len(profiler.dumps) == 2
+    assert all(path.parent == tmp_path and path.stat().st_size > 0 for path in profiler.dumps)
+
+
+def test_asgi_reports_stage_timings():
+    app = create_analyze_asgi_app(_service(), server_timing=ServerTimingConfig(body=True))
+    sent = []
+
+    async def receive():
+        return {"type": "http.request", "body": json.dumps({"text": "Alice"}).encode(), "more_body": False}
+
+    async def send(message):
+        sent.append(message)
+
+    asyncio.run(app({"type": "http", "method": "POST", "path": "/analyze"}, receive, send))
+
+    headers = dict(sent[0]["headers"])
+    assert {"prompt", "render", "total"} <= _stages(headers[b"server-timing"].decode()).keys()
+    assert "total" in json.loads(sent[1]["body"])["timings"]
@@ -0,0 +1,138 @@
+import asyncio
+import json
+import threading
+from pathlib import Path
+
+import pytest
+
+httpx = pytest.importorskip("httpx")
+
+from src.infrastructure.async_ollama_client import AsyncOllamaClient
+from src.infrastructure.ollama_client import OllamaClientConfig, OllamaHttpSettings, OllamaOptions
+
+
+def _config(tmp_path: Path) -> OllamaClientConfig:
+    return OllamaClientConfig(
+        url="http://ollama.test",
+        model="llama3:8b",
+        csv_path=tmp_path / "logs.csv",
+        options=OllamaOptions(seed=7),
+        http=OllamaHttpSettings(max_retries=2, retry_backoff=0),
+    )
+
+
+def test_async_generate_retries_loading_model_and_logs(tmp_path: Path):
+    requests_seen = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests_seen.append(json.loads(request.content))
+        if len(requests_seen) == 1:
+            return httpx.Response(503, json={"error": "model is loading"})
+        return httpx.Response(200, json={"model": "llama3:8b", "response": "Generated KG", "done": True, "eval_count": 3})
+
+    async def run():
+        client = AsyncOllamaClient(
+            config=_config(tmp_path), client=httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        )
+        try:
+            return await client.generate(system_prompt="S", prompt="P", prompt_name="p.txt", input_text="T")
+        finally:
+            await client.aclose()
+
+    result = asyncio.run(run())
+
+    assert result["response"] == "Generated KG"
+    assert len(requests_seen) == 2
+    assert requests_seen[0] == {
+        "model": "llama3:8b",
+        "system": "S",
+        "prompt": "P",
+        "stream": False,
+        "options": {"seed": 7},
+    }
+    assert "Generated KG" in (tmp_path / "logs.csv").read_text(encoding="utf-8")
+
+
+def test_async_generate_raises_after_exhausting_retries(tmp_path: Path):
+    transport = httpx.MockTransport(lambda request: httpx.Response(503))
+
+    async def run():
+        client = AsyncOllamaClient(config=_config(tmp_path), client=httpx.AsyncClient(transport=transport))
+        try:
+            await client.generate(system_prompt="S", prompt="P")
+        finally:
+            await client.aclose()
+
+    with pytest.raises(httpx.HTTPStatusError):
+        asyncio.run(run())
+
+
+def test_async_generate_validates_and_logs_off_the_event_loop(tmp_path: Path):
+    class RecordingLogger:
+        def __init__(self):
+            self.threads = []
+
+        def submit(self, record):
+            self.threads.append(threading.current_thread())
+
+    logger = RecordingLogger()
+    transport = httpx.MockTransport(lambda request: httpx.Response(200, json={"response": "ex:a ex:b ex:c .", "done": True}))
+
+    async def run():
+        client = AsyncOllamaClient(
+            config=_config(tmp_path), client=httpx.AsyncClient(transport=transport), response_logger=logger
+        )
+        try:
+            return await client.generate(system_prompt="S", prompt="P"), threading.current_thread()
+        finally:
+            await client.aclose()
+
+    result, loop_thread = asyncio.run(run())
+
+    assert "rdf_validation" in result
+    assert logger.threads and logger.threads[0] is not loop_thread
+
+
+def test_async_generate_stream_yields_chunks_and_logs_final(tmp_path: Path):
+    lines = [
+        {"response": "@prefix ex: <http://example.org/> .\n", "done": False},
+        {"response": "ex:a ex:b ex:c .", "done": False},
+        {"response": "", "done": True, "done_reason": "stop"},
+    ]
+    body = "".join(json.dumps(line) + "\n" for line in lines).encode()
+    transport = httpx.MockTransport(lambda request: httpx.Response(200, content=body))
+
+    async def run():
+        client = AsyncOllamaClient(config=_config(tmp_path), client=httpx.AsyncClient(transport=transport))
+        try:
+            return [chunk async for chunk in client.generate_stream("S", "P", prompt_name="p.txt", input_text="T")]
+        finally:
+            await client.aclose()
+
+    chunks = asyncio.run(run())
+
+    assert [chunk["done"] for chunk in chunks] == [False, False, True]
+    assert chunks[-1]["response"] == "@prefix ex: <http://example.org/> .\nex:a ex:b ex:c ."
+    assert chunks[-1]["rdf_validation"]["valid"] is True
+    assert "ex:a ex:b ex:c" in (tmp_path / "logs.csv").read_text(encoding="utf-8")
+
+
+def test_async_read_timeout_is_not_retried(tmp_path: Path):
+    posts = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        posts.append(request.url.path)
+        raise httpx.ReadTimeout("timed out", request=request)
+
+    async def run():
+        client = AsyncOllamaClient(
+            config=_config(tmp_path), client=httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        )
+        try:
+            await client.generate(system_prompt="S", prompt="P")
+        finally:
+            await client.aclose()
+
+    with pytest.raises(httpx.ReadTimeout):
+        asyncio.run(run())
+    assert posts == ["/api/generate"]
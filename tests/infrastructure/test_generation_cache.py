@@ -0,0 +1,73 @@
+from pathlib import Path
+
+import pytest
+
+from src.infrastructure.generation_cache import (
+    GenerationCache,
+    GenerationCacheConfig,
+    InMemoryGenerationCache,
+    SqliteGenerationCache,
+    TieredGenerationCache,
+    build_generation_cache,
+    generation_cache_key,
+)
+
+
+def test_cache_key_is_stable_across_dict_ordering():
+    first = {"model": "llama3:8b", "prompt": "p", "options": {"seed": 1, "temperature": 0.2}}
+    second = {"options": {"temperature": 0.2, "seed": 1}, "prompt": "p", "model": "llama3:8b"}
+
+    assert generation_cache_key(first) == generation_cache_key(second)
+    assert generation_cache_key(first) != generation_cache_key({**first, "prompt": "q"})
+
+
+def test_memory_cache_evicts_least_recently_used():
+    cache = InMemoryGenerationCache(max_entries=2)
+    cache.set("a", {"response": "A"})
+    cache.set("b", {"response": "B"})
+    assert cache.get("a") == {"response": "A"}
+
+    cache.set("c", {"response": "C"})
+
+    assert cache.get("b") is None
+    assert cache.get("a") == {"response": "A"}
+    assert cache.stats()["hits"] == 2
+    assert cache.stats()["misses"] == 1
+
+
+def test_memory_cache_expires_entries(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr("src.infrastructure.generation_cache.time.monotonic", lambda: now[0])
+    cache = InMemoryGenerationCache(max_entries=10, ttl_seconds=5)
+    cache.set("a", {"response": "A"})
+
+    now[0] = 106.0
+
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_sqlite_tier_survives_restart_and_promotes_to_memory(tmp_path: Path):
+    path = tmp_path / "cache.sqlite"
+    disk = SqliteGenerationCache(path)
+    disk.set("k", {"response": "Turtle"})
+    disk.close()
+
+    cache = build_generation_cache(GenerationCacheConfig(max_entries=4, sqlite_path=path))
+    assert isinstance(cache, TieredGenerationCache)
+
+    assert cache.get("k") == {"response": "Turtle"}
+    assert cache.memory.get("k") == {"response": "Turtle"}
+    cache.close()
+
+
+def test_cache_disabled_by_default(monkeypatch):
+    monkeypatch.delenv("GENERATION_CACHE_SIZE", raising=False)
+    monkeypatch.delenv("GENERATION_CACHE_PATH", raising=False)
+
+    assert build_generation_cache(GenerationCacheConfig.from_env()) is None
+
+
+def test_generation_cache_base_is_abstract():
+    with pytest.raises(TypeError):
+        GenerationCache()
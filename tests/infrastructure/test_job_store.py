@@ -0,0 +1,124 @@
+import time
+from pathlib import Path
+
+from src.infrastructure.job_store import DONE, FAILED, QUEUED, RUNNING, JobStoreConfig, SqliteJobStore
+
+
+def _store(tmp_path: Path, lease_seconds: float = 60.0) -> SqliteJobStore:
+    return SqliteJobStore(tmp_path / "queue" / "jobs.sqlite3", lease_seconds=lease_seconds)
+
+
+def test_claim_orders_by_priority_then_submission(tmp_path: Path):
+    store = _store(tmp_path)
+    normal = store.submit([{"text": "n0"}, {"text": "n1"}], priority=1)
+    low = store.submit([{"text": "l0"}], priority=2)
+    high = store.submit([{"text": "h0"}], priority=0)
+
+    claimed = [store.claim() for _ in range(4)]
+
+    assert [(item.job_id, item.index) for item in claimed] == [(high, 0), (normal, 0), (normal, 1), (low, 0)]
+    assert claimed[0].request == {"text": "h0"} and claimed[0].attempts == 1
+    assert store.claim() is None
+
+
+def test_complete_fail_and_retry_are_reflected_in_job_status(tmp_path: Path):
+    store = _store(tmp_path)
+    job_id = store.submit([{"text": "a"}, {"text": "b"}])
+
+    first, second = store.claim(), store.claim()
+    assert store.get(job_id)["status"] == RUNNING
+    store.complete(first, {"rdf": "ok"})
+    store.fail(second, {"error": "busy"}, retry_in=0.0)
+
+    retried = store.claim()
+    assert (retried.index, retried.attempts) == (1, 2)
+    store.fail(retried, {"error": "still busy"})
+
+    job = store.get(job_id)
+    assert job["status"] == DONE
+    assert job["counts"] == {QUEUED: 0, RUNNING: 0, DONE: 1, FAILED: 1}
+    assert job["items"][0]["result"] == {"rdf": "ok"}
+    assert job["items"][1]["error"] == {"error": "still busy"}
+    assert [item["index"] for item in store.get(job_id, offset=1, limit=5)["items"]] == [1]
+    assert store.get("missing") is None
+
+
+def test_retry_waits_for_backoff(tmp_path: Path):
+    store = _store(tmp_path)
+    job_id = store.submit([{"text": "a"}])
+    submitted_at = store.get(job_id)["updated_at"]
+    time.sleep(0.01)
+    store.fail(store.claim(), {"error": "busy"}, retry_in=60.0)
+
+    assert store.claim() is None
+    assert store.queued() == 1
+    assert store.get(job_id)["updated_at"] > submitted_at
+
+
+def test_renew_extends_lease_until_item_is_taken_over(tmp_path: Path):
+    store = _store(tmp_path, lease_seconds=0.05)
+    store.submit([{"text": "a"}])
+    item = store.claim()
+
+    for _ in range(3):
+        time.sleep(0.03)
+        assert store.renew(item)
+    assert store.claim() is None
+
+    time.sleep(0.06)
+    assert store.claim().attempts == 2
+    assert not store.renew(item)
+
+
+def test_expired_lease_is_reclaimed_and_stale_outcome_ignored(tmp_path: Path):
+    store = _store(tmp_path, lease_seconds=0.01)
+    job_id = store.submit([{"text": "a"}])
+    stale = store.claim()
+    time.sleep(0.02)
+
+    current = store.claim()
+    assert current.attempts == 2
+    store.complete(stale, {"rdf": "stale"})
+    store.complete(current, {"rdf": "fresh"})
+
+    assert store.get(job_id)["items"][0]["result"] == {"rdf": "fresh"}
+
+
+def test_item_whose_lease_keeps_expiring_fails_after_max_attempts(tmp_path: Path):
+    store = _store(tmp_path, lease_seconds=0.01)
+    job_id = store.submit([{"text": "crashes"}, {"text": "fine"}], priority=0)
+    low = store.submit([{"text": "later"}], priority=2)
+
+    assert store.claim(max_attempts=2).index == 0
+    time.sleep(0.02)
+    assert store.claim(max_attempts=2).attempts == 2
+    time.sleep(0.02)
+
+    # Both attempts died without reporting back: the item fails instead of being leased a third time.
+    assert store.claim(max_attempts=2).index == 1
+    item = store.get(job_id)["items"][0]
+    assert item["status"] == FAILED and item["attempts"] == 2
+    assert item["error"]["exception"] == "LeaseExpired"
+    assert store.claim(max_attempts=2).job_id == low
+
+
+def test_jobs_survive_restart(tmp_path: Path):
+    store = _store(tmp_path)
+    job_id = store.submit([{"text": "a"}], priority=0)
+    store.close()
+
+    reopened = _store(tmp_path)
+    assert reopened.get(job_id)["status"] == QUEUED
+    assert reopened.claim().job_id == job_id
+    reopened.close()
+
+
+def test_config_from_env(monkeypatch, tmp_path: Path):
+    monkeypatch.delenv("JOBS_PATH", raising=False)
+    assert not JobStoreConfig.from_env().enabled
+
+    monkeypatch.setenv("JOBS_PATH", str(tmp_path / "jobs.sqlite3"))
+    monkeypatch.setenv("JOBS_LEASE_SECONDS", "30")
+    config = JobStoreConfig.from_env()
+    assert config.path == tmp_path / "jobs.sqlite3"
+    assert config.lease_seconds == 30.0
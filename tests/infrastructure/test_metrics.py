@@ -0,0 +1,59 @@
+from src.infrastructure.metrics import Metrics
+
+
+def test_histogram_renders_cumulative_buckets():
+    metrics = Metrics()
+    metrics.request_seconds.observe(0.004, endpoint="analyze")
+    metrics.request_seconds.observe(0.2, endpoint="analyze")
+    metrics.request_seconds.observe(500, endpoint="analyze")
+
+    text = metrics.render()
+
+    assert '# TYPE kg_http_request_duration_seconds histogram' in text
+    assert 'kg_http_request_duration_seconds_bucket{endpoint="analyze",le="0.005"} 1' in text
+    assert 'kg_http_request_duration_seconds_bucket{endpoint="analyze",le="0.25"} 2' in text
+    assert 'kg_http_request_duration_seconds_bucket{endpoint="analyze",le="+Inf"} 3' in text
+    assert 'kg_http_request_duration_seconds_count{endpoint="analyze"} 3' in text
+
+
+def test_observe_generation_exports_token_rates():
+    metrics = Metrics()
+
+    metrics.observe_generation(
+        {
+            "load_duration": 2_000_000_000,
+            "prompt_eval_count": 300,
+            "prompt_eval_duration": 1_000_000_000,
+            "eval_count": 50,
+            "eval_duration": 2_000_000_000,
+        }
+    )
+
+    assert metrics.prompt_tokens.value() == 300
+    assert metrics.generated_tokens.value() == 50
+    assert metrics.prompt_eval_rate.count() == 1
+    text = metrics.render()
+    assert "kg_ollama_eval_tokens_per_second_bucket{le=\"40\"} 1" in text
+    assert "kg_ollama_load_duration_seconds_sum 2" in text
+
+
+def test_track_request_updates_in_flight_gauge():
+    metrics = Metrics()
+
+    with metrics.track_request("analyze"):
+        assert metrics.in_flight.value(endpoint="analyze") == 1
+
+    assert metrics.in_flight.value(endpoint="analyze") == 0
+    assert metrics.request_seconds.count(endpoint="analyze") == 1
+
+
+def test_const_labels_are_added_to_every_sample():
+    metrics = Metrics({"pid": "42"})
+    metrics.errors.inc(endpoint="analyze", exception="ValueError")
+    metrics.request_seconds.observe(0.2, endpoint="analyze")
+
+    rendered = metrics.render()
+
+    assert 'kg_http_errors_total{pid="42",endpoint="analyze",exception="ValueError"} 1' in rendered
+    assert 'kg_http_request_duration_seconds_count{pid="42",endpoint="analyze"} 1' in rendered
+    assert 'kg_http_request_duration_seconds_bucket{pid="42",endpoint="analyze",le="+Inf"} 1' in rendered
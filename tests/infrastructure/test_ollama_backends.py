@@ -0,0 +1,126 @@
+import json
+import socket
+import threading
+from contextlib import ExitStack
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+import requests
+
+from src.infrastructure.ollama_backends import LATENCY, BackendPool, BackendPoolConfig
+from src.infrastructure.ollama_client import OllamaClient, OllamaClientConfig, OllamaHttpSettings, OllamaOptions
+
+
+def _start_stub(name: str, loaded_models: list[str]):
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            self._send({"models": [{"name": model, "model": model} for model in loaded_models]})
+
+        def do_POST(self):
+            self.rfile.read(int(self.headers["Content-Length"]))
+            self._send({"model": "llama3:8b", "response": name, "done": True})
+
+        def _send(self, payload):
+            body = json.dumps(payload).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}"
+
+
+def _unused_url() -> str:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return f"http://127.0.0.1:{sock.getsockname()[1]}"
+
+
+@pytest.fixture()
+def stubs():
+    cold, cold_url = _start_stub("cold", [])
+    warm, warm_url = _start_stub("warm", ["llama3:8b"])
+    yield cold_url, warm_url
+    for server in (cold, warm):
+        server.shutdown()
+        server.server_close()
+
+
+def _client(pool: BackendPool, tmp_path: Path) -> OllamaClient:
+    config = OllamaClientConfig(
+        url="unused",
+        model="llama3:8b",
+        csv_path=tmp_path / "responses.csv",
+        options=OllamaOptions(),
+        http=OllamaHttpSettings(max_retries=0, connect_timeout=1.0),
+    )
+    return OllamaClient(config, backend_pool=pool)
+
+
+def test_prefers_backend_with_model_loaded(stubs, tmp_path: Path):
+    cold_url, warm_url = stubs
+    pool = BackendPool(BackendPoolConfig(urls=(cold_url, warm_url)), model="llama3:8b")
+    pool.probe_all()
+
+    assert [backend.model_loaded for backend in pool.backends] == [False, True]
+    assert _client(pool, tmp_path).generate("system", "prompt")["response"] == "warm"
+
+
+def test_least_outstanding_spreads_concurrent_requests():
+    pool = BackendPool(BackendPoolConfig(urls=("http://a", "http://b"), prefer_loaded_model=False))
+
+    with pool.acquire() as first, pool.acquire() as second:
+        assert {first.url, second.url} == {"http://a", "http://b"}
+        with pool.acquire() as third:
+            assert third.outstanding == 2
+
+    assert [backend.outstanding for backend in pool.backends] == [0, 0]
+
+
+def test_loaded_model_does_not_take_all_traffic():
+    pool = BackendPool(BackendPoolConfig(urls=("http://a", "http://b", "http://c")), model="llama3:8b")
+    with pool.acquire():
+        pass
+    assert [backend.model_loaded for backend in pool.backends] == [True, None, None]
+
+    with ExitStack() as stack:
+        chosen = [stack.enter_context(pool.acquire()).url for _ in range(12)]
+
+    # The warm host wins ties only: load still spreads evenly across all three.
+    assert chosen[0] == "http://a"
+    assert {url: chosen.count(url) for url in set(chosen)} == {"http://a": 4, "http://b": 4, "http://c": 4}
+
+
+def test_latency_strategy_picks_faster_backend():
+    pool = BackendPool(BackendPoolConfig(urls=("http://slow", "http://fast"), strategy=LATENCY))
+    pool.mark_succeeded(pool.backends[0], latency=2.0)
+    pool.mark_succeeded(pool.backends[1], latency=0.5)
+
+    with pool.acquire() as busy:
+        assert busy.url == "http://fast"
+        # 2 x 0.5s queued on the fast host still beats 1 x 2.0s on the slow one.
+        with pool.acquire() as second:
+            assert second.url == "http://fast"
+
+
+def test_failed_backend_is_ejected_and_traffic_moves(stubs, tmp_path: Path):
+    _, warm_url = stubs
+    dead_url = _unused_url()
+    pool = BackendPool(BackendPoolConfig(urls=(dead_url, warm_url), eject_seconds=60.0, prefer_loaded_model=False))
+    client = _client(pool, tmp_path)
+
+    with pytest.raises(requests.ConnectionError):
+        client.generate("system", "prompt")
+    assert pool.backends[0].ejected_until > 0
+    assert client.generate("system", "prompt")["response"] == "warm"
+    assert pool.metrics.backend_up.value(backend=dead_url) == 0
+
+    pool.probe_all()
+    assert pool.backends[0].failures == 2
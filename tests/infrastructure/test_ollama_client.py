@@ -1,8 +1,14 @@
 import csv
 import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
 
-from src.infrastructure.ollama_client import OllamaClient, OllamaClientConfig, OllamaOptions
+import pytest
+import requests
+
+from src.infrastructure.ollama_client import OllamaClient, OllamaClientConfig, OllamaHttpSettings, OllamaOptions
 
 
 def test_generate_sends_payload_and_logs_csv(monkeypatch, tmp_path: Path):
@@ -30,9 +36,10 @@ def test_generate_sends_payload_and_logs_csv(monkeypatch, tmp_path: Path):
         ],
     }
 
-    def fake_post(url, json=None, **kwargs):  # type: ignore[override]
+    def fake_post(self, url, json=None, **kwargs):  # type: ignore[override]
         captured["url"] = url
         captured["json"] = json
+        captured["timeout"] = kwargs.get("timeout")
 
         class DummyResponse:
             def raise_for_status(self) -> None:
@@ -43,10 +50,10 @@ def test_generate_sends_payload_and_logs_csv(monkeypatch, tmp_path: Path):
 
         return DummyResponse()
 
-    monkeypatch.setattr("src.infrastructure.ollama_client.requests.post", fake_post)
+    monkeypatch.setattr("src.infrastructure.ollama_client.requests.Session.post", fake_post)
 
     config = OllamaClientConfig(
-        url="http://localhost:11434/api/generate",
+        url="http://localhost:11434",
         model="llama3:8b",
         csv_path=tmp_path / "logs.csv",
         options=OllamaOptions(seed=7, temperature=0.4, top_k=5, stop="STOP"),
@@ -60,6 +67,7 @@ def test_generate_sends_payload_and_logs_csv(monkeypatch, tmp_path: Path):
     assert captured["json"]["system"] == "Resolved system"
     assert captured["json"]["prompt"] == "User text"
     assert captured["json"]["stream"] is False
+    assert captured["timeout"] == (5.0, 300.0)
     assert captured["json"]["options"] == {"seed": 7, "temperature": 0.4, "top_k": 5, "stop": "STOP"}
     assert result == sample_response
 
@@ -73,4 +81,176 @@ def test_generate_sends_payload_and_logs_csv(monkeypatch, tmp_path: Path):
     assert rows[0]["response"] == "Generated KG"
     assert json.loads(rows[0]["logprobs"])[0]["token"] == "A"
     assert rows[0]["rdf_valid"] == "False"
-    assert rows[0]["rdf_note"] == "Response not recognized as RDF/Turtle."
+    assert rows[0]["rdf_note"] == "line 1, column 1: unexpected 'Generated', expected statement"
+    assert rows[0]["rdf_triples"] == "0"
+
+
+def test_http_settings_from_env(monkeypatch):
+    monkeypatch.setenv("OLLAMA_POOL_SIZE", "32")
+    monkeypatch.setenv("OLLAMA_CONNECT_TIMEOUT", "1.5")
+    monkeypatch.setenv("OLLAMA_READ_TIMEOUT", "")
+    monkeypatch.setenv("OLLAMA_MAX_RETRIES", "5")
+    monkeypatch.setenv("OLLAMA_RETRY_BACKOFF", "not-a-number")
+
+    settings = OllamaHttpSettings.from_env()
+
+    assert settings.pool_size == 32
+    assert settings.timeout == (1.5, 300.0)
+    assert settings.max_retries == 5
+    assert settings.retry_backoff == 0.5
+
+
+def test_client_reuses_pooled_session_with_retries(tmp_path: Path):
+    config = OllamaClientConfig(
+        url="http://localhost:11434",
+        model="llama3:8b",
+        csv_path=tmp_path / "logs.csv",
+        options=OllamaOptions(),
+        http=OllamaHttpSettings(pool_size=4, max_retries=2),
+    )
+    client = OllamaClient(config=config)
+
+    adapter = client.session.get_adapter("http://localhost:11434/api/generate")
+    assert adapter._pool_maxsize == 4
+    assert adapter.max_retries.total == 2
+    assert 503 in adapter.max_retries.status_forcelist
+    assert "POST" in adapter.max_retries.allowed_methods
+    client.close()
+
+
+def test_read_timeout_is_not_retried(tmp_path: Path):
+    posts = []
+
+    class SlowHandler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            posts.append(self.path)
+            time.sleep(0.5)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), SlowHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    config = OllamaClientConfig(
+        url=f"http://127.0.0.1:{server.server_port}",
+        model="llama3:8b",
+        csv_path=tmp_path / "logs.csv",
+        options=OllamaOptions(),
+        http=OllamaHttpSettings(read_timeout=0.1, max_retries=3, retry_backoff=0),
+    )
+    client = OllamaClient(config=config)
+    try:
+        with pytest.raises(requests.RequestException):
+            client.generate(system_prompt="S", prompt="P")
+    finally:
+        client.close()
+        server.shutdown()
+        server.server_close()
+
+    assert posts == ["/api/generate"]
+
+
+def test_generate_stream_yields_chunks_and_logs_final_once(monkeypatch, tmp_path: Path):
+    captured: dict = {}
+    lines = [
+        b'{"model":"llama3:8b","response":"@prefix ex: ","done":false}',
+        b"",
+        b'{"model":"llama3:8b","response":"<http://example.org/> .","done":false}',
+        b'{"model":"llama3:8b","response":"","done":true,"done_reason":"stop","eval_count":9}',
+    ]
+
+    def fake_post(self, url, json=None, **kwargs):  # type: ignore[override]
+        captured["json"] = json
+        captured["stream"] = kwargs.get("stream")
+
+        class DummyResponse:
+            closed = False
+
+            def raise_for_status(self) -> None:
+                return None
+
+            def iter_lines(self):
+                return iter(lines)
+
+            def close(self) -> None:
+                captured["closed"] = True
+
+        return DummyResponse()
+
+    monkeypatch.setattr("src.infrastructure.ollama_client.requests.Session.post", fake_post)
+    config = OllamaClientConfig(
+        url="http://localhost:11434",
+        model="llama3:8b",
+        csv_path=tmp_path / "logs.csv",
+        options=OllamaOptions(),
+    )
+    client = OllamaClient(config=config)
+
+    chunks = list(client.generate_stream(system_prompt="S", prompt="P", prompt_name="p.txt", input_text="T"))
+
+    assert captured["json"]["stream"] is True
+    assert captured["stream"] is True
+    assert captured["closed"] is True
+    assert [chunk["done"] for chunk in chunks] == [False, False, True]
+    assert chunks[-1]["response"] == "@prefix ex: <http://example.org/> ."
+    with (tmp_path / "logs.csv").open(encoding="utf-8", newline="") as fp:
+        rows = list(csv.DictReader(fp))
+    assert len(rows) == 1
+    assert rows[0]["response"] == "@prefix ex: <http://example.org/> ."
+    assert rows[0]["eval_count"] == "9"
+    assert chunks[-1]["rdf_validation"]["error"] is None
+    assert rows[0]["rdf_note"] == "no triples found"
+
+
+def test_keep_alive_is_sent_and_parsed_from_env(monkeypatch, tmp_path: Path):
+    from src.infrastructure.ollama_client import build_generate_payload, keep_alive_from_env
+
+    config = OllamaClientConfig(
+        url="http://localhost:11434", model="m", csv_path=tmp_path / "l.csv", options=OllamaOptions(), keep_alive="30m"
+    )
+    assert build_generate_payload(config, "S", "P")["keep_alive"] == "30m"
+
+    monkeypatch.setenv("OLLAMA_KEEP_ALIVE", "-1")
+    assert keep_alive_from_env() == -1
+    monkeypatch.setenv("OLLAMA_KEEP_ALIVE", "1h")
+    assert keep_alive_from_env() == "1h"
+    monkeypatch.setenv("OLLAMA_KEEP_ALIVE", "")
+    assert keep_alive_from_env() is None
+
+
+def test_warm_up_evaluates_prefix_without_logging(monkeypatch, tmp_path: Path):
+    posts = []
+
+    def fake_post(self, url, json=None, **kwargs):  # type: ignore[override]
+        posts.append((url, json))
+        if "down" in url:
+            raise requests.ConnectionError("refused")
+
+        class DummyResponse:
+            def raise_for_status(self) -> None:
+                return None
+
+            def json(self):
+                return {"response": "x", "done": True, "load_duration": 2_000_000_000, "prompt_eval_duration": 500_000_000}
+
+        return DummyResponse()
+
+    monkeypatch.setattr("src.infrastructure.ollama_client.requests.Session.post", fake_post)
+    from src.infrastructure.ollama_backends import BackendPool, BackendPoolConfig
+
+    config = OllamaClientConfig(
+        url="http://unused", model="m", csv_path=tmp_path / "logs.csv", options=OllamaOptions(num_ctx=4096)
+    )
+    pool = BackendPool(BackendPoolConfig(urls=("http://up:11434", "http://down:11434")), model="m")
+    client = OllamaClient(config=config, backend_pool=pool)
+
+    results = client.warm_up("System", "Prefix")
+
+    assert [url for url, _ in posts] == ["http://up:11434/api/generate", "http://down:11434/api/generate"]
+    assert posts[0][1]["options"] == {"num_ctx": 4096, "num_predict": 1}
+    assert posts[0][1]["system"] == "System" and posts[0][1]["prompt"] == "Prefix"
+    assert results[0]["prompt_eval_duration"] == 500_000_000
+    assert "refused" in results[1]["error"]
+    assert "phase=\"warmup\"" in client.metrics.render()
+    client.response_logger.close()
+    assert not (tmp_path / "logs.csv").exists()
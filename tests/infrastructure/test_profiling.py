@@ -0,0 +1,81 @@
+import pstats
+import threading
+
+from src.infrastructure.profiling import ProfilerConfig, SampledProfiler
+from src.infrastructure.timing import StageTimings, collect, stage
+
+
+def test_stages_accumulate_only_while_collecting():
+    with stage("ignored"):
+        pass
+
+    with collect() as timings:
+        with stage("prompt"):
+            pass
+        with stage("prompt"):
+            pass
+        with stage("ollama"):
+            pass
+
+    assert list(timings.stages) == ["prompt", "ollama"]
+    with stage("late"):
+        pass
+    assert "late" not in timings.stages
+
+
+def test_server_timing_formats_milliseconds():
+    timings = StageTimings()
+    timings.add("prompt", 0.0012)
+    timings.add("total", 0.25)
+
+    assert timings.server_timing() == "prompt;dur=1.200, total;dur=250.000"
+    assert timings.to_dict() == {"prompt": 1.2, "total": 250.0}
+
+
+def test_profiler_samples_share_of_requests_and_merges_dumps(tmp_path):
+    profiler = SampledProfiler(ProfilerConfig(sample_rate=0.5, directory=tmp_path, dump_every=1000), seed=7)
+    sampled = 0
+    for _ in range(200):
+        with profiler.maybe_profile() as profiled:
+            sum(range(100))
+        sampled += profiled
+
+    assert profiler.samples == sampled
+    assert 60 < sampled < 140
+    path = profiler.dump()
+    assert path is not None and profiler.dump() is None
+    assert pstats.Stats(str(path)).total_calls > 0
+
+
+def test_profiler_skips_overlapping_samples(tmp_path):
+    profiler = SampledProfiler(ProfilerConfig(sample_rate=1.0, directory=tmp_path))
+    inside, release = threading.Event(), threading.Event()
+    outcomes = []
+
+    def hold():
+        with profiler.maybe_profile() as profiled:
+            outcomes.append(profiled)
+            inside.set()
+            release.wait(5)
+
+    thread = threading.Thread(target=hold)
+    thread.start()
+    inside.wait(5)
+    with profiler.maybe_profile() as profiled:
+        outcomes.append(profiled)
+    release.set()
+    thread.join()
+
+    assert outcomes == [True, False]
+    assert profiler.samples == 1
+
+
+def test_profiler_disabled_by_default(monkeypatch):
+    monkeypatch.delenv("PROFILE_SAMPLE_RATE", raising=False)
+    profiler = SampledProfiler(ProfilerConfig.from_env())
+
+    with profiler.maybe_profile() as profiled:
+        pass
+
+    assert profiled is False
+    assert profiler.dump() is None
@@ -0,0 +1,110 @@
+import os
+from pathlib import Path
+
+import pytest
+
+from src.infrastructure.prompt_repository import PromptRepository
+
+
+@pytest.fixture()
+def prompt_dir(tmp_path: Path) -> Path:
+    root = tmp_path / "prompt"
+    (root / "prompts").mkdir(parents=True)
+    (root / "system").mkdir()
+    (root / "prompts" / "few-shot.txt").write_text("Few shot ${USER_TEXT}\n", encoding="utf-8")
+    (root / "system" / "kg.txt").write_text("System", encoding="utf-8")
+    return root
+
+
+def test_load_prompt_is_served_from_cache_until_file_changes(prompt_dir: Path):
+    repo = PromptRepository(prompt_dir=prompt_dir)
+    path = prompt_dir / "prompts" / "few-shot.txt"
+
+    assert repo.load_prompt("prompts/few-shot.txt") == "Few shot ${USER_TEXT}"
+
+    path.write_text("Updated ${USER_TEXT} template", encoding="utf-8")
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    assert repo.load_prompt("prompts/few-shot.txt") == "Updated ${USER_TEXT} template"
+
+
+def test_preload_without_auto_reload_avoids_filesystem(prompt_dir: Path, monkeypatch: pytest.MonkeyPatch):
+    repo = PromptRepository(prompt_dir=prompt_dir, auto_reload=False)
+
+    assert repo.preload() == 2
+
+    def fail(*args, **kwargs):
+        raise AssertionError("filesystem accessed on the hot path")
+
+    monkeypatch.setattr(Path, "stat", fail)
+    monkeypatch.setattr(Path, "read_text", fail)
+    assert repo.load_prompt("system/kg.txt") == "System"
+    assert repo.load_prompt("prompts/few-shot.txt") == "Few shot ${USER_TEXT}"
+
+
+def test_reload_drops_cached_prompt(prompt_dir: Path):
+    repo = PromptRepository(prompt_dir=prompt_dir, auto_reload=False)
+    repo.load_prompt("system/kg.txt")
+    (prompt_dir / "system" / "kg.txt").write_text("New system", encoding="utf-8")
+
+    assert repo.load_prompt("system/kg.txt") == "System"
+    repo.reload("system/kg.txt")
+    assert repo.load_prompt("system/kg.txt") == "New system"
+
+
+def test_load_prompt_rejects_traversal(prompt_dir: Path):
+    repo = PromptRepository(prompt_dir=prompt_dir)
+
+    with pytest.raises(ValueError):
+        repo.load_prompt("../outside.txt")
+    with pytest.raises(FileNotFoundError):
+        repo.load_prompt("prompts/missing.txt")
+
+
+def test_load_examples_indexes_bank_and_reindexes_on_change(prompt_dir: Path):
+    bank = prompt_dir / "examples"
+    bank.mkdir()
+    (bank / "01-turing.txt").write_text("Text: Alan Turing at Bletchley Park.\nRDF:\nex:a ex:b ex:c .\n", encoding="utf-8")
+    repo = PromptRepository(prompt_dir=prompt_dir)
+
+    first = repo.load_examples("examples")
+    assert [example.name for example in first.examples] == ["examples/01-turing.txt"]
+    assert repo.load_examples("examples") is first
+
+    (bank / "02-curie.txt").write_text("Text: Marie Curie in Paris.\nRDF:\nex:d ex:e ex:f .\n", encoding="utf-8")
+    assert len(repo.load_examples("examples")) == 2
+
+    with pytest.raises(FileNotFoundError):
+        repo.load_examples("missing")
+    with pytest.raises(ValueError):
+        repo.load_examples("../outside")
+
+
+def test_load_examples_revalidates_by_directory_stat_only(prompt_dir: Path):
+    bank = prompt_dir / "examples"
+    bank.mkdir()
+    example = bank / "01-turing.txt"
+    example.write_text("Text: Alan Turing at Bletchley Park.\nRDF:\nex:a ex:b ex:c .\n", encoding="utf-8")
+    repo = PromptRepository(prompt_dir=prompt_dir)
+    first = repo.load_examples("examples")
+
+    # An in-place edit leaves the directory untouched, so the cached index is served without per-file stats.
+    example.write_text("Text: Marie Curie in Paris.\nRDF:\nex:d ex:e ex:f .\n", encoding="utf-8")
+    assert repo.load_examples("examples") is first
+
+    repo.reload("examples/01-turing.txt")
+    assert repo.load_examples("examples").examples[0].text == "Marie Curie in Paris."
+
+
+def test_preload_skips_hidden_and_undecodable_files(prompt_dir: Path, caplog: pytest.LogCaptureFixture):
+    (prompt_dir / "system" / ".kg.txt.swp").write_bytes(b"\xff\xfe\x00binary")
+    (prompt_dir / "prompts" / "logo.png").write_bytes(b"\x89PNG\r\n\x1a\n\xff")
+    repo = PromptRepository(prompt_dir=prompt_dir, auto_reload=False)
+
+    with caplog.at_level("WARNING"):
+        assert repo.preload() == 2
+
+    assert "prompts/logo.png" in caplog.text
+    assert ".swp" not in caplog.text
+    assert repo.load_prompt("system/kg.txt") == "System"
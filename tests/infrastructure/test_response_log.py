@@ -0,0 +1,124 @@
+import csv
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from src.infrastructure.response_log import (
+    DROP,
+    AsyncResponseLogger,
+    CsvResponseSink,
+    ResponseLogConfig,
+    ResponseSink,
+    build_log_record,
+)
+
+
+def _record(index: int) -> dict:
+    return build_log_record(
+        {"model": "llama3:8b", "response": f"line one\nline, two {index}", "logprobs": [{"token": "A"}]},
+        prompt_name="prompt.txt",
+        input_text=f"text {index}",
+    )
+
+
+def test_async_logger_writes_header_once_and_keeps_rows_intact(tmp_path: Path):
+    path = tmp_path / "logs" / "responses.csv"
+    logger = AsyncResponseLogger(CsvResponseSink(path), batch_size=16, flush_interval=0.05)
+
+    def produce(offset: int) -> None:
+        for index in range(offset, offset + 50):
+            logger.submit(_record(index))
+
+    threads = [threading.Thread(target=produce, args=(offset,)) for offset in (0, 50, 100, 150)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    logger.close()
+
+    with path.open(encoding="utf-8", newline="") as fp:
+        rows = list(csv.DictReader(fp))
+    assert len(rows) == 200
+    assert sorted(int(row["input_text"].split()[1]) for row in rows) == list(range(200))
+    assert all(row["response"].startswith("line one\nline, two") for row in rows)
+    assert rows[0]["logprobs"] == '[{"token": "A"}]'
+    assert path.read_text(encoding="utf-8").count("prompt_name,input_text") == 1
+
+
+def test_async_logger_drops_when_queue_full(tmp_path: Path):
+    release = threading.Event()
+
+    class SlowSink(CsvResponseSink):
+        def write_batch(self, records):
+            release.wait()
+            super().write_batch(records)
+
+    logger = AsyncResponseLogger(
+        SlowSink(tmp_path / "responses.csv"), queue_size=2, batch_size=1, flush_interval=0.01, full_policy=DROP
+    )
+    accepted = [logger.submit(_record(index)) for index in range(10)]
+    release.set()
+    logger.close()
+
+    assert accepted.count(False) == logger.dropped
+    assert logger.dropped >= 7
+
+
+def test_async_logger_batches_a_trickle_of_records(tmp_path: Path):
+    batches = []
+
+    class RecordingSink(CsvResponseSink):
+        def write_batch(self, records):
+            batches.append(len(records))
+            super().write_batch(records)
+
+    logger = AsyncResponseLogger(RecordingSink(tmp_path / "responses.csv"), batch_size=100, flush_interval=5.0)
+    for index in range(5):
+        logger.submit(_record(index))
+        time.sleep(0.02)
+    logger.flush()
+    logger.close()
+
+    assert batches == [5]
+
+
+def test_response_log_config_from_env(monkeypatch):
+    monkeypatch.setenv("RESPONSE_LOG_ASYNC", "false")
+    monkeypatch.setenv("RESPONSE_LOG_QUEUE_SIZE", "5")
+    monkeypatch.setenv("RESPONSE_LOG_FULL_POLICY", "Drop")
+
+    config = ResponseLogConfig.from_env()
+
+    assert config.async_enabled is False
+    assert config.queue_size == 5
+    assert config.full_policy == DROP
+
+
+def test_async_logger_writes_every_accepted_record_when_closed_concurrently(tmp_path: Path):
+    path = tmp_path / "responses.csv"
+    logger = AsyncResponseLogger(CsvResponseSink(path), batch_size=8, flush_interval=0.01)
+    accepted = []
+
+    def produce(offset: int) -> None:
+        for index in range(offset, offset + 200):
+            if logger.submit(_record(index)):
+                accepted.append(index)
+
+    threads = [threading.Thread(target=produce, args=(offset,)) for offset in (0, 200, 400)]
+    for thread in threads:
+        thread.start()
+    logger.close()
+    for thread in threads:
+        thread.join()
+    logger.flush()  # would hang if a record had been queued behind the stop marker
+
+    with path.open(encoding="utf-8", newline="") as fp:
+        written = sorted(int(row["input_text"].split()[1]) for row in csv.DictReader(fp))
+    assert written == sorted(accepted)
+
+
+def test_response_sink_requires_write_batch():
+    with pytest.raises(TypeError):
+        ResponseSink()
@@ -0,0 +1,105 @@
+import gzip
+import json
+import time
+from pathlib import Path
+
+import pytest
+
+from src.infrastructure.response_log import AsyncResponseLogger, CsvResponseSink, build_log_record
+from src.infrastructure.response_sinks import (
+    PARQUET_ROTATE_BYTES,
+    PARQUET_ROTATE_SECONDS,
+    ROTATE_BYTES,
+    ROTATE_SECONDS,
+    JsonlResponseSink,
+    ResponseSinkConfig,
+    build_response_sink,
+)
+
+
+def _record(index: int) -> dict:
+    return build_log_record(
+        {"model": "llama3:8b", "response": "x" * 100, "eval_count": index, "total_duration": 1000 + index},
+        prompt_name="prompt.txt",
+        input_text=f"text {index}",
+    )
+
+
+def test_jsonl_sink_rotates_and_compresses_segments(tmp_path: Path):
+    sink = JsonlResponseSink(tmp_path, max_bytes=500, max_seconds=0)
+    for index in range(10):
+        sink.write_batch([_record(index)])
+    sink.close()
+
+    segments = sorted(tmp_path.glob("responses-*.jsonl.gz"))
+    assert len(segments) > 1
+    assert not list(tmp_path.glob("*.jsonl"))
+    rows = [json.loads(line) for segment in segments for line in gzip.open(segment, "rt", encoding="utf-8")]
+    assert sorted(row["eval_count"] for row in rows) == list(range(10))
+    assert isinstance(rows[0]["total_duration"], int)
+    assert rows[0]["rdf_valid"] is False
+
+
+def test_parquet_sink_stores_typed_columns(tmp_path: Path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    from src.infrastructure.response_sinks import ParquetResponseSink
+
+    sink = ParquetResponseSink(tmp_path)
+    sink.write_batch([_record(1), _record(2)])
+    sink.write_batch([_record(3)])
+    sink.close()
+
+    (segment,) = tmp_path.glob("responses-*.parquet")
+    table = pq.read_table(segment, columns=["eval_count", "total_duration", "rdf_valid"])
+    assert table.column("eval_count").to_pylist() == [1, 2, 3]
+    assert str(table.schema.field("total_duration").type) == "int64"
+    assert table.column("rdf_valid").to_pylist() == [False, False, False]
+
+
+def test_idle_parquet_segment_is_finished_once_it_is_old_enough(tmp_path: Path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    from src.infrastructure.response_sinks import ParquetResponseSink
+
+    logger = AsyncResponseLogger(ParquetResponseSink(tmp_path, max_seconds=0.1), flush_interval=0.02)
+    try:
+        logger.submit(_record(1))
+        logger.flush()
+        deadline = time.monotonic() + 2.0
+        # No further traffic: the writer's idle tick must close the segment and write its footer.
+        while time.monotonic() < deadline:
+            segments = list(tmp_path.glob("responses-*.parquet"))
+            try:
+                table = pq.read_table(segments[0])
+                break
+            except Exception:
+                time.sleep(0.02)
+        else:
+            pytest.fail("idle segment never became readable")
+        assert table.column("eval_count").to_pylist() == [1]
+    finally:
+        logger.close()
+
+
+def test_build_response_sink_defaults_to_csv(tmp_path: Path):
+    assert isinstance(build_response_sink(ResponseSinkConfig(), tmp_path / "log.csv"), CsvResponseSink)
+    sink = build_response_sink(ResponseSinkConfig(format="jsonl"), tmp_path / "log.csv")
+    assert isinstance(sink, JsonlResponseSink)
+    assert sink.directory == tmp_path / "responses"
+    with pytest.raises(ValueError):
+        build_response_sink(ResponseSinkConfig(format="xml"), tmp_path / "log.csv")
+
+
+def test_rotation_defaults_depend_on_format_unless_configured():
+    assert ResponseSinkConfig().rotation(100, 10) == {"max_bytes": 100, "max_seconds": 10}
+    assert ResponseSinkConfig(rotate_seconds=0).rotation(100, 10) == {"max_bytes": 100, "max_seconds": 0}
+
+    jsonl = build_response_sink(ResponseSinkConfig(format="jsonl"), Path("unused/log.csv"))
+    assert (jsonl.max_bytes, jsonl.max_seconds) == (ROTATE_BYTES, ROTATE_SECONDS)
+
+
+def test_parquet_segments_rotate_sooner_by_default():
+    pytest.importorskip("pyarrow")
+
+    parquet = build_response_sink(ResponseSinkConfig(format="parquet"), Path("unused/log.csv"))
+
+    assert (parquet.max_bytes, parquet.max_seconds) == (PARQUET_ROTATE_BYTES, PARQUET_ROTATE_SECONDS)
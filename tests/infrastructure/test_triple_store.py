@@ -0,0 +1,60 @@
+from pathlib import Path
+
+from src.domain.triples import parse_turtle
+from src.infrastructure.triple_store import SqliteTripleStore, TripleStoreConfig, as_term
+
+ALICE = "@prefix ex: <http://example.org/> .\nex:Alice ex:knows ex:Bob ; ex:age 42 .\n"
+BOB = "@prefix ex: <http://example.org/> .\nex:Bob ex:knows ex:Carol .\nex:Alice ex:knows ex:Bob .\n"
+BLANK = "@prefix ex: <http://example.org/> .\nex:Alice ex:address [ ex:city \"Paris\" ] .\n"
+
+
+def _store(tmp_path: Path) -> SqliteTripleStore:
+    return SqliteTripleStore(tmp_path / "graph" / "triples.sqlite")
+
+
+def test_add_deduplicates_across_graphs_and_restarts(tmp_path: Path):
+    store = _store(tmp_path)
+    assert store.add(parse_turtle(ALICE)[0]) == 2
+    assert store.add(parse_turtle(BOB)[0]) == 1
+    store.close()
+
+    reopened = _store(tmp_path)
+    assert reopened.add(parse_turtle(ALICE)[0]) == 0
+    assert reopened.stats() == {"triples": 3, "terms": 6}
+    reopened.close()
+
+
+def test_find_and_describe_use_any_position(tmp_path: Path):
+    store = _store(tmp_path)
+    store.add(parse_turtle(ALICE)[0])
+    store.add(parse_turtle(BOB)[0])
+    bob = as_term("http://example.org/Bob")
+
+    assert store.find(subject=bob) == [(bob, "<http://example.org/knows>", "<http://example.org/Carol>")]
+    assert len(store.find(predicate="<http://example.org/knows>")) == 2
+    assert store.find(obj='"42"^^<http://www.w3.org/2001/XMLSchema#integer>')[0][0] == "<http://example.org/Alice>"
+    assert len(store.describe(bob)) == 2
+    assert store.describe("<http://example.org/Nobody>") == []
+    assert len(store.find(limit=1, offset=2)) == 1
+
+
+def test_blank_nodes_are_scoped_to_their_source(tmp_path: Path):
+    store = _store(tmp_path)
+    graph = parse_turtle(BLANK)[0]
+
+    assert store.add(graph, source=BLANK) == 2
+    assert store.add(graph, source=BLANK) == 0
+    assert store.add(graph, source=BLANK + "# another generation\n") == 2
+
+    exported = list(store.export())
+    assert len(exported) == 4
+    assert all(line.endswith(" .\n") for line in exported)
+    assert len({line.split()[0] for line in exported if line.startswith("_:")}) == 2
+
+
+def test_config_from_env(monkeypatch, tmp_path: Path):
+    monkeypatch.delenv("TRIPLE_STORE_PATH", raising=False)
+    assert not TripleStoreConfig.from_env().enabled
+
+    monkeypatch.setenv("TRIPLE_STORE_PATH", str(tmp_path / "kg.sqlite"))
+    assert TripleStoreConfig.from_env().path == tmp_path / "kg.sqlite"
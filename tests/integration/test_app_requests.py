@@ -26,7 +26,7 @@ def ollama_mock(monkeypatch: pytest.MonkeyPatch, tmp_path: Path):
         "logprobs": [],
     }
 
-    def fake_post(url, json=None, **kwargs):  # type: ignore[override]
+    def fake_post(self, url, json=None, **kwargs):  # type: ignore[override]
         captured["url"] = url
         captured["payload"] = json
 
@@ -41,7 +41,7 @@ def ollama_mock(monkeypatch: pytest.MonkeyPatch, tmp_path: Path):
 
     csv_path = tmp_path / "ollama.csv"
     monkeypatch.setenv("OLLAMA_CSV_PATH", str(csv_path))
-    monkeypatch.setattr("src.infrastructure.ollama_client.requests.post", fake_post)
+    monkeypatch.setattr("src.infrastructure.ollama_client.requests.Session.post", fake_post)
 
     return captured, sample_response, csv_path
 
@@ -57,9 +57,9 @@ def client(monkeypatch: pytest.MonkeyPatch, tmp_path: Path, ollama_mock):
 
     repo_original_init = prompt_repository.PromptRepository.__init__
 
-    def _init(self, prompt_dir=None, _default_dir=prompt_dir):
+    def _init(self, prompt_dir=None, _default_dir=prompt_dir, **kwargs):
         chosen_dir = _default_dir if prompt_dir is None else prompt_dir
-        repo_original_init(self, prompt_dir=chosen_dir)
+        repo_original_init(self, prompt_dir=chosen_dir, **kwargs)
 
     monkeypatch.setattr(prompt_repository.PromptRepository, "__init__", _init)
     monkeypatch.setenv("DEFAULT_PROMPT_NAME", "test_prompt.txt")
@@ -86,6 +86,7 @@ def test_analyze_request_flow(client):
 
     assert "Integration text" in capture["payload"]["prompt"]
 
+    client.application.extensions["response_logger"].flush()
     assert csv_path.exists()
     rows = csv_path.read_text(encoding="utf-8").splitlines()
     header, first = rows[0], rows[1]
@@ -102,9 +103,9 @@ def test_analyze_placeholder_is_replaced(ollama_mock, monkeypatch: pytest.Monkey
 
     repo_original_init = prompt_repository.PromptRepository.__init__
 
-    def _init(self, prompt_dir=None, _default_dir=prompt_dir):
+    def _init(self, prompt_dir=None, _default_dir=prompt_dir, **kwargs):
         chosen_dir = _default_dir if prompt_dir is None else prompt_dir
-        repo_original_init(self, prompt_dir=chosen_dir)
+        repo_original_init(self, prompt_dir=chosen_dir, **kwargs)
 
     monkeypatch.setattr(prompt_repository.PromptRepository, "__init__", _init)
     monkeypatch.setenv("DEFAULT_PROMPT_NAME", "test_prompt.txt")
@@ -121,3 +122,51 @@ def test_analyze_placeholder_is_replaced(ollama_mock, monkeypatch: pytest.Monkey
         assert resp.status_code == 200
         assert resp.get_json()["text"] == "XYZ"
         assert resp.get_json()["rdf"] == "Generated KG"
+
+
+def test_metrics_endpoint_reports_request_and_model_timings(client):
+    client, capture, sample_response, csv_path = client
+    payload = {"text": "Integration text", "prompt_name": "test_prompt.txt", "system_prompt_name": "system_prompt.txt"}
+    client.post("/analyze", data=json.dumps(payload), content_type="application/json")
+    client.post("/analyze", data=json.dumps({"text": "x", "prompt_name": "missing.txt"}), content_type="application/json")
+
+    resp = client.get("/metrics")
+
+    assert resp.status_code == 200
+    assert resp.content_type.startswith("text/plain; version=0.0.4")
+    body = resp.get_data(as_text=True)
+    assert 'kg_http_request_duration_seconds_count{endpoint="analyze"} 2' in body
+    assert 'kg_ollama_request_duration_seconds_count{mode="sync"} 1' in body
+    assert "kg_prompt_load_duration_seconds_count" in body
+    assert "kg_response_log_duration_seconds_count 1" in body
+    assert "kg_ollama_eval_tokens_total 13" in body
+    assert 'kg_http_errors_total{endpoint="analyze",exception="FileNotFoundError"} 1' in body
+
+
+def test_shared_prompt_repository_and_shutdown_flush(ollama_mock, monkeypatch: pytest.MonkeyPatch, tmp_path: Path):
+    from src.app import shutdown_app
+    from src.infrastructure.prompt_repository import PromptRepository
+
+    captured, sample_response, csv_path = ollama_mock
+    prompt_dir = tmp_path / "prompt3"
+    prompt_dir.mkdir()
+    (prompt_dir / "test_prompt.txt").write_text("Shared ${USER_TEXT}", encoding="utf-8")
+    (prompt_dir / "system_prompt.txt").write_text("System prompt content", encoding="utf-8")
+    monkeypatch.setenv("DEFAULT_PROMPT_NAME", "test_prompt.txt")
+    monkeypatch.setenv("DEFAULT_SYSTEM_PROMPT_NAME", "system_prompt.txt")
+    # Long enough that only the shutdown drain can have written the row.
+    monkeypatch.setenv("RESPONSE_LOG_FLUSH_INTERVAL", "60")
+
+    repository = PromptRepository(prompt_dir=prompt_dir)
+    repository.preload()
+    app = create_app(prompt_repository=repository, warm_up=False)
+    with app.test_client() as client:
+        resp = client.post("/analyze", json={"text": "XYZ"})
+
+    assert resp.status_code == 200
+    assert captured["payload"]["prompt"] == "Shared XYZ"
+    assert app.extensions["kg_service"].prompt_repository is repository
+
+    shutdown_app(app)
+    shutdown_app(app)
+    assert len(csv_path.read_text(encoding="utf-8").splitlines()) == 2
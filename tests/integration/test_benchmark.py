@@ -0,0 +1,59 @@
+import json
+
+import pytest
+import requests
+
+from src.benchmark.mock_ollama import MockOllamaConfig, MockOllamaServer
+from src.benchmark.runner import build_benchmark_app, build_scenarios, compare, percentile, run_scenario
+
+
+def test_percentile_interpolates_between_ranks():
+    assert percentile([], 0.5) == 0.0
+    assert percentile([4.0, 1.0, 3.0, 2.0], 0.5) == 2.5
+    assert percentile([1.0, 2.0, 3.0], 0.99) == pytest.approx(2.98)
+
+
+def test_mock_server_streams_and_injects_errors():
+    with MockOllamaServer(MockOllamaConfig(latency=0.0, error_rate=0.5, seed=1)) as server:
+        statuses = [
+            requests.post(f"{server.url}/api/generate", json={"prompt": "p", "stream": False}, timeout=5).status_code
+            for _ in range(20)
+        ]
+        assert 500 in statuses and 200 in statuses
+        assert server.errors == statuses.count(500)
+
+    with MockOllamaServer(MockOllamaConfig(latency=0.0, response="ex:a ex:b ex:c .")) as server:
+        response = requests.post(f"{server.url}/api/generate", json={"prompt": "p"}, stream=True, timeout=5)
+        chunks = [json.loads(line) for line in response.iter_lines() if line]
+
+    assert "".join(chunk["response"] for chunk in chunks) == "ex:a ex:b ex:c ."
+    assert chunks[-1]["done"] is True and chunks[-1]["eval_count"] == 4
+
+
+def test_scenarios_run_against_the_app(monkeypatch, tmp_path):
+    # Recorded first so teardown undoes the values build_benchmark_app assigns.
+    for name in ("OLLAMA_API_URL", "OLLAMA_API_URLS", "OLLAMA_CSV_PATH"):
+        monkeypatch.setenv(name, "")
+    monkeypatch.setenv("OLLAMA_MODEL", "mock")
+    monkeypatch.setenv("DEFAULT_PROMPT_NAME", "prompts/few-shot.txt")
+    monkeypatch.setenv("DEFAULT_SYSTEM_PROMPT_NAME", "system/knowledge_graph.txt")
+    monkeypatch.setattr("src.app.load_dotenv", lambda: None)
+    scenarios = build_scenarios(requests=4, concurrency=2, batch_size=2)
+
+    with MockOllamaServer(MockOllamaConfig(latency=0.0)) as server:
+        app = build_benchmark_app(server.url, tmp_path)
+        results = {name: run_scenario(app, scenarios[name]) for name in ("concurrent", "batch", "stream")}
+        app.extensions["response_logger"].close()
+
+    assert all(result["errors"] == 0 for result in results.values())
+    assert results["concurrent"]["requests"] == 4
+    assert results["batch"]["items_per_second"] == pytest.approx(results["batch"]["requests_per_second"] * 2, rel=0.01)
+    assert results["stream"]["latency_ms"]["p50"] > 0
+
+
+def test_compare_flags_latency_and_throughput_regressions():
+    def report(p95, rps):
+        return {"scenarios": [{"scenario": "single", "latency_ms": {"p95": p95}, "requests_per_second": rps}]}
+
+    assert compare(report(10.5, 99), report(10.0, 100)) == []
+    assert len(compare(report(20.0, 50), report(10.0, 100))) == 2
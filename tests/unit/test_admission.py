@@ -0,0 +1,120 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from src.application.admission import (
+    DEADLINE,
+    HIGH,
+    LOW,
+    QUEUE_FULL,
+    AdmissionConfig,
+    AdmissionController,
+    AdmissionRejected,
+)
+
+
+def _wait_until(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "condition not reached"
+        time.sleep(0.005)
+
+
+def _queue_in_thread(admission, order, name, priority=None):
+    def run():
+        with admission.slot(priority, admission.deadline_for(2.0)):
+            order.append(name)
+
+    thread = threading.Thread(target=run)
+    thread.start()
+    return thread
+
+
+def test_rejects_with_429_when_queue_is_full_and_503_on_deadline():
+    admission = AdmissionController(AdmissionConfig(max_in_flight=1, queue_size=1, queue_timeout=0.05))
+    admission.acquire()
+
+    waiter = _queue_in_thread(admission, [], "queued")
+    _wait_until(lambda: admission.queued == 1)
+    with pytest.raises(AdmissionRejected) as full:
+        admission.acquire()
+    assert full.value.reason == QUEUE_FULL
+    assert full.value.status == 429
+    assert full.value.retry_after >= 1
+
+    admission.release()
+    waiter.join()
+    admission.acquire()
+    with pytest.raises(AdmissionRejected) as expired:
+        admission.acquire(deadline=admission.deadline_for())
+    assert expired.value.reason == DEADLINE
+    assert expired.value.status == 503
+    assert admission.queued == 0
+    assert admission.metrics.admission_rejected.value(reason=QUEUE_FULL) == 1
+
+
+def test_released_slots_go_to_higher_priority_first():
+    admission = AdmissionController(AdmissionConfig(max_in_flight=1, queue_size=4))
+    admission.acquire()
+    order: list[str] = []
+
+    threads = [_queue_in_thread(admission, order, "low", LOW)]
+    _wait_until(lambda: admission.queued == 1)
+    threads.append(_queue_in_thread(admission, order, "normal"))
+    _wait_until(lambda: admission.queued == 2)
+    threads.append(_queue_in_thread(admission, order, "high", HIGH))
+    _wait_until(lambda: admission.queued == 3)
+
+    admission.release()
+    for thread in threads:
+        thread.join()
+
+    assert order == ["high", "normal", "low"]
+    assert admission.in_flight == 0
+
+
+def test_high_priority_displaces_low_priority_waiter_when_full():
+    admission = AdmissionController(AdmissionConfig(max_in_flight=1, queue_size=1))
+    admission.acquire()
+    errors: list[AdmissionRejected] = []
+
+    def low():
+        try:
+            admission.acquire(LOW, admission.deadline_for(2.0))
+        except AdmissionRejected as exc:
+            errors.append(exc)
+
+    thread = threading.Thread(target=low)
+    thread.start()
+    _wait_until(lambda: admission.queued == 1)
+    high = _queue_in_thread(admission, [], "high", HIGH)
+    thread.join()
+
+    assert [error.reason for error in errors] == [QUEUE_FULL]
+    admission.release()
+    high.join()
+    assert admission.in_flight == 0
+
+
+def test_async_waiters_share_slots_with_threads():
+    admission = AdmissionController(AdmissionConfig(max_in_flight=1, queue_size=2))
+
+    async def main():
+        admission.acquire()
+        waiter = asyncio.ensure_future(admission.acquire_async(deadline=admission.deadline_for(2.0)))
+        await asyncio.sleep(0.01)
+        assert admission.queued == 1
+        threading.Timer(0.01, admission.release).start()
+        await waiter
+        assert admission.in_flight == 1
+
+        cancelled = asyncio.ensure_future(admission.acquire_async())
+        await asyncio.sleep(0.01)
+        cancelled.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await cancelled
+        assert admission.queued == 0
+
+    asyncio.run(main())
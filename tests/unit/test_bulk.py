@@ -0,0 +1,100 @@
+import io
+import json
+from pathlib import Path
+
+from src.application.services import KnowledgeGraphService
+from src.bulk import JSONL, TEXT, Checkpoint, read_items, run_bulk
+from src.infrastructure.prompt_repository import PromptRepository
+
+
+class DummyPromptRepo(PromptRepository):
+    def __init__(self):
+        super().__init__(prompt_dir=Path("unused"))
+
+    def load_prompt(self, prompt_name: str) -> str:  # type: ignore[override]
+        if prompt_name == "missing.txt":
+            raise FileNotFoundError("not found")
+        return "Prompt ${USER_TEXT}"
+
+
+class EchoOllamaClient:
+    def __init__(self, fail_on: str | None = None):
+        self.fail_on = fail_on
+        self.seen: list[str] = []
+
+    def generate(self, system_prompt: str, prompt: str, prompt_name=None, input_text=None) -> dict:
+        if input_text == self.fail_on:
+            raise KeyboardInterrupt
+        self.seen.append(input_text)
+        return {"response": f"rdf:{input_text}", "done": True}
+
+
+def _service(client: EchoOllamaClient) -> KnowledgeGraphService:
+    return KnowledgeGraphService(
+        DummyPromptRepo(), default_prompt="p.txt", default_system_prompt="s.txt", ollama_client=client
+    )
+
+
+def test_read_items_parses_jsonl_and_reports_bad_records():
+    stream = io.StringIO('{"id": 7, "text": "Alice"}\n\nnot json\n{"id": 8}\n{"text": "Bob", "prompt_name": "x.txt"}\n')
+
+    items = list(read_items(stream, JSONL))
+
+    assert [item.error is None for item in items] == [True, False, False, True]
+    assert items[0].record_id == 7 and items[0].request.text == "Alice"
+    assert items[2].record_id == 8
+    assert items[3].request.prompt_name == "x.txt"
+    assert [item.request.text for item in read_items(io.StringIO("a\nb\n"), TEXT)] == ["a", "b"]
+
+
+def test_run_bulk_writes_results_in_input_order(tmp_path: Path):
+    output = tmp_path / "out.jsonl"
+    lines = "".join(json.dumps({"text": f"t{index}"}) + "\n" for index in range(25))
+    items = read_items(io.StringIO(lines + '{"text": "bad", "prompt_name": "missing.txt"}\n'), JSONL)
+
+    summary = run_bulk(_service(EchoOllamaClient()), items, output, workers=4, checkpoint_every=5)
+
+    records = [json.loads(line) for line in output.read_text(encoding="utf-8").splitlines()]
+    assert [record["index"] for record in records] == list(range(26))
+    assert records[3] == {"index": 3, "text": "t3", "rdf": "rdf:t3"}
+    assert records[-1]["error_type"] == "FileNotFoundError"
+    assert summary.processed == 26 and summary.failed == 1
+    assert Checkpoint.load(tmp_path / "out.jsonl.checkpoint").completed == 26
+
+
+def test_run_bulk_resumes_from_checkpoint_without_duplicates(tmp_path: Path):
+    output = tmp_path / "out.jsonl"
+    lines = "".join(f"sentence {index}\n" for index in range(20))
+
+    crashing = EchoOllamaClient(fail_on="sentence 13")
+    try:
+        run_bulk(_service(crashing), read_items(io.StringIO(lines), TEXT), output, workers=1, checkpoint_every=4)
+    except KeyboardInterrupt:
+        pass
+    assert Checkpoint.load(tmp_path / "out.jsonl.checkpoint").completed == 12
+
+    resumed = EchoOllamaClient()
+    summary = run_bulk(_service(resumed), read_items(io.StringIO(lines), TEXT), output, workers=3, checkpoint_every=4)
+
+    assert resumed.seen[0] == "sentence 12"
+    assert summary.skipped == 12 and summary.processed == 8
+    records = [json.loads(line) for line in output.read_text(encoding="utf-8").splitlines()]
+    assert [record["index"] for record in records] == list(range(20))
+
+
+def test_run_bulk_returns_the_requested_output_format(tmp_path: Path):
+    class TurtleOllamaClient(EchoOllamaClient):
+        def generate(self, system_prompt: str, prompt: str, prompt_name=None, input_text=None) -> dict:
+            return {"response": "<http://example.org/a> <http://example.org/p> <http://example.org/b> .", "done": True}
+
+    output = tmp_path / "out.jsonl"
+    lines = '{"text": "a"}\n{"text": "b", "output": "ntriples"}\n{"text": "c", "output": "xml"}\n'
+    items = read_items(io.StringIO(lines), JSONL, defaults={"output": "triples"})
+
+    summary = run_bulk(_service(TurtleOllamaClient()), items, output, workers=2)
+
+    triples, ntriples, invalid = [json.loads(line) for line in output.read_text(encoding="utf-8").splitlines()]
+    assert summary.failed == 1
+    assert "rdf" not in triples and triples["triples"] == [[0, 1, 2]]
+    assert ntriples["rdf"] == "<http://example.org/a> <http://example.org/p> <http://example.org/b> .\n"
+    assert invalid["error"].startswith("Field 'output' must be one of")
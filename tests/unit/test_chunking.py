@@ -0,0 +1,73 @@
+from src.domain.chunking import estimate_tokens, split_into_chunks
+from src.domain.turtle_merge import merge_turtle
+
+
+def test_split_into_chunks_keeps_short_text_whole():
+    assert split_into_chunks("Alice knows Bob.", max_tokens=100) == ["Alice knows Bob."]
+
+
+def test_split_into_chunks_packs_paragraphs_then_sentences():
+    text = "Alice knows Bob.\n\nBob knows Carol.\n\n" + " ".join(f"Sentence number {i} is here." for i in range(10))
+
+    chunks = split_into_chunks(text, max_tokens=20)
+
+    assert all(estimate_tokens(chunk) <= 20 for chunk in chunks)
+    assert chunks[0].startswith("Alice knows Bob.\n\nBob knows Carol.\n\n")
+    assert all(chunk.endswith(".") for chunk in chunks)
+    assert " ".join(" ".join(chunks).split()) == " ".join(text.split())
+
+
+def test_split_into_chunks_splits_oversized_sentence_on_words():
+    chunks = split_into_chunks("word " * 100, max_tokens=10)
+
+    assert len(chunks) > 1
+    assert all(len(chunk) <= 40 for chunk in chunks)
+
+
+def test_merge_turtle_dedupes_prefixes_and_combines_subjects():
+    first = """```turtle
+@prefix ex: <http://example.org/> .
+ex:Alice ex:knows ex:Bob ; ex:name "Alice. Smith" .
+```"""
+    second = """@prefix ex: <http://example.org/> .
+@prefix foaf: <http://xmlns.com/foaf/0.1/> .
+# chunk two
+ex:Alice ex:knows ex:Bob, ex:Carol .
+ex:Carol a foaf:Person ."""
+
+    merged = merge_turtle([first, second])
+
+    assert merged.count("@prefix ex:") == 1
+    assert "@prefix foaf: <http://xmlns.com/foaf/0.1/> ." in merged
+    assert "ex:Alice ex:knows ex:Bob, ex:Carol ;\n    ex:name \"Alice. Smith\" ." in merged
+    assert "ex:Carol a foaf:Person ." in merged
+    assert "#" not in merged
+
+
+def test_merge_turtle_keeps_blank_nodes_of_different_chunks_apart():
+    first = '@prefix schema: <https://schema.org/> .\n_:b1 schema:name "Bob" .\nex:x schema:knows _:b1 .'
+    second = '@prefix schema: <https://schema.org/> .\n_:b1 schema:name "Carol" ; schema:age "_:b1" .'
+
+    merged = merge_turtle([first, second])
+
+    assert '_:c0_b1 schema:name "Bob" .' in merged
+    assert "ex:x schema:knows _:c0_b1 ." in merged
+    assert '_:c1_b1 schema:name "Carol" ;\n    schema:age "_:b1" .' in merged
+
+
+def test_merge_turtle_renames_prefix_rebound_by_later_chunk():
+    first = "@prefix ex: <http://example.org/> .\nex:Alice ex:knows ex:Bob ."
+    second = (
+        "@prefix ex: <http://other.org/> .\n@prefix ex1: <http://third.org/> .\n"
+        'ex:Alice ex1:age "30"^^ex:years .'
+    )
+    third = "PREFIX o: <http://other.org/>\no:Alice o:likes ex:Tea ."
+
+    merged = merge_turtle([first, second, third])
+
+    assert "@prefix ex: <http://example.org/> ." in merged
+    assert "@prefix ex2: <http://other.org/> ." in merged
+    assert "@prefix ex1: <http://third.org/> ." in merged
+    assert "ex:Alice ex:knows ex:Bob ." in merged
+    assert 'ex2:Alice ex1:age "30"^^ex2:years' in merged
+    assert "o:Alice o:likes ex:Tea ." in merged
@@ -0,0 +1,61 @@
+import pytest
+
+from src.domain.few_shot import FewShotExample, FewShotIndex
+
+EXAMPLES = [
+    FewShotExample.parse("turing.txt", "Text: Alan Turing worked at Bletchley Park.\nRDF:\nex:alan_turing ex:worksFor ex:bletchley_park ."),
+    FewShotExample.parse("curie.txt", "Text: Marie Curie discovered radium in Paris.\nRDF:\nex:marie_curie ex:discovered ex:radium ."),
+    FewShotExample.parse("company.txt", "Text: Grace Lee founded Ada Systems in Berlin.\nRDF:\n" + "ex:ada ex:founder ex:grace_lee .\n" * 20),
+]
+
+
+def test_parse_uses_the_input_side_for_similarity():
+    example = EXAMPLES[0]
+
+    assert example.text == "Alan Turing worked at Bletchley Park."
+    assert example.content.endswith("ex:bletchley_park .")
+    assert example.tokens > 0
+
+
+def test_select_ranks_by_similarity_and_respects_k():
+    index = FewShotIndex(EXAMPLES)
+
+    assert [example.name for example in index.select("Pierre Curie lived in Paris.", k=1, token_budget=1000)] == ["curie.txt"]
+    assert len(index.select("Pierre Curie lived in Paris.", k=2, token_budget=1000)) == 2
+
+
+def test_select_skips_examples_that_do_not_fit_the_budget():
+    index = FewShotIndex(EXAMPLES)
+    budget = EXAMPLES[0].tokens + EXAMPLES[1].tokens
+
+    chosen = index.select("Grace Lee founded a company in Berlin.", k=3, token_budget=budget)
+
+    assert "company.txt" not in [example.name for example in chosen]
+    assert sum(example.tokens for example in chosen) <= budget
+    assert index.select("anything", k=3, token_budget=0) == []
+
+
+def test_render_puts_the_closest_example_last_and_falls_back_to_bank_order():
+    index = FewShotIndex(EXAMPLES)
+
+    rendered = index.render("Marie Curie moved to Paris.", k=2, token_budget=1000)
+    assert rendered.endswith(EXAMPLES[1].content)
+    # No overlap with any example: still demonstrate the format with the first ones.
+    assert [example.name for example in index.select("zzz", k=2, token_budget=1000)] == ["turing.txt", "curie.txt"]
+
+
+def test_numpy_and_pure_python_scoring_agree_on_near_ties():
+    pytest.importorskip("numpy")
+    bank = EXAMPLES + [
+        # Same input side as curie.txt in another word order: an exact tie that summation order must not break.
+        FewShotExample.parse("curie-2.txt", "Text: In Paris Marie Curie discovered radium.\nRDF:\nex:m ex:d ex:r ."),
+        FewShotExample.parse("turing-2.txt", "Text: Alan Turing worked at Bletchley Park in 1940.\nRDF:\nex:a ex:w ex:b ."),
+    ]
+    vectorised = FewShotIndex(bank)
+    pure = FewShotIndex(bank)
+    pure._matrix = None
+    assert vectorised._matrix is not None
+
+    for query in ["Marie Curie discovered radium in Paris.", "Alan Turing worked at Bletchley Park.", "Paris 1940"]:
+        assert vectorised.scores(query) == pure.scores(query)
+        assert vectorised.select(query, k=5, token_budget=1000) == pure.select(query, k=5, token_budget=1000)
@@ -0,0 +1,91 @@
+import threading
+import time
+from pathlib import Path
+
+import requests
+
+from src.application.jobs import JobWorkerConfig, JobWorkerPool, submit_job
+from src.domain.models import AnalyzeRequest, AnalyzeResponse
+from src.infrastructure.job_store import SqliteJobStore
+from src.infrastructure.metrics import Metrics
+
+
+class FlakyService:
+    def __init__(self, failures: int):
+        self.failures = failures
+        self.metrics = Metrics()
+        self.requests = []
+
+    def analyze(self, request):
+        self.requests.append(request)
+        if len(self.requests) <= self.failures:
+            raise requests.ConnectionError("backend down")
+        return AnalyzeResponse(
+            prompt_name="p",
+            system_prompt_name="s",
+            prompt="",
+            input_text=request.text,
+            message_for_model="",
+            generation={"response": "ok"},
+        )
+
+
+def _pool(tmp_path: Path, service, max_attempts: int = 3) -> tuple[JobWorkerPool, SqliteJobStore]:
+    store = SqliteJobStore(tmp_path / "jobs.sqlite3")
+    config = JobWorkerConfig(workers=0, max_attempts=max_attempts, retry_backoff=0.0)
+    return JobWorkerPool(service, store, config), store
+
+
+def test_worker_retries_transient_errors_then_succeeds(tmp_path: Path):
+    service = FlakyService(failures=2)
+    pool, store = _pool(tmp_path, service)
+    job_id = submit_job(store, [AnalyzeRequest(text="Alice", prompt_name=None)], priority="high")
+
+    while pool.run_once():
+        pass
+
+    item = store.get(job_id)["items"][0]
+    assert item["status"] == "done" and item["attempts"] == 3
+    assert item["result"] == {"text": "Alice", "rdf": "ok"}
+    assert service.requests[0].priority == "high" and service.requests[0].queue_timeout is None
+    assert service.metrics.job_items.value(outcome="retried") == 2
+    assert service.metrics.job_items.value(outcome="done") == 1
+
+
+def test_worker_gives_up_after_max_attempts(tmp_path: Path):
+    service = FlakyService(failures=10)
+    pool, store = _pool(tmp_path, service, max_attempts=2)
+    job_id = submit_job(store, [AnalyzeRequest(text="Alice", prompt_name=None)])
+
+    while pool.run_once():
+        pass
+
+    job = store.get(job_id)
+    assert job["status"] == "failed"
+    assert job["items"][0]["error"] == {"error": "backend down", "exception": "ConnectionError"}
+    assert len(service.requests) == 2
+
+
+def test_worker_renews_the_lease_of_a_slow_item(tmp_path: Path):
+    class SlowService(FlakyService):
+        def analyze(self, request):
+            time.sleep(0.3)
+            return super().analyze(request)
+
+    store = SqliteJobStore(tmp_path / "jobs.sqlite3", lease_seconds=0.1)
+    pool = JobWorkerPool(SlowService(failures=0), store, JobWorkerConfig(workers=0))
+    job_id = submit_job(store, [AnalyzeRequest(text="Alice", prompt_name=None)])
+    second = SqliteJobStore(tmp_path / "jobs.sqlite3", lease_seconds=0.1)
+    claimed_elsewhere = []
+
+    item = store.claim()
+    worker = threading.Thread(target=pool._process, args=(item,))
+    worker.start()
+    while worker.is_alive():
+        claimed_elsewhere.append(second.claim())
+        time.sleep(0.02)
+    worker.join()
+
+    assert claimed_elsewhere and not any(claimed_elsewhere)
+    assert store.get(job_id)["items"][0]["status"] == "done"
+    second.close()
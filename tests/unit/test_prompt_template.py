@@ -0,0 +1,25 @@
+from src.domain.prompt_template import PromptTemplate
+
+
+def test_compile_splits_static_segments_and_placeholders():
+    template = PromptTemplate.compile("Domain: ${DOMAIN}\nText: ${USER_TEXT}\nRDF:")
+
+    assert template.segments == ("Domain: ", "\nText: ", "\nRDF:")
+    assert template.placeholders == ("DOMAIN", "USER_TEXT")
+    assert template.names == frozenset({"DOMAIN", "USER_TEXT"})
+    assert template.static_length == len("Domain: \nText: \nRDF:")
+
+
+def test_render_fills_named_placeholders_and_keeps_unknown_ones():
+    template = PromptTemplate.compile("${USER_TEXT} in ${DOMAIN}, again ${USER_TEXT} ${OTHER}")
+
+    rendered = template.render({"USER_TEXT": "Alice", "DOMAIN": "science"})
+
+    assert rendered == "Alice in science, again Alice ${OTHER}"
+
+
+def test_template_without_placeholders_renders_source():
+    template = PromptTemplate.compile("Static prompt")
+
+    assert template.render({"USER_TEXT": "ignored"}) == "Static prompt"
+    assert template.static_token_estimate == 4
@@ -0,0 +1,60 @@
+import sys
+from pathlib import Path
+
+from src.serve import ServeConfig, _config, _parse_args, main, preload_prompts
+
+
+def test_config_from_env_and_cli_overrides(monkeypatch):
+    monkeypatch.setenv("SERVE_BIND", "0.0.0.0:8080")
+    monkeypatch.setenv("SERVE_WORKERS", "4")
+    monkeypatch.setenv("SERVE_THREADS", "0")
+    monkeypatch.setenv("SERVE_PRELOAD", "false")
+    monkeypatch.delenv("OLLAMA_WARM_UP", raising=False)
+
+    config = ServeConfig.from_env()
+    assert (config.bind, config.workers, config.threads, config.preload, config.warm_up) == (
+        "0.0.0.0:8080",
+        4,
+        1,
+        False,
+        False,
+    )
+
+    overridden = _config(_parse_args(["--workers", "2", "--graceful-timeout", "5", "--warm-up"]))
+    assert (overridden.bind, overridden.workers, overridden.graceful_timeout, overridden.warm_up) == (
+        "0.0.0.0:8080",
+        2,
+        5,
+        True,
+    )
+    options = overridden.gunicorn_options()
+    assert options["worker_class"] == "gthread" and options["bind"] == ["0.0.0.0:8080"]
+
+
+def test_preload_prompts_compiles_default_template_and_examples(monkeypatch, tmp_path: Path):
+    from src.infrastructure import prompt_repository
+
+    (tmp_path / "prompts").mkdir()
+    (tmp_path / "prompts" / "p.txt").write_text("Intro ${EXAMPLES} ${USER_TEXT}", encoding="utf-8")
+    (tmp_path / "examples").mkdir()
+    (tmp_path / "examples" / "01.txt").write_text("Text: Alice.\nRDF:\nex:a .", encoding="utf-8")
+    original_init = prompt_repository.PromptRepository.__init__
+    monkeypatch.setattr(
+        prompt_repository.PromptRepository,
+        "__init__",
+        lambda self, prompt_dir=None, **kwargs: original_init(self, prompt_dir=prompt_dir or tmp_path, **kwargs),
+    )
+    monkeypatch.setenv("DEFAULT_PROMPT_NAME", "prompts/p.txt")
+    monkeypatch.delenv("FEW_SHOT_BANK", raising=False)
+
+    repository = preload_prompts()
+
+    assert "prompts/p.txt" in repository._templates
+    assert len(repository._example_banks["examples"].index) == 1
+
+
+def test_main_explains_missing_gunicorn(monkeypatch, capsys):
+    monkeypatch.setitem(sys.modules, "gunicorn", None)
+
+    assert main([]) == 2
+    assert "pip install gunicorn" in capsys.readouterr().err
@@ -4,6 +4,7 @@ import pytest
 
 from src.application.services import KnowledgeGraphService
 from src.domain.models import AnalyzeRequest
+from src.infrastructure.generation_cache import InMemoryGenerationCache
 from src.infrastructure.prompt_repository import PromptRepository
 
 
@@ -38,3 +39,216 @@ def test_analyze_replaces_placeholder():
     response = service.analyze(request)
 
     assert response.message_for_model == "Prompt with Hello inside"
+
+
+def test_analyze_without_prompt_keeps_only_the_result():
+    repo = DummyPromptRepo(prompt_text="Prompt with ${USER_TEXT} inside")
+    service = KnowledgeGraphService(repo, default_prompt="example.txt", default_system_prompt="system.txt")
+    request = AnalyzeRequest(text="Hello", prompt_name="example.txt", include_prompt=False)
+
+    response = service.analyze(request)
+
+    assert response.prompt is None and response.message_for_model is None
+    assert response.input_text == "Hello"
+    assert not hasattr(response, "__dict__")
+
+
+class CountingOllamaClient:
+    def __init__(self):
+        self.calls = 0
+
+    def build_payload(self, system_prompt: str, prompt: str) -> dict:
+        return {"model": "llama3:8b", "system": system_prompt, "prompt": prompt, "stream": False}
+
+    def generate(self, system_prompt: str, prompt: str, prompt_name=None, input_text=None) -> dict:
+        self.calls += 1
+        return {"response": f"turtle-{self.calls}", "done": True}
+
+
+def test_analyze_serves_repeated_payload_from_cache():
+    repo = DummyPromptRepo(prompt_text="Prompt ${USER_TEXT}")
+    ollama = CountingOllamaClient()
+    service = KnowledgeGraphService(
+        repo,
+        default_prompt="example.txt",
+        default_system_prompt="system.txt",
+        ollama_client=ollama,
+        generation_cache=InMemoryGenerationCache(max_entries=8),
+    )
+
+    first = service.analyze(AnalyzeRequest(text="Alice knows Bob.", prompt_name=None))
+    second = service.analyze(AnalyzeRequest(text="Alice knows Bob.", prompt_name=None))
+    third = service.analyze(AnalyzeRequest(text="Bob knows Carol.", prompt_name=None))
+
+    assert ollama.calls == 2
+    assert first.generation == second.generation == {"response": "turtle-1", "done": True}
+    assert third.generation["response"] == "turtle-2"
+    assert service.get_cache_stats()["hits"] == 1
+
+
+def test_analyze_fills_named_variables():
+    repo = DummyPromptRepo(prompt_text="Domain ${DOMAIN}: ${USER_TEXT}")
+    service = KnowledgeGraphService(repo, default_prompt="example.txt", default_system_prompt="system.txt")
+    request = AnalyzeRequest(text="Hello", prompt_name="example.txt", variables={"DOMAIN": "biology"})
+
+    response = service.analyze(request)
+
+    assert response.message_for_model == "Domain biology: Hello"
+
+
+class ChunkTurtleClient(CountingOllamaClient):
+    def generate(self, system_prompt: str, prompt: str, prompt_name=None, input_text=None) -> dict:
+        self.calls += 1
+        if "fail" in input_text:
+            raise RuntimeError("model unavailable")
+        subject = input_text.split()[0]
+        return {"response": f"@prefix ex: <http://example.org/> .\nex:{subject} ex:mentioned true .", "done": True}
+
+
+def test_analyze_document_extracts_chunks_and_merges_turtle():
+    repo = DummyPromptRepo(prompt_text="Extract: ${USER_TEXT}")
+    ollama = ChunkTurtleClient()
+    service = KnowledgeGraphService(
+        repo,
+        default_prompt="example.txt",
+        default_system_prompt="system.txt",
+        ollama_client=ollama,
+        document_chunk_tokens=8,
+    )
+    text = "Alice met Bob in Paris.\n\nBob met Carol there.\n\nfail to parse this one."
+
+    response = service.analyze_document(AnalyzeRequest(text=text, prompt_name=None))
+
+    assert len(response.chunks) == 3
+    assert ollama.calls == 3
+    assert [result.index for result in response.errors] == [2]
+    assert response.rdf.count("@prefix ex:") == 1
+    assert "ex:Alice ex:mentioned true ." in response.rdf
+    assert "ex:Bob ex:mentioned true ." in response.rdf
+
+
+def test_chunk_token_budget_leaves_room_for_prompts_and_output():
+    repo = DummyPromptRepo(prompt_text="x" * 400 + "${USER_TEXT}")
+    service = KnowledgeGraphService(
+        repo, default_prompt="example.txt", default_system_prompt="system.txt", context_tokens=1000
+    )
+
+    budget = service.chunk_token_budget(AnalyzeRequest(text="", prompt_name=None))
+
+    # 100 static template tokens plus the same 412-char text read back as the system prompt.
+    assert budget == (1000 - 100 - 103) // 3
+
+
+def test_analyze_merges_valid_generations_into_triple_store(tmp_path):
+    from src.infrastructure.triple_store import SqliteTripleStore
+
+    class TurtleClient(CountingOllamaClient):
+        def generate(self, system_prompt, prompt, prompt_name=None, input_text=None):
+            self.calls += 1
+            if input_text == "broken":
+                return {"response": "ex:a ex:b", "done": True}
+            return {"response": f"@prefix ex: <http://example.org/> .\nex:{input_text} ex:seen ex:x .\n", "done": True}
+
+    store = SqliteTripleStore(tmp_path / "kg.sqlite")
+    service = KnowledgeGraphService(
+        DummyPromptRepo(prompt_text="Prompt ${USER_TEXT}"),
+        default_prompt="example.txt",
+        default_system_prompt="system.txt",
+        ollama_client=TurtleClient(),
+        triple_store=store,
+    )
+
+    for text in ("a", "b", "a", "broken"):
+        response = service.analyze(AnalyzeRequest(text=text, prompt_name=None))
+        assert response.triples is None
+
+    assert store.stats()["triples"] == 2
+    assert service.metrics.triples_stored.value(outcome="inserted") == 2
+    assert service.metrics.triples_stored.value(outcome="duplicate") == 1
+    assert service.metrics.graphs_skipped.value() == 1
+
+
+def test_analyze_fills_examples_placeholder_from_bank(tmp_path):
+    root = tmp_path / "prompt"
+    (root / "examples").mkdir(parents=True)
+    (root / "examples" / "a.txt").write_text("Text: Alan Turing at Bletchley Park.\nRDF:\nex:turing .", encoding="utf-8")
+    (root / "examples" / "b.txt").write_text("Text: Marie Curie in Paris.\nRDF:\nex:curie .", encoding="utf-8")
+    (root / "p.txt").write_text("Examples:\n${EXAMPLES}\nText: ${USER_TEXT}", encoding="utf-8")
+    (root / "s.txt").write_text("System", encoding="utf-8")
+    service = KnowledgeGraphService(
+        PromptRepository(prompt_dir=root),
+        default_prompt="p.txt",
+        default_system_prompt="s.txt",
+        few_shot_bank="examples",
+        few_shot_k=1,
+    )
+
+    response = service.analyze(AnalyzeRequest(text="Pierre Curie in Paris.", prompt_name=None))
+    overridden = service.analyze(
+        AnalyzeRequest(text="Pierre Curie in Paris.", prompt_name=None, variables={"EXAMPLES": "none"})
+    )
+
+    assert response.message_for_model == "Examples:\nText: Marie Curie in Paris.\nRDF:\nex:curie .\nText: Pierre Curie in Paris."
+    assert overridden.message_for_model.startswith("Examples:\nnone\n")
+
+
+def test_stable_prefix_is_shared_by_every_message_and_warmed_up():
+    class WarmingClient:
+        def __init__(self):
+            self.warmed = []
+
+        def warm_up(self, system_prompt, prompt):
+            self.warmed.append((system_prompt, prompt))
+            return [{"url": "http://ollama"}]
+
+    for prompt_text in ("Static header\nText: ${USER_TEXT}\nRDF:", "Static header without placeholder"):
+        client = WarmingClient()
+        service = KnowledgeGraphService(
+            DummyPromptRepo(prompt_text=prompt_text),
+            default_prompt="example.txt",
+            default_system_prompt="system.txt",
+            ollama_client=client,
+        )
+        prefix = service.stable_prefix()
+
+        first = service._prepare(AnalyzeRequest(text="Alice knows Bob.", prompt_name=None)).message
+        second = service._prepare(AnalyzeRequest(text="Carol", prompt_name=None)).message
+
+        assert prefix.startswith("Static header")
+        assert first.startswith(prefix) and second.startswith(prefix)
+        assert service.warm_up() == [{"url": "http://ollama"}]
+        assert client.warmed == [(prompt_text, prefix)]
+
+
+def test_identical_concurrent_requests_share_one_generation():
+    import threading
+
+    from src.application.single_flight import SingleFlight
+
+    class BlockingClient(CountingOllamaClient):
+        def __init__(self):
+            super().__init__()
+            self.release = threading.Event()
+
+        def generate(self, system_prompt, prompt, prompt_name=None, input_text=None):
+            self.release.wait(5)
+            return super().generate(system_prompt, prompt, prompt_name, input_text)
+
+    client = BlockingClient()
+    service = KnowledgeGraphService(
+        DummyPromptRepo(prompt_text="Prompt ${USER_TEXT}"),
+        default_prompt="example.txt",
+        default_system_prompt="system.txt",
+        ollama_client=client,
+        single_flight=SingleFlight(),
+        batch_concurrency=4,
+    )
+    threading.Timer(0.1, client.release.set).start()
+
+    results = service.analyze_batch([AnalyzeRequest(text="Same text.", prompt_name=None)] * 4)
+
+    assert client.calls == 1
+    assert {result.response.generation["response"] for result in results} == {"turtle-1"}
+    # Each caller gets its own dict, so mutating one result cannot leak into another.
+    assert len({id(result.response.generation) for result in results}) == 4
+    assert service.single_flight.metrics.single_flight.value(outcome="coalesced") == 3
@@ -0,0 +1,87 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src.application.single_flight import SingleFlight
+
+
+def test_concurrent_callers_share_one_call():
+    flight = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def slow():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return {"response": "shared"}
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        leader = executor.submit(flight.do, "k", slow)
+        started.wait(5)
+        followers = [executor.submit(flight.do, "k", slow) for _ in range(3)]
+        while flight.metrics.single_flight.value(outcome="coalesced") < 3:
+            time.sleep(0.001)
+        release.set()
+        results = [leader.result()] + [future.result() for future in followers]
+
+    assert len(calls) == 1
+    assert all(result is results[0] for result in results)
+    assert flight.metrics.single_flight.value(outcome="leader") == 1
+    assert flight.in_flight == 0
+    # Finished calls are not remembered.
+    assert flight.do("k", lambda: "fresh") == "fresh"
+
+
+def test_exception_is_shared_and_different_keys_do_not_coalesce():
+    flight = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+
+    def failing():
+        started.set()
+        release.wait(5)
+        raise RuntimeError("model down")
+
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        leader = executor.submit(flight.do, "k", failing)
+        started.wait(5)
+        follower = executor.submit(flight.do, "k", failing)
+        other = executor.submit(flight.do, "other", lambda: "independent")
+        assert other.result(5) == "independent"
+        while flight.metrics.single_flight.value(outcome="coalesced") < 1:
+            time.sleep(0.001)
+        release.set()
+        for future in (leader, follower):
+            with pytest.raises(RuntimeError, match="model down"):
+                future.result()
+
+
+def test_async_callers_share_one_task_even_if_the_first_is_cancelled():
+    flight = SingleFlight()
+    calls = []
+
+    async def generate():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return {"response": "shared"}
+
+    async def run():
+        first = asyncio.ensure_future(flight.do_async("k", generate))
+        await asyncio.sleep(0)
+        others = [asyncio.ensure_future(flight.do_async("k", generate)) for _ in range(3)]
+        await asyncio.sleep(0.01)
+        first.cancel()
+        return await asyncio.gather(*others), first
+
+    results, first = asyncio.run(run())
+
+    assert len(calls) == 1
+    assert first.cancelled()
+    assert [result["response"] for result in results] == ["shared"] * 3
+    assert flight.metrics.single_flight.value(outcome="coalesced") == 3
+    assert flight.in_flight == 0
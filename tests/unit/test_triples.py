@@ -0,0 +1,78 @@
+from pathlib import Path
+
+import pytest
+
+from src.domain.triples import TripleGraph, parse_turtle
+from src.domain.turtle_merge import merge_turtle
+from src.domain.turtle_validator import validate_turtle
+
+EXAMPLES = Path(__file__).resolve().parents[2] / "prompt" / "examples"
+
+TURTLE = """@prefix ex: <http://example.org/> .
+@prefix foaf: <http://xmlns.com/foaf/0.1/> .
+
+ex:Alice a foaf:Person ;
+    foaf:name "Alice"@en, "Al\\"ice" ;
+    foaf:age 42 ;
+    foaf:knows [ foaf:name "Bob" ] ;
+    ex:likes ( ex:Tea ex:Cake ) .
+"""
+
+
+def test_parse_turtle_builds_interned_graph():
+    graph, validation = parse_turtle(TURTLE)
+
+    assert validation.valid
+    lines = graph.to_ntriples().splitlines()
+    assert "<http://example.org/Alice> <http://www.w3.org/1999/02/22-rdf-syntax-ns#type> <http://xmlns.com/foaf/0.1/Person> ." in lines
+    assert '<http://example.org/Alice> <http://xmlns.com/foaf/0.1/name> "Alice"@en .' in lines
+    assert '<http://example.org/Alice> <http://xmlns.com/foaf/0.1/name> "Al\\"ice" .' in lines
+    assert '<http://example.org/Alice> <http://xmlns.com/foaf/0.1/age> "42"^^<http://www.w3.org/2001/XMLSchema#integer> .' in lines
+    assert '_:b1 <http://xmlns.com/foaf/0.1/name> "Bob" .' in lines
+    assert "<http://example.org/Alice> <http://xmlns.com/foaf/0.1/knows> _:b1 ." in lines
+    # Two collection cells (first + rest each) plus the head link.
+    assert sum("rdf-syntax-ns#first" in line for line in lines) == 2
+    assert sum(line.endswith("<http://www.w3.org/1999/02/22-rdf-syntax-ns#nil> .") for line in lines) == 1
+    # Subject and predicate terms are stored once.
+    assert graph.terms.count("<http://example.org/Alice>") == 1
+
+
+def test_graph_json_round_trip():
+    graph, _ = parse_turtle("@prefix ex: <http://example.org/> .\nex:a ex:p ex:b, ex:c .\n")
+
+    data = graph.to_json()
+    assert data["terms"] == ["<http://example.org/a>", "<http://example.org/p>", "<http://example.org/b>", "<http://example.org/c>"]
+    assert data["triples"] == [[0, 1, 2], [0, 1, 3]]
+    assert TripleGraph.from_json(data).to_ntriples() == graph.to_ntriples()
+
+
+def test_parse_turtle_keeps_triples_before_an_error():
+    graph, validation = parse_turtle("@prefix ex: <http://example.org/> .\nex:a ex:p ex:b .\nex:c ex:q .\n")
+
+    assert not validation.valid
+    assert len(graph) == 1
+
+
+def _example_turtle() -> list[str]:
+    return [path.read_text(encoding="utf-8").split("\nRDF:\n", 1)[1] for path in sorted(EXAMPLES.glob("*.txt"))]
+
+
+INVALID = [
+    TURTLE.replace("ex:Cake ) .", "ex:Cake ) "),  # truncated
+    TURTLE.replace("@prefix foaf: <http://xmlns.com/foaf/0.1/> .\n", ""),  # undeclared prefix
+    TURTLE.replace('"Alice"@en', '"Alice'),  # unterminated string
+    TURTLE.replace("foaf:age 42 ;", "foaf:age 42 ;;,"),  # stray separator
+    "no turtle here",
+]
+
+
+@pytest.mark.parametrize("document", _example_turtle() + [TURTLE] + INVALID)
+def test_validator_parser_and_merge_agree(document):
+    graph, parsed = parse_turtle(document)
+    validation = validate_turtle(document)
+
+    assert parsed == validation
+    merged_graph, merged = parse_turtle(merge_turtle([document]))
+    assert merged.valid == validation.valid
+    if validation.valid:
+        assert sorted(merged_graph.to_ntriples().splitlines()) == sorted(graph.to_ntriples().splitlines())
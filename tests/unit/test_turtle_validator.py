@@ -0,0 +1,63 @@
+import pytest
+
+from src.domain.turtle_validator import TurtleValidator, validate_turtle
+
+DOCUMENT = '''```turtle
+@prefix ex: <http://example.org/> .
+@prefix xsd: <http://www.w3.org/2001/XMLSchema#> .
+# people
+ex:Alice a ex:Person ; ex:name "Alice"@en , """Alice
+Smith""" ; ex:age "42"^^xsd:int ;
+    ex:knows [ ex:name 'Bob' ; ] , ( ex:Carol 1 2.5 -3e4 true ) .
+[ ex:p ex:o ] ex:q ex:r .
+_:b1 ex:x <http://example.org/y> .
+PREFIX foaf: <http://xmlns.com/foaf/0.1/>
+foaf:a foaf:b foaf:c.
+```'''
+
+
+def test_valid_document_counts_triples():
+    result = validate_turtle(DOCUMENT)
+
+    assert result.valid
+    assert result.triples == 11
+    assert result.note == ""
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 5, 8, 13])
+def test_chunked_feed_matches_whole_document(chunk_size):
+    broken = DOCUMENT.replace("ex:q ex:r", "ex:q ex:r ex:s")
+    for text in (DOCUMENT, broken):
+        validator = TurtleValidator()
+        for start in range(0, len(text), chunk_size):
+            validator.feed(text[start : start + chunk_size])
+        assert validator.close() == validate_turtle(text)
+
+
+def test_reports_error_position():
+    result = validate_turtle("@prefix ex: <http://e/> .\nex:a ex:b ex:c ;\n  ex:d .\n")
+
+    assert not result.valid
+    assert (result.error_line, result.error_column, result.error_offset) == (3, 8, 50)
+    assert result.error == "unexpected '.', expected object"
+    assert result.note.startswith("line 3, column 8:")
+
+
+def test_reports_undeclared_prefixes_and_truncation():
+    undeclared = validate_turtle("@prefix ex: <http://e/> .\nex:a schema:name foaf:b .")
+    assert not undeclared.valid
+    assert undeclared.error is None
+    assert undeclared.undeclared_prefixes == ("schema", "foaf")
+
+    truncated = validate_turtle('@prefix ex: <http://e/> .\nex:a ex:b "open')
+    assert truncated.error == "unterminated string literal"
+    assert validate_turtle("@prefix ex: <http://e/> .\nex:a ex:b ex:c").error.startswith("unexpected end of input")
+    assert validate_turtle("Here is your graph:").error_column == 1
+
+
+def test_failed_is_set_as_soon_as_an_error_streams_in():
+    validator = TurtleValidator()
+    validator.feed("@prefix ex: <http://e/> .\nex:a ex:b ex:c ")
+    assert not validator.failed
+    validator.feed("ex:d . ")
+    assert validator.failed